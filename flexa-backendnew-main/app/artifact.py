@@ -0,0 +1,134 @@
+import json
+import os
+import shutil
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .engine import FastKNNEngine
+from .plans import PlanRecord
+
+# Slim model artifact: a directory instead of one big pickle
+#   CURRENT        name of the version subdirectory in use (replaced atomically)
+#   v<n>/          one complete export:
+#     meta.json      format version + preprocessor parameters (plain values)
+#     fit_X.npy      KNN training matrix (float64, memory-mappable)
+#     labels.npy     plan ID of every training row
+#     plan_ids.npy   every plan ID in the dataset
+#     plan_rows.npy  plan_ids[i] -> row in plans.json
+#     plans.json     distinct plan texts (many IDs share the same plan)
+#     index_*.npy    neighbour index arrays, if the backend has any (e.g. IVF cells + cell-ordered rows)
+# Directories written before versioning hold those files directly (still loadable).
+SLIM_FORMAT_VERSION = 1
+SLIM_POINTER = "CURRENT"
+SLIM_FILES = ("meta.json", "fit_X.npy", "labels.npy", "plan_ids.npy", "plan_rows.npy", "plans.json")
+
+
+def slim_version_dir(path: str) -> str:
+    """
+    Directory holding the artifact files: the version CURRENT names,
+    or path itself for the older flat layout.
+    """
+    try:
+        with open(os.path.join(path, SLIM_POINTER), "r", encoding="utf-8") as f:
+            return os.path.join(path, f.read().strip())
+    except FileNotFoundError:
+        return path
+
+
+def is_slim_artifact(path: str) -> bool:
+    return os.path.isdir(path) and os.path.exists(os.path.join(slim_version_dir(path), "meta.json"))
+
+
+def _write_version(engine: FastKNNEngine, plans: Dict[int, PlanRecord], version_dir: str) -> None:
+    os.makedirs(version_dir)
+
+    np.save(os.path.join(version_dir, "fit_X.npy"), np.ascontiguousarray(engine.fit_X, dtype=np.float64))
+    np.save(os.path.join(version_dir, "labels.npy"), np.asarray(engine.labels, dtype=np.int64))
+    index_arrays = engine.index.export_arrays()
+    for name, array in index_arrays.items():
+        np.save(os.path.join(version_dir, f"index_{name}.npy"), array)
+
+    # Plan text table: store each distinct record once
+    records, rows = [], {}
+    plan_ids = np.fromiter(plans.keys(), dtype=np.int64, count=len(plans))
+    plan_rows = np.empty(len(plans), dtype=np.int32)
+    for i, record in enumerate(plans.values()):
+        if record not in rows:
+            rows[record] = len(records)
+            records.append(list(record))
+        plan_rows[i] = rows[record]
+
+    np.save(os.path.join(version_dir, "plan_ids.npy"), plan_ids)
+    np.save(os.path.join(version_dir, "plan_rows.npy"), plan_rows)
+    with open(os.path.join(version_dir, "plans.json"), "w", encoding="utf-8") as f:
+        json.dump({"fields": list(PlanRecord._fields), "records": records}, f, ensure_ascii=False)
+
+    with open(os.path.join(version_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "format_version": SLIM_FORMAT_VERSION,
+            "engine": engine.export_params(),
+            "index_arrays": sorted(index_arrays),
+        }, f, indent=2)
+
+
+def export_slim(engine: FastKNNEngine, plans: Dict[int, PlanRecord], out_dir: str) -> None:
+    """
+    Write the engine + plan index as a slim artifact directory.
+
+    Each export goes to a new version subdirectory, and CURRENT is switched
+    to it with one atomic rename once it is complete: a server loading
+    out_dir meanwhile sees either the old export or the new one, never a mix.
+    The previous version is kept (a reload may be reading it); older ones are removed.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    previous = slim_version_dir(out_dir)
+
+    version = f"v{time.time_ns()}"
+    _write_version(engine, plans, os.path.join(out_dir, version))
+
+    pointer = os.path.join(out_dir, SLIM_POINTER)
+    with open(pointer + ".tmp", "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(pointer + ".tmp", pointer)
+
+    keep = {version, os.path.basename(previous)}
+    for name in os.listdir(out_dir):
+        entry = os.path.join(out_dir, name)
+        if name.startswith("v") and os.path.isdir(entry) and name not in keep:
+            shutil.rmtree(entry, ignore_errors=True)
+    if previous != out_dir:
+        # Flat files of a pre-versioning export, replaced one export ago
+        for name in os.listdir(out_dir):
+            if name in SLIM_FILES or (name.startswith("index_") and name.endswith(".npy")):
+                os.remove(os.path.join(out_dir, name))
+
+
+def load_slim(path: str, mmap_mode: Optional[str] = "r") -> Tuple[FastKNNEngine, Dict[int, PlanRecord]]:
+    """
+    Load a slim artifact: (engine, {plan ID -> PlanRecord}).
+    Arrays are memory-mapped, so this is only file opens + a tree build
+    (IVF indexes load their cells instead of rebuilding).
+    """
+    path = slim_version_dir(path)
+    with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("format_version") != SLIM_FORMAT_VERSION:
+        raise ValueError(f"Unsupported slim model format: {meta.get('format_version')!r}")
+
+    fit_X = np.load(os.path.join(path, "fit_X.npy"), mmap_mode=mmap_mode)
+    labels = np.load(os.path.join(path, "labels.npy"), mmap_mode=mmap_mode)
+    index_arrays = {
+        name: np.load(os.path.join(path, f"index_{name}.npy"), mmap_mode=mmap_mode)
+        for name in meta.get("index_arrays", [])
+    }
+    engine = FastKNNEngine.from_params(meta["engine"], fit_X=fit_X, labels=labels, index_arrays=index_arrays)
+
+    with open(os.path.join(path, "plans.json"), "r", encoding="utf-8") as f:
+        records = [PlanRecord(*r) for r in json.load(f)["records"]]
+    plan_ids = np.load(os.path.join(path, "plan_ids.npy"))
+    plan_rows = np.load(os.path.join(path, "plan_rows.npy"))
+    plans = {pid: records[row] for pid, row in zip(plan_ids.tolist(), plan_rows.tolist())}
+
+    return engine, plans
@@ -0,0 +1,108 @@
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+# Micro-batching of concurrent prediction requests (opt-in: every request waits
+# up to BATCH_MAX_WAIT_MS, and the inference pool bound then counts batches, not requests)
+MICRO_BATCHING = os.getenv("FLEXA_MICRO_BATCHING", "0") == "1"
+BATCH_MAX_SIZE = int(os.getenv("FLEXA_BATCH_MAX_SIZE", "32"))
+BATCH_MAX_WAIT_MS = float(os.getenv("FLEXA_BATCH_MAX_WAIT_MS", "2"))
+
+
+class MicroBatcher:
+    """
+    Collects concurrent submit() calls for up to max_wait_ms (or until
+    max_batch_size items are waiting), runs ONE batch call for all of them
+    and fans the results back out to the awaiting callers.
+
+    run_batch(items) must return one result per item, in order. A result
+    that is an Exception instance is raised only for that item's caller.
+    """
+
+    def __init__(self, run_batch: Callable[[List[Any]], Awaitable[List[Any]]],
+                 max_batch_size: int = BATCH_MAX_SIZE, max_wait_ms: float = BATCH_MAX_WAIT_MS):
+        if max_batch_size <= 0 or max_wait_ms < 0:
+            raise ValueError("max_batch_size must be > 0 and max_wait_ms >= 0")
+        self.run_batch = run_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._pending: List[Tuple[Any, asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # The event loop only keeps weak references to tasks: hold running batches here
+        self._tasks: Set[asyncio.Task] = set()
+
+        # Metrics
+        self.batches = 0
+        self.items = 0
+        self.max_batch_seen = 0
+        self.total_queue_delay = 0.0
+        self.max_queue_delay = 0.0
+        self.size_histogram: Dict[int, int] = {}
+
+    async def submit(self, item: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append((item, fut, time.perf_counter()))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await fut
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future, float]]) -> None:
+        started = time.perf_counter()
+        self._record(len(batch), [started - queued_at for _, _, queued_at in batch])
+
+        try:
+            results = await self.run_batch([item for item, _, _ in batch])
+        except Exception as e:
+            for _, fut, _ in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+
+        for (_, fut, _), result in zip(batch, results):
+            if fut.done():
+                continue  # caller went away (e.g. request cancelled)
+            if isinstance(result, Exception):
+                fut.set_exception(result)
+            else:
+                fut.set_result(result)
+
+    def _record(self, size: int, delays: List[float]) -> None:
+        self.batches += 1
+        self.items += size
+        self.max_batch_seen = max(self.max_batch_seen, size)
+        self.size_histogram[size] = self.size_histogram.get(size, 0) + 1
+        self.total_queue_delay += sum(delays)
+        self.max_queue_delay = max(self.max_queue_delay, max(delays))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "batches": self.batches,
+            "items": self.items,
+            "pending": len(self._pending),
+            "running_batches": len(self._tasks),
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "max_batch_seen": self.max_batch_seen,
+            "avg_queue_delay_ms": round(self.total_queue_delay / self.items * 1000, 3) if self.items else 0.0,
+            "max_queue_delay_ms": round(self.max_queue_delay * 1000, 3),
+            "batch_size_histogram": dict(sorted(self.size_histogram.items())),
+        }
@@ -0,0 +1,77 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Small thread-safe LRU cache with a time-to-live per entry.
+
+    - at most max_size entries (least recently used is evicted first)
+    - entries older than ttl seconds are treated as missing (ttl=None -> never expire)
+    - hit/miss/eviction counters for monitoring
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_size <= 0:
+            raise ValueError("max_size must be > 0")
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+
+            value, expires_at = item
+            if expires_at is not None and expires_at <= self._clock():
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        expires_at = self._clock() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.pop(key, None)
+        return default if item is None else item[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
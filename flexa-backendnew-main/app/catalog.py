@@ -0,0 +1,160 @@
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+DIFFICULTY_CODES = {"beginner": 0, "intermediate": 1, "advanced": 2}
+
+# Query values may be a single value or any-of several values
+Match = Union[str, Iterable[str], None]
+
+
+def _norm(value: Any) -> str:
+    return str(value).strip().lower()
+
+
+def _bitset(positions: List[int], n: int) -> int:
+    bits = np.zeros(n, dtype=np.uint8)
+    bits[positions] = 1
+    return int.from_bytes(np.packbits(bits, bitorder="little").tobytes(), "little")
+
+
+class WorkoutCatalog:
+    """
+    Workout videos indexed once at load time.
+
+    Each attribute value maps to a bitset (Python int, bit i = i-th workout
+    in file order), so compound queries are a few big-int ANDs instead of
+    rescanning and re-normalizing the whole list on every call:
+
+        catalog.query(goal="weight_loss", equipment_subset={"None", "Dumbbells"}, max_duration=20)
+    """
+
+    INDEXED_FIELDS = ("goal", "category", "difficulty", "equipment", "muscle_groups")
+
+    def __init__(self, workouts: List[Dict[str, Any]]):
+        self.workouts = list(workouts)
+        self.all_mask = (1 << len(self.workouts)) - 1
+
+        # Collect positions first, then turn each list into a bitset once
+        # (OR-ing bits into a growing int per workout would be quadratic)
+        positions: Dict[str, Dict[str, List[int]]] = {f: {} for f in self.INDEXED_FIELDS}
+        unknown_equipment: List[int] = []
+        durations: Dict[float, List[int]] = {}
+
+        for pos, w in enumerate(self.workouts):
+            for field in self.INDEXED_FIELDS:
+                values = w.get(field)
+                if values is None:
+                    # Missing data is not the value "None" (e.g. no equipment needed)
+                    if field == "equipment":
+                        unknown_equipment.append(pos)
+                    continue
+                if not isinstance(values, list):
+                    values = [values]
+                bucket = positions[field]
+                for v in values:
+                    if v is not None:
+                        bucket.setdefault(_norm(v), []).append(pos)
+
+            duration = w.get("duration")
+            if duration is not None:
+                durations.setdefault(float(duration), []).append(pos)
+
+        n = len(self.workouts)
+        self.index: Dict[str, Dict[str, int]] = {
+            field: {value: _bitset(p, n) for value, p in bucket.items()}
+            for field, bucket in positions.items()
+        }
+        # equipment_subset only keeps workouts whose equipment is known
+        self.known_equipment_mask = self.all_mask & ~_bitset(unknown_equipment, n)
+
+        # Numeric columns for ranking (see app/ranking.py), one entry per workout
+        self.durations = np.array([float(w.get("duration") or 0) for w in self.workouts], dtype=np.float64)
+        self.calories = np.array([float(w.get("calories_burned") or 0) for w in self.workouts], dtype=np.float64)
+        self.difficulty_codes = np.array(
+            [DIFFICULTY_CODES.get(_norm(w.get("difficulty")), -1) for w in self.workouts], dtype=np.int8
+        )
+
+        # max_duration queries: cumulative bitsets over the sorted distinct durations
+        self._duration_values = sorted(durations)
+        self._duration_cumulative: List[int] = []
+        acc = 0
+        for d in self._duration_values:
+            acc |= _bitset(durations[d], n)
+            self._duration_cumulative.append(acc)
+
+    def __len__(self) -> int:
+        return len(self.workouts)
+
+    def _any_of(self, field: str, values: Match) -> int:
+        if isinstance(values, str):
+            values = [values]
+        bucket = self.index[field]
+        mask = 0
+        for v in values:
+            mask |= bucket.get(_norm(v), 0)
+        return mask
+
+    def mask(
+        self,
+        goal: Match = None,
+        category: Match = None,
+        difficulty: Match = None,
+        muscle_group: Match = None,
+        equipment_subset: Optional[Iterable[str]] = None,
+        max_duration: Optional[float] = None,
+    ) -> int:
+        """
+        Bitset of workouts matching ALL given conditions (None = no condition).
+        equipment_subset keeps workouts whose equipment is known and all within that set.
+        """
+        mask = self.all_mask
+        if goal is not None:
+            mask &= self._any_of("goal", goal)
+        if category is not None:
+            mask &= self._any_of("category", category)
+        if difficulty is not None:
+            mask &= self._any_of("difficulty", difficulty)
+        if muscle_group is not None:
+            mask &= self._any_of("muscle_groups", muscle_group)
+        if equipment_subset is not None:
+            allowed = {_norm(e) for e in equipment_subset}
+            mask &= self.known_equipment_mask
+            for equipment, bits in self.index["equipment"].items():
+                if equipment not in allowed:
+                    mask &= ~bits
+        if max_duration is not None:
+            i = bisect_right(self._duration_values, float(max_duration))
+            mask &= self._duration_cumulative[i - 1] if i else 0
+        return mask
+
+    def positions(self, mask: int, limit: Optional[int] = None) -> List[int]:
+        """
+        Workout positions set in mask, in file order (lowest bit first).
+        """
+        if limit is not None and limit <= 64:
+            # Few results: peel off the lowest set bits one by one
+            out: List[int] = []
+            while mask and len(out) < limit:
+                low = mask & -mask
+                out.append(low.bit_length() - 1)
+                mask ^= low
+            return out
+
+        return self.position_array(mask)[:limit].tolist()
+
+    def position_array(self, mask: int) -> np.ndarray:
+        """
+        All positions set in mask as a NumPy array (unpacks the bitset at once).
+        """
+        if not mask:
+            return np.empty(0, dtype=np.intp)
+        raw = np.frombuffer(mask.to_bytes((mask.bit_length() + 7) // 8, "little"), dtype=np.uint8)
+        return np.flatnonzero(np.unpackbits(raw, bitorder="little"))
+
+    def query(self, limit: Optional[int] = None, **conditions) -> List[Dict[str, Any]]:
+        """
+        Workouts matching all conditions (see mask()), in file order.
+        """
+        return [self.workouts[p] for p in self.positions(self.mask(**conditions), limit)]
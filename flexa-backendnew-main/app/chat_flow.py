@@ -0,0 +1,334 @@
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from .plans import plan_to_dict
+from .renderer import VIDEOS_QUESTION, Sections
+from .session_state import ChatStep, SessionState
+from .utils import normalize_sex, normalize_yes_no
+
+DONE = ChatStep.DONE
+
+# Section name for replies that are not split further
+MESSAGE_SECTION = "message"
+
+# Text computed from the session (or a fixed string); callables may return sections
+Text = Union[str, Callable[["ChatFlow", SessionState], Union[str, Sections]]]
+
+
+class ChatTurn(NamedTuple):
+    """
+    Result of one user message: reply text + optional dashboard update.
+    sections is the same reply split into (name, text) parts for streaming.
+    """
+    message: str
+    user_data: Optional[Dict[str, Any]] = None
+    sections: Tuple[Tuple[str, str], ...] = ()
+
+
+@dataclass(frozen=True)
+class ChatState:
+    """
+    One question of the chat flow.
+
+    prompt  question asked when the conversation enters this state
+    field   SessionState attribute the parsed answer is stored in
+    parse   raw text -> value; ValueError means "ask again" with retry
+    effect  async side effect after a valid answer (e.g. run the model)
+    ack     text sent before the next state's prompt
+    next    next ChatStep, or fn(session) -> ChatStep
+    """
+    prompt: Text = ""
+    field: Optional[str] = None
+    parse: Callable[[str], Any] = str
+    retry: str = ""
+    effect: Optional[Callable[["ChatFlow", SessionState], Awaitable[None]]] = None
+    ack: Text = ""
+    next: Union[ChatStep, Callable[[SessionState], ChatStep]] = DONE
+    user_data: Optional[Callable[[SessionState], Dict[str, Any]]] = None
+
+
+class ChatFlow:
+    """
+    Runs a conversation over a table of ChatStates: one dict lookup per
+    message instead of walking an if/elif chain.
+
+    recommender() returns the serving FlexaRecommender and
+    recommend(recommender, profile, wants_videos) is awaited for model calls.
+    A turn uses one recommender throughout (see pinned()), so a model
+    reload in the middle of a turn cannot mix two models in one reply.
+    """
+
+    def __init__(self, states: Dict[ChatStep, ChatState],
+                 recommend: Callable[[Any, Dict[str, Any], bool], Awaitable[Dict[str, Any]]],
+                 recommender: Callable[[], Any]):
+        if DONE not in states:
+            raise ValueError(f"Chat flow needs a {DONE!r} state")
+        self.states = states
+        self._recommend = recommend
+        self.recommender = recommender
+
+    def pinned(self) -> "ChatFlow":
+        """
+        This flow with recommender() fixed to the first instance it returns
+        (fetched lazily: turns that never touch the model do not need one).
+        """
+        pinned: List[Any] = []
+
+        def recommender() -> Any:
+            if not pinned:
+                pinned.append(self.recommender())
+            return pinned[0]
+
+        return ChatFlow(self.states, self._recommend, recommender)
+
+    async def recommend(self, profile: Dict[str, Any], wants_videos: bool) -> Dict[str, Any]:
+        return await self._recommend(self.recommender(), profile, wants_videos)
+
+    def _sections(self, text: Text, session: SessionState, out: List[Tuple[str, str]]) -> None:
+        value = text(self, session) if callable(text) else text
+        parts = [(MESSAGE_SECTION, value)] if isinstance(value, str) else value
+        for name, part in parts:
+            if not part:
+                continue
+            if out and name == MESSAGE_SECTION and out[-1][0] == MESSAGE_SECTION:
+                out[-1] = (MESSAGE_SECTION, out[-1][1] + part)
+            else:
+                out.append((name, part))
+
+    def recommendation(self, session: SessionState) -> Optional[Dict[str, Any]]:
+        """
+        The session's stored recommendation as a recommend() result (without
+        workouts), or None if there is none or its plan is no longer known.
+        """
+        if session.plan_id is None:
+            return None
+        record = self.recommender().plans.get(session.plan_id)
+        if record is None:
+            return None
+        return {"bmi": session.rec_bmi, "level": session.rec_level,
+                "plan": plan_to_dict(session.plan_id, record), "workouts": []}
+
+    def prompt(self, session: SessionState) -> str:
+        """
+        The question the session is currently waiting on (e.g. to resume a chat).
+        """
+        sections: List[Tuple[str, str]] = []
+        self.pinned()._sections(self.states[session.step].prompt, session, sections)
+        return "".join(text for _, text in sections)
+
+    async def advance(self, session: SessionState, text: str) -> ChatTurn:
+        """
+        Apply one user message to the session (mutated in place).
+        """
+        return await self.pinned()._advance(session, text)
+
+    async def _advance(self, session: SessionState, text: str) -> ChatTurn:
+        state = self.states.get(session.step) or self.states[DONE]
+
+        try:
+            value = state.parse(text.strip())
+        except ValueError:
+            return ChatTurn(state.retry, sections=((MESSAGE_SECTION, state.retry),))
+
+        if state.field is not None:
+            setattr(session, state.field, value)
+        if state.effect is not None:
+            await state.effect(self, session)
+
+        next_step = state.next(session) if callable(state.next) else state.next
+        session.step = next_step
+
+        sections: List[Tuple[str, str]] = []
+        self._sections(state.ack, session, sections)
+        self._sections(self.states[next_step].prompt, session, sections)
+        return ChatTurn(
+            message="".join(text for _, text in sections),
+            user_data=state.user_data(session) if state.user_data else None,
+            sections=tuple(sections)
+        )
+
+
+# ---------------------------------------------------------------------------
+# Flexa conversation: greet -> collect -> recommend -> videos
+# ---------------------------------------------------------------------------
+
+
+def _profile(session: SessionState) -> Dict[str, Any]:
+    # Model input collected by the chat flow
+    return {
+        "sex": session.sex,
+        "age": session.age,
+        "height_m": session.height_m,
+        "weight_kg": session.weight_kg,
+        "hypertension": session.hypertension,
+        "diabetes": session.diabetes,
+    }
+
+
+def _has_conditions(session: SessionState) -> bool:
+    return session.hypertension == "Yes" or session.diabetes == "Yes"
+
+
+def _remember(session: SessionState, rec: Dict[str, Any]) -> None:
+    # Keep only a reference to the plan; the text is looked up when needed
+    session.plan_id = rec["plan"]["id"]
+    session.rec_bmi = rec["bmi"]
+    session.rec_level = rec["level"]
+
+
+async def _compute_bmi(flow: ChatFlow, session: SessionState) -> None:
+    bmi = session.weight_kg / (session.height_m ** 2)
+    session.bmi = round(bmi, 1)
+    session.bmi_category = "Underweight" if bmi < 18.5 else "Normal" if bmi < 25 else "Overweight" if bmi < 30 else "Obese"
+
+
+def _bmi_user_data(session: SessionState) -> Dict[str, Any]:
+    return {
+        "name": session.name,
+        "height": round(session.height_m * 100),  # Convert to cm
+        "weight": session.weight_kg,
+        "bmi": session.bmi,
+        "bmi_category": session.bmi_category
+    }
+
+
+async def _check_goal_drift(flow: ChatFlow, session: SessionState) -> None:
+    # Before showing the plan, check if the stated problem matches the ML prediction
+    profile = _profile(session)
+    rec = await flow.recommend(profile, False)
+    drift_result = flow.recommender().detect_goal_drift(
+        profile=profile,
+        stated_problem=session.problem or "",
+        rec=rec
+    )
+
+    # The drift check already ran the model: keep that recommendation for the next turns
+    _remember(session, drift_result["recommendation"])
+    session.has_drift = drift_result["has_drift"]
+    session.drift_message = drift_result["drift_message"] if drift_result["has_drift"] else None
+
+
+async def _record_clarification(flow: ChatFlow, session: SessionState) -> None:
+    session.clarification = "Followed AI recommendation" if session.user_chose_ai_goal else "Kept original goal"
+    session.drift_message = None
+
+    # Reuse the recommendation computed during drift detection
+    if flow.recommendation(session) is None:
+        _remember(session, await flow.recommend(_profile(session), False))
+
+
+def _chose_ai_goal(text: str) -> bool:
+    response = text.lower()
+    return "ai" in response or "recommendation" in response or "follow" in response
+
+
+def _drift_prompt(flow: ChatFlow, session: SessionState) -> str:
+    return (session.drift_message or "") + "\n\nPlease reply: 'Follow AI recommendation' or 'Keep my original goal'"
+
+
+def _plan_prompt(flow: ChatFlow, session: SessionState) -> Sections:
+    # Plan message (ends with the videos question), with the drift answer if one was given
+    rec = flow.recommendation(session)
+    if rec is None:
+        # Resumed after the plan index changed: just ask the question
+        return VIDEOS_QUESTION
+    return flow.recommender().renderer.render_plan_sections(
+        rec, session.name, _has_conditions(session),
+        clarification=session.user_chose_ai_goal
+    )
+
+
+def _videos_ack(flow: ChatFlow, session: SessionState) -> Union[str, Sections]:
+    if not session.wants_videos:
+        return "No problem! Good luck with your fitness journey! 💪"
+
+    rec = flow.recommendation(session)
+    if not rec:
+        return "Good luck with your fitness journey! 💪"
+
+    # YouTube videos for the stored plan (no new prediction)
+    recommender = flow.recommender()
+    workouts = recommender.workouts_for(
+        rec["plan"],
+        level=rec["level"],
+        hypertension=session.hypertension,
+        diabetes=session.diabetes
+    )
+    return [("videos", recommender.renderer.render_videos(workouts))]
+
+
+CHAT_STATES: Dict[ChatStep, ChatState] = {
+    ChatStep.ASK_NAME: ChatState(
+        prompt="Hi! I'm Flexa 👋 What’s your name?",
+        field="name",
+        ack=lambda flow, s: f"Nice to meet you, {s.name}! ",
+        next=ChatStep.ASK_PROBLEM,
+    ),
+    ChatStep.ASK_PROBLEM: ChatState(
+        prompt="What do you need help with? (e.g., weight loss, weight gain, flexibility, toning)",
+        field="problem",
+        ack="Got it. ",
+        next=ChatStep.ASK_SEX,
+    ),
+    ChatStep.ASK_SEX: ChatState(
+        prompt="What is your sex? (Male/Female)",
+        field="sex",
+        parse=normalize_sex,
+        next=ChatStep.ASK_AGE,
+    ),
+    ChatStep.ASK_AGE: ChatState(
+        prompt="What is your age?",
+        field="age",
+        parse=int,
+        retry="Please type your age as a number (example: 21).",
+        next=ChatStep.ASK_HEIGHT,
+    ),
+    ChatStep.ASK_HEIGHT: ChatState(
+        prompt="What is your height in meters? (example: 1.65)",
+        field="height_m",
+        parse=float,
+        retry="Please type height in meters (example: 1.65).",
+        next=ChatStep.ASK_WEIGHT,
+    ),
+    ChatStep.ASK_WEIGHT: ChatState(
+        prompt="What is your weight in kg? (example: 55)",
+        field="weight_kg",
+        parse=float,
+        retry="Please type weight in kg (example: 55).",
+        effect=_compute_bmi,
+        ack=lambda flow, s: f"Great! Your BMI is {s.bmi} ({s.bmi_category}).\n\n",
+        next=ChatStep.ASK_HYPERTENSION,
+        user_data=_bmi_user_data,
+    ),
+    ChatStep.ASK_HYPERTENSION: ChatState(
+        prompt="Do you have hypertension (high blood pressure)? (Yes/No)",
+        field="hypertension",
+        parse=normalize_yes_no,
+        next=ChatStep.ASK_DIABETES,
+    ),
+    ChatStep.ASK_DIABETES: ChatState(
+        prompt="Do you have diabetes? (Yes/No)",
+        field="diabetes",
+        parse=normalize_yes_no,
+        effect=_check_goal_drift,
+        next=lambda s: ChatStep.ASK_GOAL_CLARIFICATION if s.has_drift else ChatStep.ASK_VIDEOS,
+    ),
+    ChatStep.ASK_GOAL_CLARIFICATION: ChatState(
+        prompt=_drift_prompt,
+        field="user_chose_ai_goal",
+        parse=_chose_ai_goal,
+        effect=_record_clarification,
+        next=ChatStep.ASK_VIDEOS,
+    ),
+    ChatStep.ASK_VIDEOS: ChatState(
+        prompt=_plan_prompt,
+        field="wants_videos",
+        parse=lambda text: normalize_yes_no(text) == "Yes",
+        ack=_videos_ack,
+        next=DONE,
+    ),
+    DONE: ChatState(
+        ack="If you want, type 'restart' to begin again.",
+        next=DONE,
+    ),
+}
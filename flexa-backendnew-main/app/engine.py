@@ -0,0 +1,237 @@
+import math
+from typing import Dict, Any, List, Optional, Sequence
+
+import numpy as np
+
+from .neighbors import NEIGHBOR_METRICS, NeighborIndex, build_index
+
+KNN_WEIGHTS = ("uniform", "distance")
+
+
+class FastKNNEngine:
+    """
+    Pandas-free inference for the trained plan pipeline.
+
+    Pulls the fitted parameters out of the sklearn pipeline once:
+      - SimpleImputer fill values + StandardScaler mean/scale (numeric)
+      - SimpleImputer fill values + OneHotEncoder categories (categorical)
+      - the KNN training matrix, labels and neighbour index
+    and then encodes a profile straight into a NumPy vector and runs the
+    (distance-weighted or uniform) vote directly (same result as pipeline.predict).
+    """
+
+    def __init__(
+        self,
+        numeric_cols: Sequence[str],
+        numeric_fill: np.ndarray,
+        means: np.ndarray,
+        scales: np.ndarray,
+        categorical_cols: Sequence[str],
+        categorical_fill: Sequence[Any],
+        categories: Sequence[Sequence[Any]],
+        fit_X: np.ndarray,
+        labels: np.ndarray,
+        n_neighbors: int,
+        tree: Optional[Any] = None,
+        fit_method: str = "brute",
+        leaf_size: int = 30,
+        index_params: Optional[Dict[str, Any]] = None,
+        index_arrays: Optional[Dict[str, np.ndarray]] = None,
+        weights: str = "distance",
+        metric: str = "euclidean"
+    ):
+        if weights not in KNN_WEIGHTS:
+            raise ValueError(f"Unsupported KNN weights: {weights!r}")
+        # Kept so the engine can be exported and rebuilt (see export_params)
+        self.categories = [list(c) for c in categories]
+
+        self.numeric_cols = list(numeric_cols)
+        self.numeric_fill = np.asarray(numeric_fill, dtype=np.float64)
+        self.means = np.asarray(means, dtype=np.float64)
+        self.scales = np.asarray(scales, dtype=np.float64)
+
+        self.categorical_cols = list(categorical_cols)
+        self.categorical_fill = list(categorical_fill)
+
+        # One-hot layout: column -> {category value -> position in the vector}
+        self.n_numeric = len(self.numeric_cols)
+        self.onehot_pos: List[Dict[Any, int]] = []
+        offset = self.n_numeric
+        for cats in categories:
+            self.onehot_pos.append({c: offset + i for i, c in enumerate(cats)})
+            offset += len(cats)
+        self.n_features = offset
+
+        self.fit_X = fit_X
+        self.labels = labels
+        self.n_neighbors = int(n_neighbors)
+        self.weights = weights
+        self.metric = metric
+
+        # Neighbour search backend (see app/neighbors.py). A KD/Ball tree fitted
+        # by sklearn is reused as is (same neighbour order as pipeline.predict).
+        if index_params is None:
+            index_params = {"leaf_size": leaf_size} if fit_method in ("kd_tree", "ball_tree") else {}
+        self.index: NeighborIndex = build_index(fit_method, fit_X, tree=tree, arrays=index_arrays,
+                                                metric=metric, **index_params)
+        self.fit_method = self.index.method
+
+    @classmethod
+    def from_pipeline(cls, pipeline, neighbor_index: Optional[Dict[str, Any]] = None) -> "FastKNNEngine":
+        """
+        Build the engine from the Pipeline(prep -> knn) trained by train.py.
+        neighbor_index is the bundle's "neighbor_index" entry, if it was
+        trained with a backend sklearn does not have (e.g. --neighbors ivf).
+        """
+        prep = pipeline.named_steps["prep"]
+        knn = pipeline.named_steps["knn"]
+
+        if knn.weights not in KNN_WEIGHTS or knn.effective_metric_ not in NEIGHBOR_METRICS:
+            raise ValueError(
+                f"FastKNNEngine supports weights {KNN_WEIGHTS} with metrics {NEIGHBOR_METRICS} only"
+            )
+
+        num_cols, cat_cols = [], []
+        num_pipe = cat_pipe = None
+        for name, transformer, cols in prep.transformers_:
+            if name == "num":
+                num_pipe, num_cols = transformer, cols
+            elif name == "cat":
+                cat_pipe, cat_cols = transformer, cols
+
+        scaler = num_pipe.named_steps["scaler"]
+        onehot = cat_pipe.named_steps["onehot"]
+
+        index: Dict[str, Any] = {"tree": getattr(knn, "_tree", None), "fit_method": knn._fit_method}
+        if neighbor_index is not None:
+            index = {
+                "fit_method": neighbor_index["method"],
+                "index_params": neighbor_index.get("params", {}),
+                "index_arrays": neighbor_index.get("arrays"),
+            }
+
+        return cls(
+            numeric_cols=num_cols,
+            numeric_fill=num_pipe.named_steps["imputer"].statistics_,
+            means=scaler.mean_,
+            scales=scaler.scale_,
+            categorical_cols=cat_cols,
+            categorical_fill=list(cat_pipe.named_steps["imputer"].statistics_),
+            categories=[list(c) for c in onehot.categories_],
+            fit_X=np.ascontiguousarray(knn._fit_X, dtype=np.float64),
+            labels=knn.classes_[knn._y],
+            n_neighbors=knn.n_neighbors,
+            leaf_size=knn.leaf_size,
+            weights=knn.weights,
+            metric=knn.effective_metric_,
+            **index
+        )
+
+    def export_params(self) -> Dict[str, Any]:
+        """
+        Everything except the big arrays, as plain JSON-friendly values.
+        fit_X / labels (and index.export_arrays()) are stored separately
+        (as .npy, so they can be memory-mapped).
+        """
+        return {
+            "numeric_cols": self.numeric_cols,
+            "numeric_fill": self.numeric_fill.tolist(),
+            "means": self.means.tolist(),
+            "scales": self.scales.tolist(),
+            "categorical_cols": self.categorical_cols,
+            "categorical_fill": self.categorical_fill,
+            "categories": self.categories,
+            "n_neighbors": self.n_neighbors,
+            "weights": self.weights,
+            "metric": self.metric,
+            "fit_method": self.fit_method,
+            "index_params": self.index.export_params(),
+        }
+
+    @classmethod
+    def from_params(cls, params: Dict[str, Any], fit_X: np.ndarray, labels: np.ndarray,
+                    index_arrays: Optional[Dict[str, np.ndarray]] = None) -> "FastKNNEngine":
+        """
+        Rebuild an engine from export_params() + the training arrays.
+        A neighbour tree is rebuilt from fit_X (deterministic, same results);
+        IVF cells come from index_arrays.
+        """
+        return cls(fit_X=fit_X, labels=labels, index_arrays=index_arrays, **params)
+
+    def encode(self, features: Dict[str, Any]) -> np.ndarray:
+        """
+        Feature row (same keys as the training columns) -> model input vector.
+        """
+        vec = np.zeros(self.n_features, dtype=np.float64)
+
+        for i, col in enumerate(self.numeric_cols):
+            value = features.get(col)
+            if value is None or (isinstance(value, float) and math.isnan(value)):
+                value = self.numeric_fill[i]
+            vec[i] = value
+        vec[:self.n_numeric] -= self.means
+        vec[:self.n_numeric] /= self.scales
+
+        for i, col in enumerate(self.categorical_cols):
+            value = features.get(col)
+            # Like SimpleImputer on object columns, only NaN (or an absent key)
+            # is missing; None is just an unknown category
+            if col not in features or (isinstance(value, float) and math.isnan(value)):
+                value = self.categorical_fill[i]
+            # Unknown categories encode as all zeros (handle_unknown="ignore")
+            pos = self.onehot_pos[i].get(value)
+            if pos is not None:
+                vec[pos] = 1.0
+
+        return vec
+
+    def _neighbors(self, vec: np.ndarray):
+        """
+        Distances + indices of the k nearest training rows, nearest first.
+        """
+        dist, ind = self.index.query(vec.reshape(1, -1), self.n_neighbors)
+        return dist[0], ind[0]
+
+    def _vote(self, dist: np.ndarray, ind: np.ndarray) -> int:
+        """
+        Vote over one row of neighbours (1/d weights, or 1 each for "uniform").
+        """
+        # Same weighting as sklearn: 1/d, or only exact matches if any d == 0
+        if self.weights == "uniform":
+            weights = np.ones(len(dist))
+        elif (dist == 0).any():
+            weights = (dist == 0).astype(np.float64)
+        else:
+            weights = 1.0 / dist
+
+        votes: Dict[int, float] = {}
+        for label, w in zip(self.labels[ind].tolist(), weights.tolist()):
+            votes[label] = votes.get(label, 0.0) + w
+
+        # Ties go to the smallest label, like sklearn's weighted_mode
+        best = max(votes.values())
+        return min(label for label, w in votes.items() if w == best)
+
+    def predict_one(self, features: Dict[str, Any]) -> int:
+        """
+        Predict the plan ID for a single feature row.
+        """
+        dist, ind = self._neighbors(self.encode(features))
+        return self._vote(dist, ind)
+
+    def predict_many(self, rows: Sequence[Dict[str, Any]], chunk_size: int = 1024) -> List[int]:
+        """
+        Predict a batch of feature rows with one neighbour query per chunk.
+        Same results as predict_one() on every row.
+        """
+        if not rows:
+            return []
+
+        preds: List[int] = []
+        for start in range(0, len(rows), chunk_size):
+            X = np.vstack([self.encode(r) for r in rows[start:start + chunk_size]])
+            dist, ind = self.index.query(X, self.n_neighbors)
+            preds.extend(self._vote(d, i) for d, i in zip(dist, ind))
+
+        return preds
+
@@ -0,0 +1,84 @@
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+# Dedicated pool for model inference (separate from Starlette's default threadpool)
+INFERENCE_WORKERS = int(os.getenv("FLEXA_INFERENCE_WORKERS", "4"))
+# How many calls may wait for a free worker before we start rejecting
+INFERENCE_MAX_QUEUE = int(os.getenv("FLEXA_INFERENCE_MAX_QUEUE", "64"))
+
+
+class ExecutorSaturated(Exception):
+    """
+    Raised when the inference pool and its queue are full (mapped to HTTP 503).
+    """
+
+
+class InferenceExecutor:
+    """
+    Bounded thread pool for FlexaRecommender calls from async handlers.
+
+    At most max_workers calls run at once and at most max_queue more may wait;
+    anything beyond that is rejected immediately with ExecutorSaturated, so a
+    burst turns into fast 503s instead of an ever-growing latency tail.
+    """
+
+    def __init__(self, max_workers: int = INFERENCE_WORKERS, max_queue: int = INFERENCE_MAX_QUEUE):
+        if max_workers <= 0 or max_queue < 0:
+            raise ValueError("max_workers must be > 0 and max_queue >= 0")
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        # Threads are started on first use, so the pool can be shut down and reused
+        # (e.g. one app lifespan after another in the same process)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            if self.in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ExecutorSaturated("Inference queue is full")
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="flexa-inference")
+            pool = self._pool
+
+        try:
+            future = pool.submit(functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            self._done(None)
+            raise
+        # Released when the call itself finishes, not when the caller stops
+        # waiting: a cancelled request (client gone) still occupies its thread
+        future.add_done_callback(self._done)
+        return await asyncio.wrap_future(future)
+
+    def _done(self, _future: Optional[Future]) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": max(0, self.in_flight - self.max_workers),
+            "peak_in_flight": self.peak_in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
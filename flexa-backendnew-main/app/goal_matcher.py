@@ -0,0 +1,60 @@
+import json
+import re
+from typing import Dict, FrozenSet, List, NamedTuple, Tuple
+
+
+class GoalMatch(NamedTuple):
+    expected_goals: Tuple[str, ...]
+    directions: FrozenSet[str]  # "lose" / "gain" phrases found (drift message wording)
+
+
+class GoalPhraseMatcher:
+    """
+    Maps a free-text problem ("I want to lose weight") to expected plan goals.
+
+    All phrases are compiled once into a single regex alternation and the
+    text is scanned in one pass, so adding synonyms/languages doesn't add
+    a substring search per phrase per message.
+
+    Semantics are plain substring matching (as before): a phrase counts if
+    it occurs anywhere in the lower-cased text, overlapping matches included.
+    """
+
+    def __init__(self, phrases: Dict[str, Dict[str, object]]):
+        table = {p.lower(): spec for p, spec in phrases.items()}
+        if not table:
+            raise ValueError("Goal phrase table is empty")
+
+        # Longest phrase wins at a given start position, so a match also
+        # implies every shorter phrase that is a prefix of it.
+        self._implied: Dict[str, List[Tuple[Tuple[str, ...], str]]] = {}
+        for phrase in table:
+            self._implied[phrase] = [
+                (tuple(spec.get("goals", [])), spec.get("direction"))
+                for other, spec in table.items()
+                if phrase.startswith(other)
+            ]
+
+        alternation = "|".join(re.escape(p) for p in sorted(table, key=len, reverse=True))
+        # Zero-width lookahead: one match attempt per position -> overlapping matches
+        self._pattern = re.compile(f"(?=({alternation}))")
+
+    @classmethod
+    def from_file(cls, path: str) -> "GoalPhraseMatcher":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f)["phrases"])
+
+    def match(self, text: str) -> GoalMatch:
+        goals: List[str] = []
+        directions = set()
+        seen = set()
+        for m in self._pattern.finditer(text.lower()):
+            phrase = m.group(1)
+            if phrase in seen:
+                continue
+            seen.add(phrase)
+            for phrase_goals, direction in self._implied[phrase]:
+                goals.extend(phrase_goals)
+                if direction:
+                    directions.add(direction)
+        return GoalMatch(tuple(dict.fromkeys(goals)), frozenset(directions))
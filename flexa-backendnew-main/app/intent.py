@@ -0,0 +1,119 @@
+import math
+import os
+import re
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Answers the classifier is less sure about than this are ignored
+INTENT_CONFIDENCE_THRESHOLD = float(os.getenv("FLEXA_INTENT_THRESHOLD", "0.6"))
+
+# Label for "not a fitness goal" (greetings, questions, ...)
+NO_INTENT = "Other"
+
+
+class IntentClassifier:
+    """
+    Tiny CPU-only goal classifier for free-text answers ("I'm too skinny").
+
+    Trained offline by train_intent.py (HashingVectorizer + LogisticRegression);
+    at serving time it only needs the weight matrix. Hashing uses the same
+    murmurhash3 + tokenization as sklearn's HashingVectorizer, so scores equal
+    the sklearn pipeline's, without its per-call validation overhead.
+    """
+
+    def __init__(self, coef: np.ndarray, intercept: np.ndarray, classes: Sequence[str],
+                 n_features: int, ngram_range: Tuple[int, int] = (1, 2),
+                 token_pattern: str = r"(?u)\b\w\w+\b"):
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.intercept = np.asarray(intercept, dtype=np.float64)
+        self.classes = list(classes)
+        self.n_features = int(n_features)
+        self.ngram_range = (int(ngram_range[0]), int(ngram_range[1]))
+        self.token_pattern = token_pattern
+        self._token_re = re.compile(token_pattern)
+
+        # Column-major copy: picking a few feature columns is then contiguous
+        self._coef_t = np.ascontiguousarray(self.coef.T)
+
+        from sklearn.utils import murmurhash3_32
+        self._hash = murmurhash3_32
+
+    @classmethod
+    def from_sklearn(cls, vectorizer, clf) -> "IntentClassifier":
+        if vectorizer.alternate_sign or vectorizer.norm != "l2" or vectorizer.binary:
+            raise ValueError("Expected HashingVectorizer(alternate_sign=False, norm='l2', binary=False)")
+        if len(clf.classes_) < 3:
+            raise ValueError("Expected a multinomial classifier with at least 3 classes")
+        return cls(
+            coef=clf.coef_,
+            intercept=clf.intercept_,
+            classes=[str(c) for c in clf.classes_],
+            n_features=vectorizer.n_features,
+            ngram_range=vectorizer.ngram_range,
+            token_pattern=vectorizer.token_pattern,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Plain arrays/values for joblib.dump (no sklearn objects).
+        """
+        return {
+            "coef": self.coef,
+            "intercept": self.intercept,
+            "classes": self.classes,
+            "n_features": self.n_features,
+            "ngram_range": self.ngram_range,
+            "token_pattern": self.token_pattern,
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "IntentClassifier":
+        return cls(**d)
+
+    def _features(self, text: str) -> Dict[int, float]:
+        tokens = self._token_re.findall(text.lower())
+        lo, hi = self.ngram_range
+
+        counts: Dict[int, float] = {}
+        for n in range(lo, hi + 1):
+            for i in range(len(tokens) - n + 1):
+                h = self._hash(" ".join(tokens[i:i + n]), seed=0)
+                if h == -2147483648:
+                    idx = (2147483647 - (self.n_features - 1)) % self.n_features
+                else:
+                    idx = abs(h) % self.n_features
+                counts[idx] = counts.get(idx, 0.0) + 1.0
+        return counts
+
+    def predict_proba(self, text: str) -> np.ndarray:
+        counts = self._features(text)
+        scores = self.intercept.copy()
+        if counts:
+            idx = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+            vals = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+            vals /= math.sqrt(float(vals @ vals))
+            scores += vals @ self._coef_t[idx]
+
+        # Multinomial logistic regression -> softmax
+        scores -= scores.max()
+        np.exp(scores, out=scores)
+        scores /= scores.sum()
+        return scores
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """
+        (label, confidence) of the most likely class.
+        """
+        proba = self.predict_proba(text)
+        best = int(proba.argmax())
+        return self.classes[best], float(proba[best])
+
+    def classify(self, text: str, threshold: float = INTENT_CONFIDENCE_THRESHOLD) -> Optional[str]:
+        """
+        Fitness goal for the text, or None if unsure or not a goal.
+        """
+        label, confidence = self.predict(text)
+        if confidence < threshold or label == NO_INTENT:
+            return None
+        return label
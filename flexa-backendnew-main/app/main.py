@@ -1,16 +1,112 @@
+import asyncio
+import json
+import os
+import secrets
+import threading
 import uuid
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Dict, Any
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from typing import Dict, Any, List, Optional, Tuple
 
 from .schema import (
     ChatStartResponse, ChatMessageRequest, ChatMessageResponse,
-    RecommendationRequest, RecommendationResponse
+    RecommendationRequest, RecommendationResponse,
+    RecommendationBatchRequest, RecommendationBatchResponse
 )
+from .batcher import MICRO_BATCHING, MicroBatcher
+from .chat_flow import CHAT_STATES, ChatFlow, ChatTurn
+from .executor import ExecutorSaturated, InferenceExecutor
 from .ml import FlexaRecommender
-from .utils import normalize_yes_no, normalize_sex
+from .reloader import RELOAD_POLL_SECONDS, ModelReloader, ReloadFailed, reload_signal
+from .session_state import ChatStep, SessionState
+from .sessions import SessionStore, create_session_store
 
-app = FastAPI(title="Flexa Backend")
+# Load the model in a background thread so /healthz answers immediately
+# (requests that need the model get a 503 until it is ready)
+BACKGROUND_WARMUP = os.getenv("FLEXA_BACKGROUND_WARMUP", "0") == "1"
+
+# Token for /admin/* endpoints (sent as X-Admin-Token); unset = admin endpoints disabled
+ADMIN_TOKEN = os.getenv("FLEXA_ADMIN_TOKEN", "")
+
+# ML recommender: loaded in the lifespan hook, or in the gunicorn master
+# before fork (see gunicorn.conf.py). Not at import time.
+recommender: Optional[FlexaRecommender] = None
+_recommender_lock = threading.Lock()
+_warmup_thread: Optional[threading.Thread] = None
+
+# Model calls from async handlers run here: bounded concurrency + queue depth
+inference_pool = InferenceExecutor()
+
+
+def load_recommender() -> FlexaRecommender:
+    """
+    Load the recommender once (thread-safe); later calls return the same instance.
+    """
+    global recommender
+    with _recommender_lock:
+        if recommender is None:
+            recommender = FlexaRecommender()
+    return recommender
+
+
+def _swap_recommender(new: FlexaRecommender) -> None:
+    global recommender
+    recommender = new
+
+
+# Hot reload: admin endpoint, signal (FLEXA_RELOAD_SIGNAL) or file polling (FLEXA_RELOAD_POLL_SECONDS)
+reloader = ModelReloader(current=lambda: recommender, swap=_swap_recommender)
+
+
+def reload_recommender(model_path: Optional[str] = None, workouts_path: Optional[str] = None) -> FlexaRecommender:
+    """
+    Load a new recommender next to the current one, smoke-test it, then swap
+    it in with a single reference assignment. Requests that already hold the
+    old instance finish with it; new requests get the new one.
+    Raises ReloadFailed (old instance kept) if the new artifacts are unusable.
+    """
+    return reloader.reload(model_path, workouts_path)
+
+
+def get_recommender() -> FlexaRecommender:
+    if recommender is not None:
+        return recommender
+    if _warmup_thread is not None and _warmup_thread.is_alive():
+        raise HTTPException(status_code=503, detail="Model is warming up, please retry shortly")
+    return load_recommender()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _warmup_thread
+    if recommender is None:
+        if BACKGROUND_WARMUP:
+            _warmup_thread = threading.Thread(target=load_recommender, name="flexa-warmup", daemon=True)
+            _warmup_thread.start()
+        else:
+            load_recommender()
+
+    loop = asyncio.get_running_loop()
+    reload_sig = reload_signal()
+    if reload_sig is not None:
+        try:
+            loop.add_signal_handler(reload_sig, reloader.reload_in_background)
+        except (NotImplementedError, RuntimeError, ValueError):
+            reload_sig = None  # no signal support here (Windows, non-main thread)
+    watcher = asyncio.create_task(reloader.watch(RELOAD_POLL_SECONDS)) if RELOAD_POLL_SECONDS > 0 else None
+
+    yield
+
+    if watcher is not None:
+        watcher.cancel()
+    if reload_sig is not None:
+        loop.remove_signal_handler(reload_sig)
+    inference_pool.shutdown()
+
+
+app = FastAPI(title="Flexa Backend", lifespan=lifespan)
 
 # Add CORS middleware to allow frontend to communicate with backend
 app.add_middleware(
@@ -21,389 +117,274 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Load ML recommender once
-recommender = FlexaRecommender()
+@app.exception_handler(ExecutorSaturated)
+async def executor_saturated_handler(request, exc: ExecutorSaturated):
+    # Fail fast under burst load instead of queueing without limit
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": "1"}
+    )
+
+
+# Chat sessions: in-memory LRU with idle TTL by default,
+# FLEXA_SESSION_BACKEND=redis to share them between workers
+SESSIONS: SessionStore = create_session_store()
+
+
+def _recommend_batch(requests: List[Tuple[FlexaRecommender, Dict[str, Any], bool]]) -> List[Any]:
+    """
+    Micro-batch body: one recommend_many() call per recommender (requests
+    queued across a reload keep the instance they started with).
+    """
+    groups: Dict[int, List[int]] = {}
+    for i, (recommender, _, _) in enumerate(requests):
+        groups.setdefault(id(recommender), []).append(i)
+
+    results: List[Any] = [None] * len(requests)
+    for positions in groups.values():
+        recommender = requests[positions[0]][0]
+        group = [requests[i][1:] for i in positions]
+        for i, result in zip(positions, _recommend_group(recommender, group)):
+            results[i] = result
+    return results
+
+
+def _recommend_group(recommender: FlexaRecommender, requests: List[Tuple[Dict[str, Any], bool]]) -> List[Any]:
+    """
+    One recommend_many() call for the requests. If it fails (e.g. one invalid
+    profile), retry one by one so only the bad request gets the error.
+    """
+    try:
+        return recommender.recommend_many(
+            [profile for profile, _ in requests],
+            wants_videos=[wants_videos for _, wants_videos in requests]
+        )
+    except Exception:
+        results = []
+        for profile, wants_videos in requests:
+            try:
+                results.append(recommender.recommend(profile, wants_videos=wants_videos))
+            except Exception as e:
+                results.append(e)
+        return results
+
+
+# Concurrent chat turns that need a prediction are grouped into one batched call
+batcher = MicroBatcher(lambda requests: inference_pool.run(_recommend_batch, requests))
+
+
+async def _recommend(recommender: FlexaRecommender, profile: Dict[str, Any], wants_videos: bool) -> Dict[str, Any]:
+    # The caller fetched recommender once (get_recommender()) and renders with the same instance
+    if MICRO_BATCHING:
+        return await batcher.submit((recommender, profile, wants_videos))
+    return await inference_pool.run(recommender.recommend, profile, wants_videos=wants_videos)
 
-# Very simple in-memory sessions (OK for demo/uni project)
-# For production: use Redis / DB
-SESSIONS: Dict[str, Dict[str, Any]] = {}
+
+# Conversation flow: state table in app/chat_flow.py, model calls go through _recommend
+# (each turn pins one recommender, see ChatFlow.pinned)
+chat_flow = ChatFlow(CHAT_STATES, recommend=_recommend, recommender=get_recommender)
 
 
 def _new_session() -> str:
     session_id = str(uuid.uuid4())
-    SESSIONS[session_id] = {
-        "state": "ASK_NAME",
-        "data": {}
-    }
+    SESSIONS.save(session_id, SessionState.new())
     return session_id
 
 
 @app.get("/chat/start", response_model=ChatStartResponse)
-def chat_start():
+async def chat_start():
     session_id = _new_session()
     return ChatStartResponse(
         session_id=session_id,
-        message="Hi! I'm Flexa 👋 What’s your name?"
+        message=CHAT_STATES[ChatStep.ASK_NAME].prompt
     )
 
 
-@app.post("/chat/message", response_model=ChatMessageResponse)
-def chat_message(payload: ChatMessageRequest):
-    session = SESSIONS.get(payload.session_id)
+def _session(session_id: Optional[str]) -> Tuple[str, SessionState]:
+    session = SESSIONS.get(session_id) if session_id else None
     if not session:
         # create a new one if missing
-        payload.session_id = _new_session()
-        session = SESSIONS[payload.session_id]
-
-    state = session["state"]
-    data = session["data"]
-    text = payload.user_message.strip()
-
-    # State machine: greet -> collect -> recommend
-    if state == "ASK_NAME":
-        data["name"] = text
-        session["state"] = "ASK_PROBLEM"
-        return ChatMessageResponse(
-            session_id=payload.session_id,
-            state=session["state"],
-            data_collected=data,
-            message=f"Nice to meet you, {data['name']}! What do you need help with? (e.g., weight loss, weight gain, flexibility, toning)"
-        )
+        session_id = _new_session()
+        session = SESSIONS.get(session_id)
+    return session_id, session
 
-    if state == "ASK_PROBLEM":
-        data["problem"] = text
-        session["state"] = "ASK_SEX"
-        return ChatMessageResponse(
-            session_id=payload.session_id,
-            state=session["state"],
-            data_collected=data,
-            message="Got it. What is your sex? (Male/Female)"
-        )
 
-    if state == "ASK_SEX":
-        data["sex"] = normalize_sex(text)
-        session["state"] = "ASK_AGE"
-        return ChatMessageResponse(
-            session_id=payload.session_id,
-            state=session["state"],
-            data_collected=data,
-            message="What is your age?"
-        )
+async def _chat_turn(session_id: str, session: SessionState, text: str,
+                     delta: bool = False) -> Tuple[ChatTurn, Dict[str, Any]]:
+    """
+    Advance a session by one user message: (turn, data_collected).
+    """
+    before = session.data() if delta else None
+    turn = await chat_flow.advance(session, text)
 
-    if state == "ASK_AGE":
-        try:
-            data["age"] = int(text)
-        except:
-            return ChatMessageResponse(
-                session_id=payload.session_id,
-                state=state,
-                data_collected=data,
-                message="Please type your age as a number (example: 21)."
-            )
-        session["state"] = "ASK_HEIGHT"
-        return ChatMessageResponse(
-            session_id=payload.session_id,
-            state=session["state"],
-            data_collected=data,
-            message="What is your height in meters? (example: 1.65)"
-        )
+    # Persist the updated session (needed for shared stores like Redis)
+    SESSIONS.save(session_id, session)
+
+    data = session.data()
+    if before is not None:
+        data = {k: v for k, v in data.items() if k not in before or before[k] != v}
+    return turn, data
 
-    if state == "ASK_HEIGHT":
-        try:
-            data["height_m"] = float(text)
-        except:
-            return ChatMessageResponse(
-                session_id=payload.session_id,
-                state=state,
-                data_collected=data,
-                message="Please type height in meters (example: 1.65)."
-            )
-        session["state"] = "ASK_WEIGHT"
-        return ChatMessageResponse(
-            session_id=payload.session_id,
-            state=session["state"],
-            data_collected=data,
-            message="What is your weight in kg? (example: 55)"
-        )
 
-    if state == "ASK_WEIGHT":
+@app.post("/chat/message", response_model=ChatMessageResponse)
+async def chat_message(payload: ChatMessageRequest):
+    session_id, session = _session(payload.session_id)
+    turn, data = await _chat_turn(session_id, session, payload.user_message, payload.delta)
+
+    return ChatMessageResponse(
+        session_id=session_id,
+        state=session.step.value,
+        data_collected=data,
+        message=turn.message,
+        user_data=turn.user_data
+    )
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _error_detail(e: Exception) -> str:
+    # Streams have already started: report 503-type failures in-band
+    return str(e.detail) if isinstance(e, HTTPException) else "Server is busy, please retry shortly"
+
+
+@app.post("/chat/message/stream")
+async def chat_message_stream(payload: ChatMessageRequest):
+    """
+    Same turn as /chat/message, streamed as Server-Sent Events:
+    "start" right away, one "section" per reply part (stats, exercises,
+    equipment, diet, recommendation / videos) and "done" with the state.
+    """
+    session_id, session = _session(payload.session_id)
+
+    async def events():
+        yield _sse("start", {"session_id": session_id})
         try:
-            data["weight_kg"] = float(text)
-        except:
-            return ChatMessageResponse(
-                session_id=payload.session_id,
-                state=state,
-                data_collected=data,
-                message="Please type weight in kg (example: 55)."
-            )
-        
-        # Calculate BMI
-        bmi = data["weight_kg"] / (data["height_m"] ** 2)
-        bmi_category = "Underweight" if bmi < 18.5 else "Normal" if bmi < 25 else "Overweight" if bmi < 30 else "Obese"
-        data["bmi"] = round(bmi, 1)
-        data["bmi_category"] = bmi_category
-        
-        session["state"] = "ASK_HYPERTENSION"
-        return ChatMessageResponse(
-            session_id=payload.session_id,
-            state=session["state"],
-            data_collected=data,
-            message=f"Great! Your BMI is {data['bmi']} ({bmi_category}).\n\nDo you have hypertension (high blood pressure)? (Yes/No)",
-            user_data={
-                "name": data.get("name"),
-                "height": round(data["height_m"] * 100),  # Convert to cm
-                "weight": data["weight_kg"],
-                "bmi": data["bmi"],
-                "bmi_category": bmi_category
-            }
-        )
+            turn, data = await _chat_turn(session_id, session, payload.user_message, payload.delta)
+        except (HTTPException, ExecutorSaturated) as e:
+            yield _sse("error", {"detail": _error_detail(e)})
+            return
+        for section, text in turn.sections:
+            yield _sse("section", {"section": section, "text": text})
+        yield _sse("done", {"session_id": session_id, "state": session.step.value,
+                            "data_collected": data, "user_data": turn.user_data})
 
-    if state == "ASK_HYPERTENSION":
-        data["hypertension"] = normalize_yes_no(text)
-        session["state"] = "ASK_DIABETES"
-        return ChatMessageResponse(
-            session_id=payload.session_id,
-            state=session["state"],
-            data_collected=data,
-            message="Do you have diabetes? (Yes/No)"
-        )
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
-    if state == "ASK_DIABETES":
-        data["diabetes"] = normalize_yes_no(text)
-        
-        # Check if user has health conditions
-        has_conditions = data["hypertension"] == "Yes" or data["diabetes"] == "Yes"
-        
-        # GOAL DRIFT DETECTION
-        # Before generating recommendations, check if stated problem matches ML prediction
-        drift_result = recommender.detect_goal_drift(
-            profile={
-                "sex": data["sex"],
-                "age": data["age"],
-                "height_m": data["height_m"],
-                "weight_kg": data["weight_kg"],
-                "hypertension": data["hypertension"],
-                "diabetes": data["diabetes"],
-            },
-            stated_problem=data.get("problem", "")
-        )
-        
-        # Store drift detection result
-        session["drift_result"] = drift_result
-        
-        # If drift detected, ask for clarification
-        if drift_result["has_drift"]:
-            session["state"] = "ASK_GOAL_CLARIFICATION"
-            return ChatMessageResponse(
-                session_id=payload.session_id,
-                state=session["state"],
-                data_collected=data,
-                message=drift_result["drift_message"] + "\n\nPlease reply: 'Follow AI recommendation' or 'Keep my original goal'"
-            )
-        
-        # No drift, proceed normally
-        # Generate ML-based recommendation
-        rec = recommender.recommend(
-            profile={
-                "sex": data["sex"],
-                "age": data["age"],
-                "height_m": data["height_m"],
-                "weight_kg": data["weight_kg"],
-                "hypertension": data["hypertension"],
-                "diabetes": data["diabetes"],
-            },
-            wants_videos=False  # No videos yet
-        )
 
-        # Store recommendation for later
-        session["recommendation"] = rec
-        
-        # Build a friendly response text
-        plan = rec["plan"]
-        msg = ""
-        
-        # Add doctor warning if health conditions exist
-        if has_conditions:
-            msg += "⚠️ IMPORTANT: Please consult your doctor before starting any new workout plan.\n\n"
-        
-        msg += f"✅ {data['name']}, here's your personalized plan (ML-based):\n\n"
-        
-        msg += "📊 YOUR STATS\n"
-        msg += f"• BMI: {rec['bmi']} ({rec['level']})\n"
-        msg += f"• Fitness Goal: {plan['fitness_goal']}\n"
-        msg += f"• Plan Type: {plan['fitness_type']}\n\n"
-        
-        msg += "🏋️ RECOMMENDED EXERCISES\n"
-        exercises = plan['exercises'].split(',') if ',' in plan['exercises'] else [plan['exercises']]
-        for ex in exercises:
-            msg += f"• {ex.strip()}\n"
-        msg += "\n"
-        
-        msg += "🧰 EQUIPMENT NEEDED\n"
-        equipment = plan['equipment'].split(',') if ',' in plan['equipment'] else [plan['equipment']]
-        for eq in equipment:
-            msg += f"• {eq.strip()}\n"
-        msg += "\n"
-        
-        msg += "🥗 DIET RECOMMENDATIONS\n"
-        # Split by semicolon, comma, or 'and' to handle various formats
-        diet_text = plan['diet']
-        # Replace common separators
-        diet_text = diet_text.replace(';', ',')
-        diet_text = diet_text.replace(' and ', ',')
-        diets = [d.strip() for d in diet_text.split(',') if d.strip()]
-        for diet in diets:
-            msg += f"• {diet}\n"
-        msg += "\n"
-        
-        msg += f"📌 EXPERT RECOMMENDATION\n{plan['recommendation']}\n\n"
-        
-        session["state"] = "ASK_VIDEOS"
-        return ChatMessageResponse(
-            session_id=payload.session_id,
-            state=session["state"],
-            data_collected=data,
-            message=msg + "Would you like me to suggest some YouTube workout videos as well? (Yes/No)"
-        )
+# /chat/ws frame fields, in order; compact frames are [code, *values]
+WS_FRAMES = {
+    "session": ("h", ("session_id", "state", "message", "data_collected")),
+    "section": ("s", ("section", "text")),
+    "done": ("d", ("state", "data_collected", "user_data")),
+    "error": ("e", ("detail",)),
+}
 
-    if state == "ASK_GOAL_CLARIFICATION":
-        # User responded to goal drift detection
-        response = text.lower()
-        
-        if "ai" in response or "recommendation" in response or "follow" in response:
-            # User wants to follow AI recommendation
-            data["user_chose_ai_goal"] = True
-            data["clarification"] = "Followed AI recommendation"
-        else:
-            # User wants to keep original goal
-            data["user_chose_ai_goal"] = False
-            data["clarification"] = "Kept original goal"
-        
-        # Now proceed with recommendation (will use original ML prediction either way)
-        has_conditions = data["hypertension"] == "Yes" or data["diabetes"] == "Yes"
-        
-        rec = recommender.recommend(
-            profile={
-                "sex": data["sex"],
-                "age": data["age"],
-                "height_m": data["height_m"],
-                "weight_kg": data["weight_kg"],
-                "hypertension": data["hypertension"],
-                "diabetes": data["diabetes"],
-            },
-            wants_videos=False
-        )
 
-        # Store recommendation for later
-        session["recommendation"] = rec
-        
-        # Build a friendly response text
-        plan = rec["plan"]
-        msg = ""
-        
-        # Add acknowledgment of user's choice
-        if data["user_chose_ai_goal"]:
-            msg += "✅ Great choice! Following the AI recommendation based on your stats.\\n\\n"
+@app.websocket("/chat/ws")
+async def chat_ws(websocket: WebSocket, session_id: Optional[str] = None, compact: bool = False):
+    """
+    One connection per chat session. The session is looked up once on
+    connect (?session_id=..., a new one is started if missing or unknown);
+    reconnecting with the same session_id resumes where the chat stopped.
+
+    client -> {"message": "...", "delta": false}
+    server -> {"type": "session", "session_id", "state", "message", "data_collected"}   on connect
+              {"type": "section", "section", "text"}                 per reply part
+              {"type": "done", "state", "data_collected", "user_data"}
+              {"type": "error", "detail"}                            turn failed, connection stays open
+
+    ?compact=1: the client sends the bare message text, the server sends
+    JSON arrays [code, *values] (codes/order in WS_FRAMES) and
+    data_collected only holds the fields changed by the turn.
+    """
+    async def send(frame_type: str, **values) -> None:
+        code, fields = WS_FRAMES[frame_type]
+        if compact:
+            await websocket.send_text(json.dumps([code, *(values[f] for f in fields)], ensure_ascii=False,
+                                                 separators=(",", ":")))
         else:
-            msg += "✅ Understood! We'll respect your goal preference.\\n\\n"
-        
-        # Add doctor warning if health conditions exist
-        if has_conditions:
-            msg += "⚠️ IMPORTANT: Please consult your doctor before starting any new workout plan.\\n\\n"
-        
-        msg += f"✅ {data['name']}, here's your personalized plan (ML-based):\\n\\n"
-        
-        msg += "📊 YOUR STATS\\n"
-        msg += f"• BMI: {rec['bmi']} ({rec['level']})\\n"
-        msg += f"• Fitness Goal: {plan['fitness_goal']}\\n"
-        msg += f"• Plan Type: {plan['fitness_type']}\\n\\n"
-        
-        msg += "🏋️ RECOMMENDED EXERCISES\\n"
-        exercises = plan['exercises'].split(',') if ',' in plan['exercises'] else [plan['exercises']]
-        for ex in exercises:
-            msg += f"• {ex.strip()}\\n"
-        msg += "\\n"
-        
-        msg += "🧰 EQUIPMENT NEEDED\\n"
-        equipment = plan['equipment'].split(',') if ',' in plan['equipment'] else [plan['equipment']]
-        for eq in equipment:
-            msg += f"• {eq.strip()}\\n"
-        msg += "\\n"
-        
-        msg += "🥗 DIET RECOMMENDATIONS\\n"
-        diet_text = plan['diet']
-        diet_text = diet_text.replace(';', ',')
-        diet_text = diet_text.replace(' and ', ',')
-        diets = [d.strip() for d in diet_text.split(',') if d.strip()]
-        for diet in diets:
-            msg += f"• {diet}\\n"
-        msg += "\\n"
-        
-        msg += f"📌 EXPERT RECOMMENDATION\\n{plan['recommendation']}\\n\\n"
-        
-        session["state"] = "ASK_VIDEOS"
-        return ChatMessageResponse(
-            session_id=payload.session_id,
-            state=session["state"],
-            data_collected=data,
-            message=msg + "Would you like me to suggest some YouTube workout videos as well? (Yes/No)"
-        )
+            await websocket.send_json({"type": frame_type, **values})
+
+    await websocket.accept()
+    session_id, session = _session(session_id)
+    await send("session", session_id=session_id, state=session.step.value,
+               message=chat_flow.prompt(session) or None, data_collected=session.data())
 
-    if state == "ASK_VIDEOS":
-        wants_videos = normalize_yes_no(text) == "Yes"
-        data["wants_videos"] = wants_videos
-        session["state"] = "DONE"
-        
-        if wants_videos:
-            # Retrieve stored recommendation and add videos
-            rec = session.get("recommendation")
-            if rec:
-                # Get YouTube videos
-                rec_with_videos = recommender.recommend(
-                    profile={
-                        "sex": data["sex"],
-                        "age": data["age"],
-                        "height_m": data["height_m"],
-                        "weight_kg": data["weight_kg"],
-                        "hypertension": data["hypertension"],
-                        "diabetes": data["diabetes"],
-                    },
-                    wants_videos=True
-                )
-                
-                msg = "▶️ RECOMMENDED WORKOUT VIDEOS\n\n"
-                if rec_with_videos["workouts"]:
-                    for i, w in enumerate(rec_with_videos["workouts"], 1):
-                        msg += f"{i}. {w['title']}\n"
-                        msg += f"   ⏱ Duration: {w['duration']} min\n"
-                        msg += f"   🔗 Watch: {w['youtube_link']}\n\n"
-                    msg += "Good luck with your fitness journey! 💪"
-                else:
-                    msg = "I couldn't find specific videos at the moment, but good luck with your fitness journey! 💪"
+    try:
+        while True:
+            if compact:
+                text, delta = await websocket.receive_text(), True
             else:
-                msg = "Good luck with your fitness journey! 💪"
-        else:
-            msg = "No problem! Good luck with your fitness journey! 💪"
+                frame = await websocket.receive_json()
+                text, delta = str(frame.get("message", "")), bool(frame.get("delta", False))
 
-        return ChatMessageResponse(
-            session_id=payload.session_id,
-            state=session["state"],
-            data_collected=data,
-            message=msg
-        )
+            try:
+                turn, data = await _chat_turn(session_id, session, text, delta)
+            except (HTTPException, ExecutorSaturated) as e:
+                await send("error", detail=_error_detail(e))
+                continue
 
-    # If already done:
-    return ChatMessageResponse(
-        session_id=payload.session_id,
-        state=session["state"],
-        data_collected=data,
-        message="If you want, type 'restart' to begin again."
-    )
+            for section, part in turn.sections:
+                await send("section", section=section, text=part)
+            await send("done", state=session.step.value, data_collected=data, user_data=turn.user_data)
+    except WebSocketDisconnect:
+        pass
+
+
+@app.get("/healthz")
+def healthz():
+    # Liveness: the process is up (does not wait for the model)
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+def readyz():
+    # Readiness: the model is loaded and requests can be served
+    if recommender is None:
+        return JSONResponse(status_code=503, content={"status": "loading"})
+    return {"status": "ready"}
+
+
+@app.get("/metrics")
+def metrics():
+    # Lightweight runtime counters (cache efficiency etc.)
+    return {
+        "recommendation_cache": recommender.cache_stats() if recommender is not None else None,
+        "sessions": SESSIONS.stats(),
+        "inference_pool": inference_pool.stats(),
+        "micro_batching": batcher.stats() if MICRO_BATCHING else None,
+        "model_reload": reloader.stats()
+    }
+
+
+@app.post("/admin/reload")
+async def admin_reload(x_admin_token: Optional[str] = Header(None)):
+    # Reload the model + workouts.json without downtime (see ModelReloader).
+    # Only in the worker process that handles this request: with several
+    # workers, signal each worker or use file polling instead.
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+    try:
+        # Loading runs in a thread: the event loop keeps serving the old model
+        await asyncio.get_running_loop().run_in_executor(None, reloader.reload)
+    except ReloadFailed as exc:
+        raise HTTPException(status_code=500, detail=f"Reload failed, previous model still serving: {exc}")
+    return {"status": "reloaded", **reloader.stats()}
 
 
 @app.post("/recommend", response_model=RecommendationResponse)
-def recommend_direct(req: RecommendationRequest):
-    rec = recommender.recommend(
+async def recommend_direct(req: RecommendationRequest):
+    # One instance for the prediction and the response (a reload may swap it meanwhile)
+    recommender = get_recommender()
+    rec = await _recommend(
+        recommender,
         profile={
             "sex": req.sex,
             "age": req.age,
@@ -415,11 +396,34 @@ def recommend_direct(req: RecommendationRequest):
         wants_videos=req.wants_videos
     )
 
-    return RecommendationResponse(
-        name=req.name,
-        bmi=rec["bmi"],
-        level=rec["level"],
-        plan=rec["plan"],
-        workouts=rec["workouts"],
-        safety_note="General guidance only. Consult a professional for medical concerns."
+    # Same body as RecommendationResponse, from pre-serialized plan/workout parts
+    return Response(
+        content=recommender.payloads.render(req.name, rec),
+        media_type="application/json"
+    )
+
+
+@app.post("/recommend/batch", response_model=RecommendationBatchResponse)
+async def recommend_batch(req: RecommendationBatchRequest):
+    # One vectorized model call for the whole batch
+    recommender = get_recommender()
+    recs = await inference_pool.run(
+        recommender.recommend_many,
+        profiles=[
+            {
+                "sex": r.sex,
+                "age": r.age,
+                "height_m": r.height_m,
+                "weight_kg": r.weight_kg,
+                "hypertension": r.hypertension,
+                "diabetes": r.diabetes,
+            }
+            for r in req.profiles
+        ],
+        wants_videos=[r.wants_videos for r in req.profiles]
+    )
+
+    return Response(
+        content=recommender.payloads.render_batch([r.name for r in req.profiles], recs),
+        media_type="application/json"
     )
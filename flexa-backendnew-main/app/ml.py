@@ -1,32 +1,173 @@
 import json
-import joblib
-import pandas as pd
-from typing import Dict, Any, List
+import os
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
 
+from .cache import TTLCache
+from .goal_matcher import GoalPhraseMatcher
+from .plans import PlanRecord, build_plan_index, plan_to_dict
 from .utils import compute_bmi, bmi_level, normalize_yes_no, normalize_sex
 
-MODEL_PATH = "models/flexa_plan_model.joblib"
-WORKOUTS_PATH = "data/workouts.json"
+# MODEL_PATH: legacy joblib bundle, or a slim artifact directory (train.py --slim)
+MODEL_PATH = os.getenv("MODEL_PATH", "models/flexa_plan_model.joblib")
+WORKOUTS_PATH = os.getenv("WORKOUTS_PATH", "data/workouts.json")
+GOAL_SYNONYMS_PATH = os.getenv("GOAL_SYNONYMS_PATH", "data/goal_synonyms.json")
+# Optional free-text goal classifier (train_intent.py); skipped if the file is missing
+INTENT_MODEL_PATH = os.getenv("INTENT_MODEL_PATH", "models/flexa_intent_model.joblib")
+
+# Intent classifier label -> drift message direction
+INTENT_DIRECTIONS = {"Weight Loss": "lose", "Weight Gain": "gain"}
+
+# Memory-map the model's NumPy arrays (read-only) so every worker process
+# shares the same page-cache pages instead of holding its own copy.
+# Set FLEXA_MODEL_MMAP_MODE="" to load everything into process memory.
+MODEL_MMAP_MODE = os.getenv("FLEXA_MODEL_MMAP_MODE", "r") or None
+
+# Memoized predictions: one chat (drift check -> plan -> videos) predicts once
+RECOMMENDATION_CACHE_SIZE = int(os.getenv("FLEXA_RECOMMENDATION_CACHE_SIZE", "4096"))
+RECOMMENDATION_CACHE_TTL = float(os.getenv("FLEXA_RECOMMENDATION_CACHE_TTL", "3600"))
+
+# Dataset plan goal/type -> workouts.json goal/category
+PLAN_GOAL_TO_WORKOUT_GOAL = {
+    "Weight Loss": "weight_loss",
+    "Weight Gain": "muscle_gain",
+    "Toning": "toning",
+    "Flexibility": "flexibility"
+}
+PLAN_TYPE_TO_CATEGORY = {
+    "Muscular Fitness": "Strength",
+    "Cardio": "Cardio",
+    "HIIT": "HIIT",
+    "Yoga": "Yoga"
+}
+
+# Normalized profile fields that fully determine the prediction (BMI/Level derive from them)
+PROFILE_KEY_COLS = ("Sex", "Age", "Height", "Weight", "Hypertension", "Diabetes")
+
+# Every (BMI level, hypertension, diabetes) a normalized profile can have
+BMI_LEVELS = ("Underweight", "Normal", "Overweight", "Obese")
+HEALTH_FLAGS = tuple((h, d) for h in ("No", "Yes") for d in ("No", "Yes"))
+
+# Profile run through a freshly loaded recommender before it serves traffic
+SMOKE_PROFILE = {"sex": "Female", "age": 30, "height_m": 1.65, "weight_kg": 60,
+                 "hypertension": "No", "diabetes": "No"}
 
 
 class FlexaRecommender:
     """
-    Loads the trained ML pipeline + the original dataset,
+    Loads the trained model (legacy joblib bundle or slim artifact),
     and can produce a recommended plan + relevant workouts.
     """
 
-    def __init__(self):
-        bundle = joblib.load(MODEL_PATH)
-        self.pipeline = bundle["pipeline"]
-        self.df: pd.DataFrame = bundle["dataset"]
+    def __init__(self, model_path: str = MODEL_PATH, workouts_path: str = WORKOUTS_PATH,
+                 mmap_mode: Optional[str] = MODEL_MMAP_MODE, goal_synonyms_path: str = GOAL_SYNONYMS_PATH,
+                 intent_model_path: Optional[str] = INTENT_MODEL_PATH):
+        # Kept so reloaded() can build a replacement with the same settings
+        self.model_path = model_path
+        self.workouts_path = workouts_path
+        self.mmap_mode = mmap_mode
+        self.goal_synonyms_path = goal_synonyms_path
+        self.intent_model_path = intent_model_path
+
+        # Heavy imports (numpy, joblib, sklearn via the bundle) happen here,
+        # not when the web app module is imported
+        from .artifact import is_slim_artifact, load_slim
+        from .catalog import WorkoutCatalog
+        from .engine import FastKNNEngine
+        from .renderer import PlanRenderer
+        from .responses import RecommendationPayloads
 
-        with open(WORKOUTS_PATH, "r", encoding="utf-8") as f:
+        if is_slim_artifact(model_path):
+            # Slim artifact: plain arrays + plan table, no sklearn pipeline or DataFrame
+            self.pipeline = None
+            self.df = None
+            self.engine, self.plans = load_slim(model_path, mmap_mode=mmap_mode)
+        else:
+            import joblib
+
+            bundle = joblib.load(model_path, mmap_mode=mmap_mode)
+            self.pipeline = bundle["pipeline"]
+            self.df = bundle["dataset"]
+
+            # Pandas-free inference (same predictions as the pipeline)
+            self.engine = FastKNNEngine.from_pipeline(self.pipeline, bundle.get("neighbor_index"))
+
+            # Plan ID -> immutable plan record (prebuilt by train.py, or built here for older bundles)
+            self.plans: Dict[int, PlanRecord] = bundle.get("plan_index") or build_plan_index(self.df)
+
+        # Chat plan messages, pre-rendered per distinct plan
+        self.renderer = PlanRenderer(self.plans)
+
+        with open(workouts_path, "r", encoding="utf-8") as f:
             self.workouts_data = json.load(f)["workouts"]
 
-    def recommend(self, profile: Dict[str, Any], wants_videos: bool = True) -> Dict[str, Any]:
+        # Workouts indexed by goal/category/difficulty/equipment/muscle group
+        self.catalog = WorkoutCatalog(self.workouts_data)
+
+        # Ranked workouts depend only on the plan's goal/type and the profile flags:
+        # rank every combination once instead of on every request
+        self.ranked_workouts: Dict[Tuple[str, str, str, str, str], List[Dict[str, Any]]] = {}
+        for goal, plan_type in {(r.fitness_goal, r.fitness_type) for r in self.plans.values()}:
+            for level in BMI_LEVELS:
+                for hypertension, diabetes in HEALTH_FLAGS:
+                    self.ranked_workouts[(goal, plan_type, level, hypertension, diabetes)] = self._pick_workouts(
+                        goal, plan_type, level=level, hypertension=hypertension, diabetes=diabetes
+                    )
+
+        # Pre-serialized /recommend response parts (plans, workout lists)
+        self.payloads = RecommendationPayloads(self.plans, self.ranked_workouts.values())
+
+        # Stated problem -> expected goals, compiled once from the synonym table
+        self.goal_matcher = GoalPhraseMatcher.from_file(goal_synonyms_path)
+
+        # Fallback for stated problems no synonym phrase covers ("I'm too skinny")
+        self.intent_model = None
+        if intent_model_path and os.path.exists(intent_model_path):
+            import joblib
+            from .intent import IntentClassifier
+
+            self.intent_model = IntentClassifier.from_dict(joblib.load(intent_model_path))
+
+        # Normalized profile tuple -> predicted plan ID
+        self.prediction_cache = TTLCache(
+            max_size=RECOMMENDATION_CACHE_SIZE,
+            ttl=RECOMMENDATION_CACHE_TTL
+        )
+
+    def reloaded(self, model_path: Optional[str] = None, workouts_path: Optional[str] = None) -> "FlexaRecommender":
         """
-        profile must contain:
-        sex, age, height_m, weight_kg, hypertension, diabetes
+        A new recommender loaded from the current files (or the given paths)
+        with the same settings. self is not modified, so requests still using
+        it finish normally; the caller swaps the reference (see main.reload_recommender).
+        """
+        return FlexaRecommender(
+            model_path=model_path or self.model_path,
+            workouts_path=workouts_path or self.workouts_path,
+            mmap_mode=self.mmap_mode,
+            goal_synonyms_path=self.goal_synonyms_path,
+            intent_model_path=self.intent_model_path
+        )
+
+    def smoke_test(self) -> None:
+        """
+        One end-to-end recommendation (model, plan index, workouts, chat text,
+        response JSON), bypassing the prediction cache. Raises if the loaded
+        artifacts cannot serve a request.
+        """
+        features = self._features(SMOKE_PROFILE)
+        batch = self.engine.predict_many([features])
+        pred_id = int(self.engine.predict_one(features))
+        if batch != [pred_id]:
+            raise ValueError(f"Single and batch predictions disagree: {pred_id} vs {batch}")
+        if pred_id not in self.plans:
+            raise ValueError(f"Predicted plan ID {pred_id} is not in the plan index")
+
+        rec = self._build_result(features, pred_id, wants_videos=True)
+        self.renderer.render_plan(rec, "Smoke test", has_conditions=False)
+        self.payloads.render("Smoke test", rec)
+
+    def _features(self, profile: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Normalize a raw profile into one feature row (must match training columns).
         """
         sex = normalize_sex(profile["sex"])
         age = int(profile["age"])
@@ -38,8 +179,7 @@ class FlexaRecommender:
         bmi = compute_bmi(height_m, weight_kg)
         level = bmi_level(bmi)
 
-        # Build a single-row dataframe for prediction (must match training columns)
-        X = pd.DataFrame([{
+        return {
             "Sex": sex,
             "Age": age,
             "Height": height_m,
@@ -48,101 +188,163 @@ class FlexaRecommender:
             "Diabetes": diabetes,
             "BMI": bmi,
             "Level": level
-        }])
-
-        # Predict closest plan ID
-        pred_id = int(self.pipeline.predict(X)[0])
-
-        # Fetch that plan row
-        row = self.df[self.df["ID"] == pred_id].iloc[0]
-
-        plan = {
-            "id": int(row["ID"]),
-            "fitness_goal": row["Fitness Goal"],
-            "fitness_type": row["Fitness Type"],
-            "exercises": row["Exercises"],
-            "equipment": row["Equipment"],
-            "diet": row["Diet"],
-            "recommendation": row["Recommendation"]
         }
 
+    def _build_result(self, features: Dict[str, Any], pred_id: int, wants_videos: bool) -> Dict[str, Any]:
+        """
+        Turn a predicted plan ID into the response dict returned by recommend().
+        """
+        # O(1) lookup in the prebuilt plan index (no pandas on the hot path)
+        plan = plan_to_dict(pred_id, self.plans[pred_id])
+
         workouts = []
         if wants_videos:
-            workouts = self._pick_workouts(plan_goal=plan["fitness_goal"], plan_type=plan["fitness_type"])
+            workouts = self.workouts_for(
+                plan,
+                level=features["Level"],
+                hypertension=features["Hypertension"],
+                diabetes=features["Diabetes"]
+            )
 
         return {
-            "bmi": round(float(bmi), 2),
-            "level": level,
+            "bmi": round(float(features["BMI"]), 2),
+            "level": features["Level"],
             "plan": plan,
             "workouts": workouts
         }
 
-    def _pick_workouts(self, plan_goal: str, plan_type: str) -> List[Dict[str, Any]]:
+    def recommend(self, profile: Dict[str, Any], wants_videos: bool = True) -> Dict[str, Any]:
         """
-        Map your dataset goal/type to the workout JSON goal/category.
+        profile must contain:
+        sex, age, height_m, weight_kg, hypertension, diabetes
         """
-        goal_map = {
-            "Weight Loss": "weight_loss",
-            "Weight Gain": "muscle_gain",
-            "Toning": "toning",
-            "Flexibility": "flexibility"
-        }
+        features = self._features(profile)
+        key = tuple(features[c] for c in PROFILE_KEY_COLS)
+
+        pred_id = self.prediction_cache.get(key)
+        if pred_id is None:
+            # Predict closest plan ID (NumPy fast path, no one-row DataFrame)
+            pred_id = int(self.engine.predict_one(features))
+            self.prediction_cache.set(key, pred_id)
+
+        return self._build_result(features, pred_id, wants_videos)
+
+    def recommend_many(
+        self,
+        profiles: Sequence[Dict[str, Any]],
+        wants_videos: Union[bool, Sequence[bool]] = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Batch version of recommend(): normalizes every profile, then runs
+        ONE vectorized engine prediction over the whole batch.
+        wants_videos can be a single flag or one flag per profile.
+        Each result is identical to calling recommend() on that profile.
+        """
+        if not profiles:
+            return []
+
+        if isinstance(wants_videos, bool):
+            video_flags = [wants_videos] * len(profiles)
+        else:
+            video_flags = list(wants_videos)
+            if len(video_flags) != len(profiles):
+                raise ValueError("wants_videos must have one flag per profile")
 
+        rows = [self._features(p) for p in profiles]
+        keys = [tuple(r[c] for c in PROFILE_KEY_COLS) for r in rows]
+        pred_ids = [self.prediction_cache.get(k) for k in keys]
+
+        # Only the cache misses go through the model, still as one batch
+        missing = [i for i, pred_id in enumerate(pred_ids) if pred_id is None]
+        if missing:
+            batch_preds = self.engine.predict_many([rows[i] for i in missing])
+            for i, pred_id in zip(missing, batch_preds):
+                pred_ids[i] = int(pred_id)
+                self.prediction_cache.set(keys[i], pred_ids[i])
+
+        return [
+            self._build_result(features, int(pred_id), flag)
+            for features, pred_id, flag in zip(rows, pred_ids, video_flags)
+        ]
+
+    def workouts_for(self, plan: Dict[str, Any], level: Optional[str] = None,
+                     hypertension: str = "No", diabetes: str = "No") -> List[Dict[str, Any]]:
+        """
+        Workouts for an already recommended plan (no new prediction needed).
+        With the user's BMI level / health flags the candidates are ranked for them.
+        """
+        if level is not None:
+            ranked = self.ranked_workouts.get(
+                (plan["fitness_goal"], plan["fitness_type"], level, hypertension, diabetes)
+            )
+            if ranked is not None:
+                return list(ranked)
+
+        return self._pick_workouts(
+            plan_goal=plan["fitness_goal"],
+            plan_type=plan["fitness_type"],
+            level=level,
+            hypertension=hypertension,
+            diabetes=diabetes
+        )
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return self.prediction_cache.stats()
+
+    def _pick_workouts(self, plan_goal: str, plan_type: str, level: Optional[str] = None,
+                       hypertension: str = "No", diabetes: str = "No", k: int = 3) -> List[Dict[str, Any]]:
+        """
+        Map your dataset goal/type to the workout JSON goal/category,
+        then pick the top k candidates (ranked by profile if level is given).
+        """
         # Default mapping; adjust based on your dataset wording
-        target_goal = goal_map.get(str(plan_goal).strip(), None)
+        target_goal = PLAN_GOAL_TO_WORKOUT_GOAL.get(str(plan_goal).strip(), None)
 
-        # Filter workouts
-        pool = self.workouts_data
-        if target_goal:
-            pool = [w for w in pool if str(w.get("goal")).strip() == target_goal]
+        # Filter workouts via the prebuilt catalog indexes
+        mask = self.catalog.mask(goal=target_goal) if target_goal else self.catalog.all_mask
 
         # Optional: also align by category if possible
         # Example: muscular fitness -> strength
-        type_map = {
-            "Muscular Fitness": "Strength",
-            "Cardio": "Cardio",
-            "HIIT": "HIIT",
-            "Yoga": "Yoga"
-        }
-        target_cat = type_map.get(str(plan_type).strip(), None)
+        target_cat = PLAN_TYPE_TO_CATEGORY.get(str(plan_type).strip(), None)
         if target_cat:
-            filtered = [w for w in pool if str(w.get("category")).strip().lower() == target_cat.lower()]
+            filtered = mask & self.catalog.mask(category=target_cat)
             if filtered:
-                pool = filtered
+                mask = filtered
 
-        # Return top 3 (simple)
-        return pool[:3]
+        if level is None:
+            # No profile context: first k in file order
+            return [self.catalog.workouts[p] for p in self.catalog.positions(mask, limit=k)]
 
-    def detect_goal_drift(self, profile: Dict[str, Any], stated_problem: str) -> Dict[str, Any]:
+        # Score candidates against the profile and keep the best k
+        from .ranking import rank_workouts
+
+        return rank_workouts(self.catalog, mask, k, target_goal, level, hypertension, diabetes)
+
+    def detect_goal_drift(self, profile: Dict[str, Any], stated_problem: str,
+                          rec: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Detect if user's stated problem conflicts with ML-predicted fitness goal.
-        Returns drift detection result with suggested clarification.
+        Returns drift detection result with suggested clarification,
+        plus the recommendation it used (reuse it instead of predicting again).
+        Pass rec if the recommendation was already computed (e.g. micro-batched).
         """
         # Get ML prediction
-        rec = self.recommend(profile, wants_videos=False)
+        if rec is None:
+            rec = self.recommend(profile, wants_videos=False)
         predicted_goal = rec["plan"]["fitness_goal"]
         
-        # Map user's stated problem to expected goals
-        problem_goal_map = {
-            "weight loss": ["Weight Loss", "Toning"],
-            "lose weight": ["Weight Loss", "Toning"],
-            "fat loss": ["Weight Loss"],
-            "weight gain": ["Weight Gain"],
-            "gain weight": ["Weight Gain"],
-            "build muscle": ["Weight Gain"],
-            "muscle gain": ["Weight Gain"],
-            "tone up": ["Toning"],
-            "toning": ["Toning"],
-            "flexibility": ["Flexibility"],
-            "stretching": ["Flexibility"],
-        }
+        # Map user's stated problem to expected goals (one pass over the text)
+        match = self.goal_matcher.match(stated_problem)
+        expected_goals = match.expected_goals
+        directions = match.directions
         
-        # Find expected goals based on stated problem
-        stated_lower = stated_problem.lower()
-        expected_goals = []
-        for key, goals in problem_goal_map.items():
-            if key in stated_lower:
-                expected_goals.extend(goals)
+        # No known phrase: let the intent classifier guess (None if unsure)
+        intent = None
+        if not expected_goals and self.intent_model is not None:
+            intent = self.intent_model.classify(stated_problem)
+            if intent is not None:
+                expected_goals = (intent,)
+                directions = frozenset([INTENT_DIRECTIONS[intent]]) if intent in INTENT_DIRECTIONS else frozenset()
         
         # Check for drift
         has_drift = False
@@ -154,10 +356,10 @@ class FlexaRecommender:
             bmi_level = rec["level"]
             
             # Generate contextual drift message
-            if "weight loss" in stated_lower or "lose weight" in stated_lower:
+            if "lose" in directions:
                 if predicted_goal == "Weight Gain":
                     drift_message = f"🤔 GOAL DRIFT DETECTED\n\nYour BMI is {bmi} ({bmi_level}), and based on your physical stats, our AI suggests a '{predicted_goal}' plan. However, you mentioned wanting to lose weight.\n\nThis could mean:\n• Your current weight is already low for your height\n• Gaining muscle mass might be healthier than losing weight\n\nWould you like to reconsider your goal, or shall we proceed with your stated preference?"
-            elif "weight gain" in stated_lower or "gain weight" in stated_lower or "build muscle" in stated_lower:
+            elif "gain" in directions:
                 if predicted_goal == "Weight Loss":
                     drift_message = f"🤔 GOAL DRIFT DETECTED\n\nYour BMI is {bmi} ({bmi_level}), and based on your physical stats, our AI suggests a '{predicted_goal}' plan. However, you mentioned wanting to gain weight or build muscle.\n\nThis could mean:\n• Your current weight is higher than ideal for your height\n• Losing fat first might be healthier before building muscle\n\nWould you like to reconsider your goal, or shall we proceed with your stated preference?"
             else:
@@ -167,7 +369,9 @@ class FlexaRecommender:
             "has_drift": has_drift,
             "predicted_goal": predicted_goal,
             "stated_problem": stated_problem,
+            "stated_intent": intent,
             "drift_message": drift_message,
             "bmi": rec["bmi"],
-            "bmi_level": rec["level"]
+            "bmi_level": rec["level"],
+            "recommendation": rec
         }
@@ -0,0 +1,232 @@
+import math
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+# Neighbour search backends the engine (and train.py --neighbors) can use
+NEIGHBOR_BACKENDS = ("brute", "kd_tree", "ball_tree", "ivf")
+# Distance metrics the exact backends support (IVF is euclidean only)
+NEIGHBOR_METRICS = ("euclidean", "manhattan")
+
+# IVF defaults: ~sqrt(n) lists, search the 8 closest lists per query
+IVF_PROBE = 8
+IVF_KMEANS_ITERS = 10
+IVF_SAMPLE_PER_LIST = 32
+
+# Block size for scans over the training matrix in the IVF build (bounds temporary memory)
+SCAN_BLOCK = 65536
+
+
+def _top_k(d2: np.ndarray, ind: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    k smallest (squared) distances, nearest first; ties go to the lower row index.
+    """
+    if len(d2) > k:
+        # Keep everything tied with the k-th distance, then order exactly
+        kth = np.partition(d2, k - 1)[k - 1]
+        keep = d2 <= kth
+        d2, ind = d2[keep], ind[keep]
+    order = np.lexsort((ind, d2))[:k]
+    return d2[order], ind[order]
+
+
+def _squared_distances(rows: np.ndarray, vec: np.ndarray) -> np.ndarray:
+    diff = rows - vec
+    return np.einsum("ij,ij->i", diff, diff)
+
+
+class NeighborIndex(ABC):
+    """
+    k-nearest-neighbour search over the training matrix, with the pipeline's
+    distance metric (one of NEIGHBOR_METRICS; IVF is euclidean only).
+
+    query(X, k) -> (distances, row indices), both (len(X), k), nearest first.
+    export_params() are plain JSON values, export_arrays() NumPy arrays
+    (saved as .npy in slim artifacts); build_index() rebuilds from both.
+    """
+    method = ""
+
+    def __init__(self, fit_X: np.ndarray, metric: str = "euclidean"):
+        if metric not in NEIGHBOR_METRICS:
+            raise ValueError(f"Unsupported metric: {metric!r} (use one of {', '.join(NEIGHBOR_METRICS)})")
+        self.fit_X = fit_X
+        self.metric = metric
+
+    @abstractmethod
+    def query(self, X: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(distances, row indices) of the k nearest rows to each row of X."""
+
+    def export_params(self) -> Dict[str, Any]:
+        return {}
+
+    def export_arrays(self) -> Dict[str, np.ndarray]:
+        return {}
+
+
+class BruteForceIndex(NeighborIndex):
+    """
+    Exact search by scanning every row, with sklearn's brute-force search:
+    the same chunked, vectorized distance code KNeighborsClassifier(algorithm="brute")
+    runs, so distances match pipeline.predict to the last bit (an ulp of
+    difference is enough to flip a distance-weighted vote tie).
+    """
+    method = "brute"
+
+    def __init__(self, fit_X: np.ndarray, metric: str = "euclidean"):
+        super().__init__(fit_X, metric)
+        from sklearn.neighbors import NearestNeighbors
+
+        self._nn = NearestNeighbors(algorithm="brute", metric=metric).fit(fit_X)
+
+    def query(self, X: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        return self._nn.kneighbors(X, n_neighbors=k)
+
+
+class TreeIndex(NeighborIndex):
+    """
+    Exact search with sklearn's KDTree / BallTree (what KNeighborsClassifier
+    uses internally, so the neighbour order matches pipeline.predict).
+    """
+
+    def __init__(self, fit_X: np.ndarray, method: str = "kd_tree", leaf_size: int = 30,
+                 tree: Optional[Any] = None, metric: str = "euclidean"):
+        super().__init__(fit_X, metric)
+        if method not in ("kd_tree", "ball_tree"):
+            raise ValueError(f"Unknown tree method: {method!r}")
+        self.method = method
+        self.leaf_size = int(leaf_size)
+
+        if tree is None:
+            from sklearn.neighbors import BallTree, KDTree
+
+            tree_cls = KDTree if method == "kd_tree" else BallTree
+            tree = tree_cls(fit_X, leaf_size=self.leaf_size, metric=metric)
+        self.tree = tree
+
+    def query(self, X: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        return self.tree.query(X, k=k)
+
+    def export_params(self) -> Dict[str, Any]:
+        return {"leaf_size": self.leaf_size}
+
+
+class IVFIndex(NeighborIndex):
+    """
+    Approximate search with an inverted file index (IVF), pure NumPy.
+
+    Rows are clustered into n_lists cells by k-means (fitted on a sample);
+    a query scans only the rows of the n_probe cells with the closest
+    centroids. More probes = better recall, slower queries. Rows are kept
+    in a cell-ordered matrix (cell_X) so a cell is one contiguous read; it is
+    exported with the index arrays, so a loaded index memory-maps it like
+    fit_X instead of building a private copy.
+    """
+    method = "ivf"
+
+    def __init__(self, fit_X: np.ndarray, n_lists: Optional[int] = None, n_probe: int = IVF_PROBE,
+                 seed: int = 0, centroids: Optional[np.ndarray] = None,
+                 order: Optional[np.ndarray] = None, offsets: Optional[np.ndarray] = None,
+                 cell_X: Optional[np.ndarray] = None, metric: str = "euclidean"):
+        super().__init__(fit_X, metric)
+        if metric != "euclidean":
+            raise ValueError("IVF index supports the euclidean metric only")
+        self.n_probe = int(n_probe)
+        self.seed = int(seed)
+
+        if centroids is None:
+            n_lists = n_lists or max(1, int(math.sqrt(len(fit_X))))
+            centroids, order, offsets = self._build(fit_X, min(int(n_lists), len(fit_X)), self.seed)
+
+        self.centroids = np.asarray(centroids, dtype=np.float64)
+        self.order = order          # row indices grouped by cell
+        self.offsets = offsets      # cell i = order[offsets[i]:offsets[i + 1]]
+        self.n_lists = len(self.centroids)
+        if cell_X is None:
+            # New index (or one saved without cell_X): build the cell-ordered rows
+            cell_X = np.ascontiguousarray(fit_X[self.order], dtype=np.float64)
+        self.cell_X = cell_X
+        self._centroid_sq = np.einsum("ij,ij->i", self.centroids, self.centroids)
+
+    @staticmethod
+    def _nearest_centroid(X: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        # argmin ||x - c||^2 = argmin (||c||^2 - 2 x.c), in blocks of ~SCAN_BLOCK * 16 products
+        c_sq = np.einsum("ij,ij->i", centroids, centroids)
+        out = np.empty(len(X), dtype=np.int64)
+        step = max(1, SCAN_BLOCK * 16 // len(centroids))
+        for start in range(0, len(X), step):
+            block = np.asarray(X[start:start + step])
+            out[start:start + len(block)] = np.argmin(c_sq - 2.0 * block @ centroids.T, axis=1)
+        return out
+
+    @classmethod
+    def _build(cls, fit_X: np.ndarray, n_lists: int, seed: int):
+        rng = np.random.default_rng(seed)
+        n, dim = fit_X.shape
+
+        sample_size = min(n, n_lists * IVF_SAMPLE_PER_LIST)
+        sample = np.asarray(fit_X[np.sort(rng.choice(n, size=sample_size, replace=False))])
+        centroids = sample[rng.choice(sample_size, size=n_lists, replace=False)].copy()
+
+        # Lloyd's k-means on the sample; empty cells keep their old centroid
+        for _ in range(IVF_KMEANS_ITERS):
+            assign = cls._nearest_centroid(sample, centroids)
+            counts = np.bincount(assign, minlength=n_lists)
+            sums = np.column_stack([np.bincount(assign, weights=sample[:, j], minlength=n_lists) for j in range(dim)])
+            filled = counts > 0
+            centroids[filled] = sums[filled] / counts[filled, None]
+
+        assign = cls._nearest_centroid(fit_X, centroids)
+        order = np.argsort(assign, kind="stable")
+        offsets = np.searchsorted(assign[order], np.arange(n_lists + 1))
+        return centroids, order, offsets
+
+    def _cells(self, vec: np.ndarray, k: int) -> np.ndarray:
+        # Closest cells first; keep adding cells until there are at least k rows
+        cell_d2 = self._centroid_sq - 2.0 * (self.centroids @ vec)
+        probe = min(self.n_probe, self.n_lists)
+        cells = np.argpartition(cell_d2, probe - 1)[:probe] if probe < self.n_lists else np.arange(self.n_lists)
+        sizes = self.offsets[cells + 1] - self.offsets[cells]
+        if sizes.sum() < k:
+            cells = np.argsort(cell_d2)
+            sizes = self.offsets[cells + 1] - self.offsets[cells]
+            cells = cells[:int(np.searchsorted(np.cumsum(sizes), k)) + 1]
+
+        return cells
+
+    def query(self, X: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        dist = np.empty((len(X), k))
+        ind = np.empty((len(X), k), dtype=np.intp)
+
+        for q, vec in enumerate(X):
+            d2_parts, ind_parts = [], []
+            for c in self._cells(vec, k).tolist():
+                start, end = self.offsets[c], self.offsets[c + 1]
+                d2_parts.append(_squared_distances(self.cell_X[start:end], vec))
+                ind_parts.append(self.order[start:end])
+            d2, best = _top_k(np.concatenate(d2_parts), np.concatenate(ind_parts), k)
+            dist[q], ind[q] = np.sqrt(d2), best
+
+        return dist, ind
+
+    def export_params(self) -> Dict[str, Any]:
+        return {"n_probe": self.n_probe, "seed": self.seed}
+
+    def export_arrays(self) -> Dict[str, np.ndarray]:
+        return {"centroids": self.centroids, "order": self.order, "offsets": self.offsets, "cell_X": self.cell_X}
+
+
+def build_index(method: str, fit_X: np.ndarray, tree: Optional[Any] = None,
+                arrays: Optional[Dict[str, np.ndarray]] = None, metric: str = "euclidean",
+                **params) -> NeighborIndex:
+    """
+    Neighbour index for a backend name (see NEIGHBOR_BACKENDS).
+    arrays are previously exported index arrays (e.g. IVF cells), if any.
+    """
+    if method == "brute":
+        return BruteForceIndex(fit_X, metric)
+    if method in ("kd_tree", "ball_tree"):
+        return TreeIndex(fit_X, method, tree=tree, metric=metric, **params)
+    if method == "ivf":
+        return IVFIndex(fit_X, metric=metric, **params, **(arrays or {}))
+    raise ValueError(f"Unknown neighbour backend: {method!r} (use one of {', '.join(NEIGHBOR_BACKENDS)})")
@@ -0,0 +1,51 @@
+from typing import TYPE_CHECKING, Dict, NamedTuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class PlanRecord(NamedTuple):
+    """
+    Immutable plan text for one plan ID (no pandas objects).
+    """
+    fitness_goal: str
+    fitness_type: str
+    exercises: str
+    equipment: str
+    diet: str
+    recommendation: str
+
+
+# Dataset column -> PlanRecord field
+PLAN_COLUMNS = {
+    "Fitness Goal": "fitness_goal",
+    "Fitness Type": "fitness_type",
+    "Exercises": "exercises",
+    "Equipment": "equipment",
+    "Diet": "diet",
+    "Recommendation": "recommendation",
+}
+
+
+def build_plan_index(df: "pd.DataFrame") -> Dict[int, PlanRecord]:
+    """
+    Build {plan ID -> PlanRecord} once, at load/training time.
+    Many IDs share the exact same plan text, so identical records
+    are stored once and shared between IDs.
+    """
+    cols = list(PLAN_COLUMNS)
+    shared: Dict[PlanRecord, PlanRecord] = {}
+    index: Dict[int, PlanRecord] = {}
+
+    for plan_id, *values in zip(df["ID"].tolist(), *(df[c].tolist() for c in cols)):
+        record = PlanRecord(*values)
+        index[int(plan_id)] = shared.setdefault(record, record)
+
+    return index
+
+
+def plan_to_dict(plan_id: int, record: PlanRecord) -> Dict[str, object]:
+    """
+    API shape of a plan (same keys recommend() has always returned).
+    """
+    return {"id": int(plan_id), **record._asdict()}
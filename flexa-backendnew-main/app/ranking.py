@@ -0,0 +1,89 @@
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .catalog import WorkoutCatalog
+
+# Difficulty fit per profile group (columns: beginner, intermediate, advanced)
+DIFFICULTY_FIT = {
+    # Obese BMI or a health condition: strongly prefer beginner, avoid advanced
+    "cautious": np.array([2.0, 0.0, -3.0]),
+    # Under/overweight: beginner or intermediate
+    "moderate": np.array([1.0, 1.0, -1.0]),
+    # Normal BMI, no conditions: intermediate first, everything acceptable
+    "normal": np.array([0.5, 1.0, 0.5]),
+}
+
+# Weight of calories burned per minute, by workout goal
+CALORIE_DENSITY_WEIGHT = {
+    "weight_loss": 2.0,
+    "toning": 0.5,
+}
+
+# Cautious profiles: small penalty per minute, so shorter sessions win ties
+CAUTIOUS_DURATION_PENALTY = 1.0 / 60
+
+
+def profile_group(level: Optional[str], hypertension: str = "No", diabetes: str = "No") -> str:
+    if level == "Obese" or hypertension == "Yes" or diabetes == "Yes":
+        return "cautious"
+    if level in ("Underweight", "Overweight"):
+        return "moderate"
+    return "normal"
+
+
+def score_workouts(catalog: WorkoutCatalog, positions: np.ndarray, target_goal: Optional[str],
+                   level: Optional[str], hypertension: str = "No", diabetes: str = "No") -> np.ndarray:
+    """
+    Score candidate workouts (positions in the catalog) against the user's profile.
+    Higher is better; vectorized over all candidates.
+    """
+    group = profile_group(level, hypertension, diabetes)
+
+    codes = catalog.difficulty_codes[positions]
+    fit = DIFFICULTY_FIT[group]
+    scores = np.where(codes >= 0, fit[np.clip(codes, 0, 2)], 0.0)
+
+    weight = CALORIE_DENSITY_WEIGHT.get(target_goal, 0.0)
+    if weight:
+        durations = catalog.durations[positions]
+        density = np.divide(catalog.calories[positions], durations,
+                            out=np.zeros(len(positions)), where=durations > 0)
+        top = density.max() if len(density) else 0.0
+        if top > 0:
+            scores = scores + weight * density / top
+
+    if group == "cautious":
+        scores = scores - CAUTIOUS_DURATION_PENALTY * catalog.durations[positions]
+
+    return scores
+
+
+def top_k(positions: np.ndarray, scores: np.ndarray, k: int) -> List[int]:
+    """
+    Best k positions by score (ties keep file order).
+    np.argpartition selects the k best in O(n); only those k get sorted.
+    """
+    n = len(positions)
+    if n == 0 or k <= 0:
+        return []
+    if n > k:
+        cutoff = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        # Ties at the cutoff: positions are in file order, so keep the first ones
+        above = np.flatnonzero(scores > cutoff)
+        tied = np.flatnonzero(scores == cutoff)[:k - len(above)]
+        best = np.concatenate([above, tied])
+    else:
+        best = np.arange(n)
+    order = np.lexsort((positions[best], -scores[best]))[:k]
+    return positions[best[order]].tolist()
+
+
+def rank_workouts(catalog: WorkoutCatalog, mask: int, k: int, target_goal: Optional[str],
+                  level: Optional[str], hypertension: str = "No", diabetes: str = "No") -> List[Dict[str, Any]]:
+    """
+    Top-k workouts among the candidates in mask for this profile.
+    """
+    positions = catalog.position_array(mask)
+    scores = score_workouts(catalog, positions, target_goal, level, hypertension, diabetes)
+    return [catalog.workouts[p] for p in top_k(positions, scores, k)]
@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import os
+import signal
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .ml import FlexaRecommender
+
+logger = logging.getLogger("flexa.reload")
+
+# Poll the model/workouts files every N seconds and reload when they change (0 = off)
+RELOAD_POLL_SECONDS = float(os.getenv("FLEXA_RELOAD_POLL_SECONDS", "0"))
+# Signal that triggers a reload in the process receiving it ("" = none), e.g.
+# SIGURG; send it to the workers only: pkill -URG -P "$(cat gunicorn.pid)"
+RELOAD_SIGNAL = os.getenv("FLEXA_RELOAD_SIGNAL", "")
+# Signals the gunicorn master or its workers act on (SIGUSR2 = binary upgrade, ...)
+GUNICORN_SIGNALS = ("SIGHUP", "SIGQUIT", "SIGINT", "SIGTERM", "SIGTTIN", "SIGTTOU",
+                    "SIGUSR1", "SIGUSR2", "SIGWINCH", "SIGCHLD", "SIGABRT")
+
+# (mtime_ns, size) of a file, or None if it does not exist
+Stamp = Optional[Tuple[int, int]]
+
+
+class ReloadFailed(Exception):
+    """
+    The new artifacts could not be loaded or failed the smoke test
+    (the previous recommender keeps serving).
+    """
+
+
+def reload_signal(name: str = RELOAD_SIGNAL) -> Optional[signal.Signals]:
+    """
+    The configured reload signal, or None if unset or unknown on this platform.
+    Raises ValueError for signals gunicorn already uses.
+    """
+    if not name:
+        return None
+    if name in GUNICORN_SIGNALS:
+        raise ValueError(f"FLEXA_RELOAD_SIGNAL={name} is used by gunicorn; pick another one (e.g. SIGURG)")
+    return getattr(signal, name, None)
+
+
+def file_stamp(path: str) -> Stamp:
+    # Slim artifacts are directories: CURRENT is replaced atomically once an
+    # export is complete (meta.json for directories written before versioning)
+    if os.path.isdir(path):
+        from .artifact import SLIM_POINTER  # numpy: not at web app import time
+
+        pointer = os.path.join(path, SLIM_POINTER)
+        path = pointer if os.path.exists(pointer) else os.path.join(path, "meta.json")
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class ModelReloader:
+    """
+    Zero-downtime reload of the recommender (model artifact + workouts.json).
+
+    A reload builds a complete new FlexaRecommender next to the serving one,
+    runs its smoke test, and only then hands it to swap() (one reference
+    assignment). Requests that already hold the old instance finish with it;
+    its memory (and memory-mapped files) is released when they are done.
+    Failed reloads leave the old instance in place.
+
+    current() returns the serving recommender (None while it is still loading);
+    swap(new) publishes a new one.
+    """
+
+    def __init__(self, current: Callable[[], Optional[FlexaRecommender]],
+                 swap: Callable[[FlexaRecommender], None]):
+        self._current = current
+        self._swap = swap
+        self._lock = threading.Lock()  # one reload at a time
+        self._thread: Optional[threading.Thread] = None
+        # Files as of the last reload attempt (None until first checked)
+        self._stamps: Optional[Tuple[Stamp, Stamp]] = None
+
+        self.generation = 0
+        self.failures = 0
+        self.last_load_s: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    @staticmethod
+    def _file_stamps(model_path: str, workouts_path: str) -> Tuple[Stamp, Stamp]:
+        return file_stamp(model_path), file_stamp(workouts_path)
+
+    def reload(self, model_path: Optional[str] = None, workouts_path: Optional[str] = None) -> FlexaRecommender:
+        """
+        Load, validate and swap in a new recommender (blocking; call it off the
+        event loop). Paths default to the serving recommender's.
+        """
+        with self._lock:
+            current = self._current()
+            if current is None:
+                raise ReloadFailed("No model loaded yet")
+            model_path = model_path or current.model_path
+            workouts_path = workouts_path or current.workouts_path
+            self._stamps = self._file_stamps(model_path, workouts_path)
+
+            start = time.perf_counter()
+            try:
+                new = current.reloaded(model_path, workouts_path)
+                new.smoke_test()
+            except Exception as exc:
+                self.failures += 1
+                self.last_error = f"{type(exc).__name__}: {exc}"
+                logger.error("Model reload failed, still serving generation %d: %s", self.generation, self.last_error)
+                raise ReloadFailed(self.last_error) from exc
+
+            self._swap(new)
+            self.generation += 1
+            self.last_load_s = round(time.perf_counter() - start, 3)
+            self.last_error = None
+            logger.info("Model reloaded (generation %d) in %.2fs", self.generation, self.last_load_s)
+            return new
+
+    def reload_in_background(self) -> bool:
+        """
+        Start reload() in a daemon thread; False if one is already running.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return False
+
+        def run():
+            try:
+                self.reload()
+            except ReloadFailed:
+                pass  # recorded in stats()
+
+        self._thread = threading.Thread(target=run, name="flexa-reload", daemon=True)
+        self._thread.start()
+        return True
+
+    def changed(self) -> bool:
+        """
+        Whether the serving recommender's files changed since the last reload
+        attempt (the first call only records their state).
+        """
+        current = self._current()
+        if current is None:
+            return False
+        stamps = self._file_stamps(current.model_path, current.workouts_path)
+        if self._stamps is None:
+            self._stamps = stamps
+            return False
+        # A half-copied file may be missing for a moment: wait for it
+        return stamps != self._stamps and None not in stamps
+
+    async def watch(self, interval: float) -> None:
+        """
+        Poll the files every interval seconds and reload when they change
+        (the reload runs in a thread, the event loop keeps serving).
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval)
+            if self.changed():
+                try:
+                    await loop.run_in_executor(None, self.reload)
+                except ReloadFailed:
+                    pass  # retried when the files change again
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "generation": self.generation,
+            "failures": self.failures,
+            "last_load_s": self.last_load_s,
+            "last_error": self.last_error,
+            "in_progress": self._lock.locked(),
+        }
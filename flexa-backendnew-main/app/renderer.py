@@ -0,0 +1,125 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from .plans import PlanRecord
+
+DOCTOR_WARNING = "⚠️ IMPORTANT: Please consult your doctor before starting any new workout plan.\n\n"
+VIDEOS_QUESTION = "Would you like me to suggest some YouTube workout videos as well? (Yes/No)"
+GOOD_LUCK = "Good luck with your fitness journey! 💪"
+
+# Acknowledgment of the goal-clarification answer (None = no drift question was asked)
+CLARIFICATION_ACK = {
+    None: "",
+    True: "✅ Great choice! Following the AI recommendation based on your stats.\n\n",
+    False: "✅ Understood! We'll respect your goal preference.\n\n",
+}
+
+
+def split_list(text: str) -> List[str]:
+    """
+    Comma-separated plan field (exercises, equipment) -> items.
+    """
+    return [item.strip() for item in text.split(",")]
+
+
+def split_diet(text: str) -> List[str]:
+    """
+    Diet text -> items, split by semicolon, comma or 'and'.
+    """
+    text = text.replace(";", ",").replace(" and ", ",")
+    return [item.strip() for item in text.split(",") if item.strip()]
+
+
+def _bullets(title: str, items: List[str]) -> str:
+    return "".join([title, "\n", *(f"• {item}\n" for item in items), "\n"])
+
+
+# Plan message sections, in order (streamed one by one by /chat/ws and SSE)
+PLAN_SECTIONS = ("stats", "exercises", "equipment", "diet", "recommendation")
+
+# (section name, text) pieces of one chat reply
+Sections = List[Tuple[str, str]]
+
+
+def render_plan_body(record: PlanRecord) -> Tuple[str, ...]:
+    """
+    Everything in the plan message that depends only on the plan itself
+    (from the goal/type lines down to the videos question), one string per
+    PLAN_SECTIONS entry; the first one ends the stats section.
+    """
+    return (
+        f"• Fitness Goal: {record.fitness_goal}\n• Plan Type: {record.fitness_type}\n\n",
+        _bullets("🏋️ RECOMMENDED EXERCISES", split_list(record.exercises)),
+        _bullets("🧰 EQUIPMENT NEEDED", split_list(record.equipment)),
+        _bullets("🥗 DIET RECOMMENDATIONS", split_diet(record.diet)),
+        f"📌 EXPERT RECOMMENDATION\n{record.recommendation}\n\n{VIDEOS_QUESTION}",
+    )
+
+
+class PlanRenderer:
+    """
+    Chat message text for recommended plans.
+
+    Plan fields are split and rendered once per distinct plan at load time,
+    and the warning/acknowledgment variants once per flag combination;
+    a chat turn only joins the cached blocks with the user's name and BMI.
+    """
+
+    def __init__(self, plans: Dict[int, PlanRecord]):
+        # Many plan IDs share one record: render each record once
+        bodies: Dict[PlanRecord, Tuple[str, ...]] = {}
+        self.bodies: Dict[int, Tuple[str, ...]] = {}
+        for plan_id, record in plans.items():
+            body = bodies.get(record)
+            if body is None:
+                body = bodies[record] = render_plan_body(record)
+            self.bodies[plan_id] = body
+
+        # (has_conditions, clarification) -> text before the personalized part
+        self.heads: Dict[Tuple[bool, Optional[bool]], str] = {
+            (has_conditions, clarification): ack + (DOCTOR_WARNING if has_conditions else "")
+            for has_conditions in (False, True)
+            for clarification, ack in CLARIFICATION_ACK.items()
+        }
+
+    def _body(self, plan: Dict[str, Any]) -> Tuple[str, ...]:
+        body = self.bodies.get(plan["id"])
+        if body is None:
+            # Plan not from this model's index: render it directly
+            body = render_plan_body(PlanRecord(**{f: plan[f] for f in PlanRecord._fields}))
+        return body
+
+    def render_plan_sections(self, rec: Dict[str, Any], name: str, has_conditions: bool,
+                             clarification: Optional[bool] = None) -> Sections:
+        """
+        Plan message for a recommend() result, as (section, text) pairs.
+        clarification is the user's answer to the goal-drift question
+        (True = follow AI), if one was asked.
+        """
+        body = self._body(rec["plan"])
+        stats = "".join([
+            self.heads[(has_conditions, clarification)],
+            f"✅ {name}, here's your personalized plan (ML-based):\n\n",
+            f"📊 YOUR STATS\n• BMI: {rec['bmi']} ({rec['level']})\n",
+            body[0],
+        ])
+        return [("stats", stats), *zip(PLAN_SECTIONS[1:], body[1:])]
+
+    def render_plan(self, rec: Dict[str, Any], name: str, has_conditions: bool,
+                    clarification: Optional[bool] = None) -> str:
+        """
+        Plan message for a recommend() result as one string.
+        """
+        return "".join(text for _, text in self.render_plan_sections(rec, name, has_conditions, clarification))
+
+    @staticmethod
+    def render_videos(workouts: List[Dict[str, Any]]) -> str:
+        if not workouts:
+            return "I couldn't find specific videos at the moment, but good luck with your fitness journey! 💪"
+        return "".join([
+            "▶️ RECOMMENDED WORKOUT VIDEOS\n\n",
+            *(
+                f"{i}. {w['title']}\n   ⏱ Duration: {w['duration']} min\n   🔗 Watch: {w['youtube_link']}\n\n"
+                for i, w in enumerate(workouts, 1)
+            ),
+            GOOD_LUCK,
+        ])
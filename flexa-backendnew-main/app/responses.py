@@ -0,0 +1,73 @@
+import json
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .plans import PlanRecord
+from .schema import WorkoutItem
+
+SAFETY_NOTE = "General guidance only. Consult a professional for medical concerns."
+
+
+def _json(value: Any) -> str:
+    # Same encoding as FastAPI's JSONResponse
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+
+class RecommendationPayloads:
+    """
+    /recommend response bodies assembled from pre-serialized parts.
+
+    Plan texts and ranked workout lists are serialized once at load time
+    (validated through WorkoutItem, like the response model would), so a
+    request only interpolates the user's name, BMI and level:
+
+        {"name":…,"bmi":…,"level":…,"plan":<cached>,"workouts":<cached>,"safety_note":<cached>}
+    """
+
+    def __init__(self, plans: Dict[int, PlanRecord], workout_lists: Iterable[List[Dict[str, Any]]]):
+        self.plans = plans
+
+        # Plan JSON without the ID, once per distinct record: "goal":…,"type":…}
+        self._plan_tail: Dict[PlanRecord, str] = {}
+        for record in plans.values():
+            if record not in self._plan_tail:
+                self._plan_tail[record] = _json(record._asdict())[1:]
+
+        # Workout IDs -> serialized list
+        self._workouts: Dict[Tuple[Any, ...], str] = {(): "[]"}
+        for workouts in workout_lists:
+            self._workouts_json(workouts)
+
+        self._safety_tail = ',"safety_note":' + _json(SAFETY_NOTE) + "}"
+
+    def _plan_json(self, plan: Dict[str, Any]) -> str:
+        record = self.plans.get(plan["id"])
+        if record is None:
+            # Not from this model's plan index: serialize as is
+            return _json(plan)
+        return '{"id":' + str(int(plan["id"])) + "," + self._plan_tail[record]
+
+    def _workouts_json(self, workouts: List[Dict[str, Any]]) -> str:
+        key = tuple(w["id"] for w in workouts)
+        cached = self._workouts.get(key)
+        if cached is None:
+            cached = self._workouts[key] = _json([WorkoutItem(**w).model_dump(mode="json") for w in workouts])
+        return cached
+
+    def render(self, name: str, rec: Dict[str, Any]) -> str:
+        """
+        JSON body of RecommendationResponse for one recommend() result.
+        """
+        return "".join([
+            '{"name":', _json(name),
+            ',"bmi":', _json(float(rec["bmi"])),
+            ',"level":', _json(rec["level"]),
+            ',"plan":', self._plan_json(rec["plan"]),
+            ',"workouts":', self._workouts_json(rec["workouts"]),
+            self._safety_tail,
+        ])
+
+    def render_batch(self, names: List[str], recs: List[Dict[str, Any]]) -> str:
+        """
+        JSON body of RecommendationBatchResponse.
+        """
+        return '{"results":[' + ",".join(self.render(n, r) for n, r in zip(names, recs)) + "]}"
@@ -10,6 +10,8 @@ class ChatStartResponse(BaseModel):
 class ChatMessageRequest(BaseModel):
     session_id: str
     user_message: str
+    # Opt-in: data_collected holds only the fields changed by this message
+    delta: bool = False
 
 
 class ChatMessageResponse(BaseModel):
@@ -54,3 +56,12 @@ class RecommendationResponse(BaseModel):
     plan: Dict[str, Any]
     workouts: List[WorkoutItem]
     safety_note: str
+
+
+class RecommendationBatchRequest(BaseModel):
+    # Bulk re-scoring: many profiles scored in one model call
+    profiles: List[RecommendationRequest]
+
+
+class RecommendationBatchResponse(BaseModel):
+    results: List[RecommendationResponse]
@@ -0,0 +1,92 @@
+from dataclasses import dataclass, fields
+from enum import Enum
+from typing import Any, Dict, Optional
+
+
+class ChatStep(str, Enum):
+    """
+    Where a conversation is (the value is what the API returns as "state").
+    """
+    ASK_NAME = "ASK_NAME"
+    ASK_PROBLEM = "ASK_PROBLEM"
+    ASK_SEX = "ASK_SEX"
+    ASK_AGE = "ASK_AGE"
+    ASK_HEIGHT = "ASK_HEIGHT"
+    ASK_WEIGHT = "ASK_WEIGHT"
+    ASK_HYPERTENSION = "ASK_HYPERTENSION"
+    ASK_DIABETES = "ASK_DIABETES"
+    ASK_GOAL_CLARIFICATION = "ASK_GOAL_CLARIFICATION"
+    ASK_VIDEOS = "ASK_VIDEOS"
+    DONE = "DONE"
+
+
+# Answers shown to the client as data_collected, in the order they are asked
+DATA_FIELDS = (
+    "name", "problem", "sex", "age", "height_m", "weight_kg", "bmi", "bmi_category",
+    "hypertension", "diabetes", "user_chose_ai_goal", "clarification", "wants_videos",
+)
+
+
+@dataclass
+class SessionState:
+    """
+    One chat session, kept small: __slots__ instead of a per-instance dict,
+    an enum step, and the recommendation stored as a plan ID reference
+    (plan text lives once in the recommender's plan index).
+
+    None means "not asked yet". Build new sessions with SessionState.new().
+    """
+    __slots__ = DATA_FIELDS + ("step", "plan_id", "rec_bmi", "rec_level", "has_drift", "drift_message")
+
+    step: ChatStep
+    name: Optional[str]
+    problem: Optional[str]
+    sex: Optional[str]
+    age: Optional[int]
+    height_m: Optional[float]
+    weight_kg: Optional[float]
+    bmi: Optional[float]
+    bmi_category: Optional[str]
+    hypertension: Optional[str]
+    diabetes: Optional[str]
+    user_chose_ai_goal: Optional[bool]
+    clarification: Optional[str]
+    wants_videos: Optional[bool]
+
+    # Recommendation computed during the drift check: plan ID + BMI/level it was made for
+    plan_id: Optional[int]
+    rec_bmi: Optional[float]
+    rec_level: Optional[str]
+
+    # Goal drift check (the message is only kept until it has been answered)
+    has_drift: Optional[bool]
+    drift_message: Optional[str]
+
+    @classmethod
+    def new(cls, step: ChatStep = ChatStep.ASK_NAME) -> "SessionState":
+        return cls(step, *([None] * (len(fields(cls)) - 1)))
+
+    def data(self) -> Dict[str, Any]:
+        """
+        The answers collected so far (the old session["data"] dict).
+        """
+        return {f: getattr(self, f) for f in DATA_FIELDS if getattr(self, f) is not None}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        JSON-friendly form for shared stores (unset fields omitted).
+        """
+        out: Dict[str, Any] = {"step": self.step.value}
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if f.name != "step" and value is not None:
+                out[f.name] = value
+        return out
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "SessionState":
+        session = cls.new(ChatStep(d["step"]))
+        for key, value in d.items():
+            if key != "step":
+                setattr(session, key, value)
+        return session
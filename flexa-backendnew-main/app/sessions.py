@@ -0,0 +1,127 @@
+import json
+import math
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+from .cache import TTLCache
+from .session_state import SessionState
+
+# Session store configuration
+SESSION_BACKEND = os.getenv("FLEXA_SESSION_BACKEND", "memory")  # "memory" or "redis"
+SESSION_MAX_SIZE = int(os.getenv("FLEXA_SESSION_MAX_SIZE", "10000"))
+SESSION_IDLE_TTL = float(os.getenv("FLEXA_SESSION_IDLE_TTL", "1800"))  # seconds without a message (0 = never expire)
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+def session_ttl(idle_ttl: Optional[float]) -> Optional[int]:
+    """
+    Idle TTL as every store applies it: None or <= 0 means sessions never
+    expire, anything else is rounded up to whole seconds (Redis' granularity).
+    """
+    if idle_ttl is None or idle_ttl <= 0:
+        return None
+    return math.ceil(idle_ttl)
+
+
+class SessionStore(ABC):
+    """
+    Where chat sessions live between messages.
+
+    A session is a SessionState. Callers must save() the session after
+    changing it, so stores that keep a serialized copy (Redis) see every update.
+    """
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[SessionState]:
+        """Return the session, or None if it is unknown or expired."""
+
+    @abstractmethod
+    def save(self, session_id: str, session: SessionState) -> None:
+        """Create/update a session and reset its idle timer."""
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        """Forget a session."""
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": type(self).__name__}
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Single-process store: LRU with a max size and an idle TTL,
+    so abandoned chats are evicted instead of piling up forever.
+    """
+
+    def __init__(self, max_size: int = SESSION_MAX_SIZE, idle_ttl: Optional[float] = SESSION_IDLE_TTL):
+        self._cache = TTLCache(max_size=max_size, ttl=session_ttl(idle_ttl))
+
+    def get(self, session_id: str) -> Optional[SessionState]:
+        return self._cache.get(session_id)
+
+    def save(self, session_id: str, session: SessionState) -> None:
+        self._cache.set(session_id, session)
+
+    def delete(self, session_id: str) -> None:
+        self._cache.pop(session_id)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "memory", **self._cache.stats()}
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Shared store for multi-worker deployments.
+    Works with anything speaking the Redis protocol (redis-py client,
+    fakeredis in tests). Sessions are compact JSON strings
+    (SessionState.to_dict()) with an idle TTL.
+    """
+
+    def __init__(self, client=None, url: str = REDIS_URL,
+                 idle_ttl: Optional[float] = SESSION_IDLE_TTL, prefix: str = "flexa:session:"):
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError(
+                    "FLEXA_SESSION_BACKEND=redis needs the 'redis' package (pip install redis)"
+                ) from e
+            client = redis.Redis.from_url(url)
+
+        self.client = client
+        self.idle_ttl = session_ttl(idle_ttl)
+        self.prefix = prefix
+
+    def _key(self, session_id: str) -> str:
+        return self.prefix + session_id
+
+    def get(self, session_id: str) -> Optional[SessionState]:
+        raw = self.client.get(self._key(session_id))
+        if raw is None:
+            return None
+        return SessionState.from_dict(json.loads(raw))
+
+    def save(self, session_id: str, session: SessionState) -> None:
+        raw = json.dumps(session.to_dict(), separators=(",", ":"))
+        self.client.set(self._key(session_id), raw, ex=self.idle_ttl)
+
+    def delete(self, session_id: str) -> None:
+        self.client.delete(self._key(session_id))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "redis", "ttl_seconds": self.idle_ttl}
+
+
+def create_session_store(backend: str = SESSION_BACKEND) -> SessionStore:
+    """
+    Build the store selected by FLEXA_SESSION_BACKEND.
+    """
+    if backend == "memory":
+        return InMemorySessionStore()
+    if backend == "redis":
+        return RedisSessionStore()
+    raise ValueError(f"Unknown session backend: {backend!r} (use 'memory' or 'redis')")
@@ -0,0 +1,57 @@
+"""
+Cold start timing report
+
+    python -m app.startup_profile [model_path]
+
+Runs each startup phase in order in this (fresh) process and prints how long
+it took. Import phases are cumulative: a module already pulled in by an
+earlier phase costs ~0 later.
+"""
+import sys
+import time
+from typing import Callable, List, Optional, Tuple
+
+
+def _phase(name: str, fn: Callable[[], object], results: List[Tuple[str, float]]):
+    start = time.perf_counter()
+    value = fn()
+    results.append((name, time.perf_counter() - start))
+    return value
+
+
+def main(model_path: Optional[str] = None):
+    results: List[Tuple[str, float]] = []
+    total_start = time.perf_counter()
+
+    _phase("import fastapi + pydantic", lambda: __import__("fastapi"), results)
+    main_mod = _phase("import app.main (no model)", lambda: __import__("app.main", fromlist=["app"]), results)
+    _phase("import numpy", lambda: __import__("numpy"), results)
+    _phase("import sklearn.neighbors", lambda: __import__("sklearn.neighbors"), results)
+
+    from app import ml
+    from app.artifact import is_slim_artifact
+
+    path = model_path or ml.MODEL_PATH
+    if not is_slim_artifact(path):
+        _phase("import joblib + pandas (legacy bundle)", lambda: (__import__("joblib"), __import__("pandas")), results)
+
+    recommender = _phase(f"load model ({path})", lambda: ml.FlexaRecommender(model_path=path), results)
+    main_mod.recommender = recommender
+
+    profile = {"sex": "Female", "age": 25, "height_m": 1.65, "weight_kg": 60,
+               "hypertension": "No", "diabetes": "No"}
+    _phase("first recommendation", lambda: recommender.recommend(profile), results)
+
+    total = time.perf_counter() - total_start
+
+    print("=" * 60)
+    print("FLEXA STARTUP PROFILE")
+    print("=" * 60)
+    for name, seconds in results:
+        print(f"{name:<45}{seconds * 1000:>10.1f} ms")
+    print("-" * 60)
+    print(f"{'total':<45}{total * 1000:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
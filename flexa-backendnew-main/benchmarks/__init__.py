@@ -0,0 +1,2 @@
+# Performance scripts. Run from the backend folder, e.g.:
+#   python -m benchmarks.engine
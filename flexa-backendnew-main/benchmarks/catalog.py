@@ -0,0 +1,79 @@
+"""
+Benchmark: workout selection on large synthetic catalogs
+list-comprehension scan vs WorkoutCatalog bitset query
+
+    python -m benchmarks.catalog [size ...]
+"""
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+from app.catalog import WorkoutCatalog
+
+GOALS = ["weight_loss", "muscle_gain", "toning", "flexibility"]
+CATEGORIES = ["Strength", "HIIT", "Cardio", "Dance", "Yoga", "Core"]
+DIFFICULTIES = ["Beginner", "Intermediate", "Advanced"]
+EQUIPMENT = ["None", "Dumbbells", "Yoga Mat", "Resistance Band", "Kettlebell", "Barbell"]
+MUSCLES = ["Full Body", "Arms", "Shoulders", "Back", "Abs", "Legs", "Glutes"]
+
+
+def synthetic_workouts(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [
+        {
+            "id": i,
+            "title": f"Workout {i}",
+            "youtube_link": f"https://www.youtube.com/watch?v={i:011d}",
+            "channel": "Synthetic",
+            "duration": rng.choice([10, 15, 20, 25, 30, 40, 45, 60]),
+            "difficulty": rng.choice(DIFFICULTIES),
+            "category": rng.choice(CATEGORIES),
+            "equipment": rng.sample(EQUIPMENT, rng.randint(1, 2)),
+            "calories_burned": rng.randint(40, 600),
+            "goal": rng.choice(GOALS),
+            "muscle_groups": rng.sample(MUSCLES, rng.randint(1, 3)),
+            "description": "Synthetic workout",
+        }
+        for i in range(n)
+    ]
+
+
+def _scan(workouts, goal, allowed, max_duration):
+    pool = [w for w in workouts if str(w.get("goal")).strip() == goal]
+    pool = [w for w in pool if set(w["equipment"]) <= allowed and w["duration"] <= max_duration]
+    return pool[:3]
+
+
+def _time_ms(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main(sizes: List[int]):
+    print("=" * 72)
+    print("WORKOUT QUERY: goal=weight_loss AND equipment ⊆ {None, Dumbbells} AND duration ≤ 20")
+    print("=" * 72)
+    print(f"{'workouts':>10}{'index build':>14}{'scan':>14}{'catalog':>14}{'speedup':>10}")
+
+    allowed = {"None", "Dumbbells"}
+    for n in sizes:
+        workouts = synthetic_workouts(n)
+        start = time.perf_counter()
+        catalog = WorkoutCatalog(workouts)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        assert catalog.query(limit=3, goal="weight_loss", equipment_subset=allowed, max_duration=20) == \
+            _scan(workouts, "weight_loss", allowed, 20)
+
+        repeat = max(3, 200_000 // n)
+        scan_ms = _time_ms(lambda: _scan(workouts, "weight_loss", allowed, 20), repeat)
+        idx_ms = _time_ms(lambda: catalog.query(limit=3, goal="weight_loss",
+                                                equipment_subset=allowed, max_duration=20), repeat)
+        print(f"{n:>10}{build_ms:>11.1f} ms{scan_ms:>11.3f} ms{idx_ms:>11.3f} ms{scan_ms / idx_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1_000, 10_000, 100_000])
@@ -0,0 +1,77 @@
+"""
+Benchmark: scripted conversations through the chat flow engine, in-process
+(no HTTP, no session store; model calls go straight to the recommender)
+
+    python -m benchmarks.chat_flow [conversations]
+"""
+import asyncio
+import random
+import sys
+import time
+from typing import Dict, List
+
+from app.chat_flow import CHAT_STATES, DONE, ChatFlow
+from app.ml import FlexaRecommender
+from app.session_state import SessionState
+
+PROBLEMS = ["I want to lose weight", "build muscle", "get flexible", "tone up", "just feeling tired"]
+
+
+def _scripts(n: int, seed: int = 0) -> List[List[str]]:
+    rng = random.Random(seed)
+    scripts = []
+    for i in range(n):
+        answers = [
+            f"User{i}",
+            rng.choice(PROBLEMS),
+            rng.choice(["Male", "Female"]),
+            str(rng.randint(18, 70)),
+            f"{rng.uniform(1.5, 2.0):.2f}",
+            f"{rng.uniform(45, 120):.0f}",
+            rng.choice(["Yes", "No"]),
+            rng.choice(["Yes", "No"]),
+        ]
+        # Answer the drift question if it comes up; the engine ignores extra turns after DONE
+        answers += [rng.choice(["Follow AI recommendation", "Keep my original goal"]), rng.choice(["Yes", "No"])]
+        scripts.append(answers)
+    return scripts
+
+
+async def _drive(flow: ChatFlow, scripts: List[List[str]]) -> Dict[str, int]:
+    turns = finished = 0
+    for answers in scripts:
+        session = SessionState.new()
+        for answer in answers:
+            await flow.advance(session, answer)
+            turns += 1
+            if session.step == DONE:
+                break
+        finished += session.step == DONE
+    return {"turns": turns, "finished": finished}
+
+
+def main(conversations: int = 100_000):
+    recommender = FlexaRecommender()
+
+    async def recommend(profile, wants_videos):
+        return recommender.recommend(profile, wants_videos=wants_videos)
+
+    flow = ChatFlow(CHAT_STATES, recommend=recommend, recommender=lambda: recommender)
+    scripts = _scripts(conversations)
+
+    start = time.perf_counter()
+    result = asyncio.run(_drive(flow, scripts))
+    elapsed = time.perf_counter() - start
+
+    print("=" * 60)
+    print(f"CHAT FLOW: {conversations} scripted conversations")
+    print("=" * 60)
+    print(f"turns:          {result['turns']} ({result['finished']} conversations reached {DONE})")
+    print(f"total:          {elapsed:.2f} s")
+    print(f"per turn:       {elapsed / result['turns'] * 1e6:.1f} us (incl. model calls)")
+    print(f"conversations/s {conversations / elapsed:,.0f}")
+    print(f"cache:          {recommender.cache_stats()}")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
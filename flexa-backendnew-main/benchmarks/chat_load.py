@@ -0,0 +1,95 @@
+"""
+Load test: chat turns/sec over HTTP (POST /chat/message per turn)
+vs one WebSocket per conversation (/chat/ws?compact=1), against a running server
+
+    uvicorn app.main:app --port 5000
+    python -m benchmarks.chat_load [--url http://127.0.0.1:5000] [--conversations 500] [--concurrency 50]
+
+Needs httpx and websockets (pip install httpx websockets).
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Callable, List
+
+import httpx
+import websockets
+
+from benchmarks.chat_flow import _scripts
+
+
+async def _http_conversation(client: httpx.AsyncClient, answers: List[str], latencies: List[float]) -> None:
+    session_id = (await client.get("/chat/start")).json()["session_id"]
+    for answer in answers:
+        start = time.perf_counter()
+        response = await client.post("/chat/message", json={"session_id": session_id, "user_message": answer})
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+        if response.json()["state"] == "DONE":
+            return
+
+
+async def _ws_conversation(url: str, answers: List[str], latencies: List[float]) -> None:
+    async with websockets.connect(url) as ws:
+        await ws.recv()  # session frame
+        for answer in answers:
+            start = time.perf_counter()
+            await ws.send(answer)
+            while True:
+                frame = json.loads(await ws.recv())
+                if frame[0] != "s":
+                    break
+            latencies.append(time.perf_counter() - start)
+            if frame[0] == "e":
+                raise RuntimeError(frame[1])
+            if frame[1] == "DONE":
+                return
+
+
+async def _run(conversation: Callable, scripts: List[List[str]], concurrency: int) -> List[float]:
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(answers):
+        async with semaphore:
+            await conversation(answers, latencies)
+
+    await asyncio.gather(*(one(answers) for answers in scripts))
+    return latencies
+
+
+def _report(label: str, latencies: List[float], elapsed: float) -> None:
+    latencies = sorted(latencies)
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(f"{label:<10}{len(latencies):>8}{len(latencies) / elapsed:>12.0f}{p50:>10.2f} ms{p99:>10.2f} ms")
+
+
+async def main(url: str, conversations: int, concurrency: int):
+    scripts = _scripts(conversations, seed=1)
+    ws_url = url.replace("http", "ws", 1).rstrip("/") + "/chat/ws?compact=1"
+
+    print("=" * 60)
+    print(f"CHAT LOAD: {conversations} conversations, {concurrency} concurrent, {url}")
+    print("=" * 60)
+    print(f"{'':<10}{'turns':>8}{'turns/s':>12}{'p50':>13}{'p99':>13}")
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        start = time.perf_counter()
+        latencies = await _run(lambda a, lat: _http_conversation(client, a, lat), scripts, concurrency)
+        _report("HTTP", latencies, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    latencies = await _run(lambda a, lat: _ws_conversation(ws_url, a, lat), scripts, concurrency)
+    _report("WebSocket", latencies, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chat load test: HTTP vs WebSocket")
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--conversations", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.conversations, args.concurrency))
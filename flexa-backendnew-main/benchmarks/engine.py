@@ -0,0 +1,40 @@
+"""
+Microbenchmark: single-profile prediction
+pipeline.predict on a one-row DataFrame vs FastKNNEngine.predict_one
+
+    python -m benchmarks.engine [n_calls]
+"""
+import sys
+import time
+
+import pandas as pd
+
+from app.ml import FlexaRecommender
+
+FEATURE_COLS = ["Sex", "Age", "Height", "Weight", "Hypertension", "Diabetes", "BMI", "Level"]
+
+
+def _per_call_us(fn, rows) -> float:
+    start = time.perf_counter()
+    for row in rows:
+        fn(row)
+    return (time.perf_counter() - start) / len(rows) * 1e6
+
+
+def main(n_calls: int = 500):
+    recommender = FlexaRecommender()
+    rows = recommender.df[FEATURE_COLS].sample(n=n_calls, replace=True, random_state=0).to_dict("records")
+
+    pipeline_us = _per_call_us(lambda r: recommender.pipeline.predict(pd.DataFrame([r]))[0], rows)
+    engine_us = _per_call_us(recommender.engine.predict_one, rows)
+
+    print("=" * 60)
+    print(f"SINGLE-PROFILE PREDICTION ({n_calls} calls)")
+    print("=" * 60)
+    print(f"pipeline.predict (1-row DataFrame): {pipeline_us:10.1f} µs/call")
+    print(f"FastKNNEngine.predict_one:          {engine_us:10.1f} µs/call")
+    print(f"Speedup:                            {pipeline_us / engine_us:10.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,59 @@
+"""
+Benchmark: free-text intent classifier
+stratified cross-validated accuracy + per-message latency
+(sklearn HashingVectorizer/LogisticRegression vs the serving IntentClassifier)
+
+    python -m benchmarks.intent [folds]
+"""
+import sys
+import time
+
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold
+
+from train_intent import PHRASES_PATH, build_vectorizer, load_phrases, train_intent_model
+
+MESSAGES = [
+    "I'm too skinny and want to bulk up",
+    "my jeans don't fit anymore",
+    "I want visible abs for summer",
+    "can't touch my toes",
+    "what time is it",
+]
+
+
+def _time_us(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main(folds: int = 5, repeat: int = 2000):
+    df = load_phrases(PHRASES_PATH)
+    texts, labels = df["text"].tolist(), df["label"].tolist()
+
+    print("=" * 72)
+    print(f"INTENT CLASSIFIER: {len(texts)} phrases, {df['label'].nunique()} labels")
+    print("=" * 72)
+
+    correct = 0
+    for train_idx, test_idx in StratifiedKFold(folds, shuffle=True, random_state=42).split(texts, labels):
+        model = train_intent_model([texts[i] for i in train_idx], [labels[i] for i in train_idx])
+        correct += sum(model.predict(texts[i])[0] == labels[i] for i in test_idx)
+    print(f"{folds}-fold accuracy: {correct / len(texts):.3f}")
+
+    model = train_intent_model(texts, labels)
+    vectorizer = build_vectorizer()
+    clf = LogisticRegression(C=10.0, max_iter=2000).fit(vectorizer.transform(texts), labels)
+
+    print(f"\n{'message':<40}{'sklearn':>12}{'serving':>12}{'label':>14}")
+    for text in MESSAGES:
+        sk_us = _time_us(lambda: clf.predict_proba(vectorizer.transform([text])), max(1, repeat // 10))
+        fast_us = _time_us(lambda: model.predict(text), repeat)
+        label, confidence = model.predict(text)
+        print(f"{text[:38]:<40}{sk_us:>9.1f} us{fast_us:>9.1f} us{label:>14} ({confidence:.2f})")
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
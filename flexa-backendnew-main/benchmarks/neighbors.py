@@ -0,0 +1,88 @@
+"""
+Benchmark: neighbour search backends on synthetic datasets
+Build time, query latency and recall@k (vs exact brute force) per backend
+
+Rows look like the encoded plan features: 4 standardized numeric columns
++ one-hot Sex / Hypertension / Diabetes / Level (14 dims). Ground truth is
+BruteForceIndex; the 5M-row run needs ~1.5 GB RAM (fit_X + KD tree copy).
+
+    python -m benchmarks.neighbors [n_rows ...] [--queries N] [--probe N ...]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.neighbors import build_index
+
+K = 5
+DEFAULT_SIZES = (100_000, 1_000_000, 5_000_000)
+ONEHOT_SIZES = (2, 2, 2, 4)
+
+
+def synthetic_rows(n: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    X = np.zeros((n, 4 + sum(ONEHOT_SIZES)))
+
+    # Age, Height, Weight, BMI (BMI follows height/weight)
+    X[:, :3] = rng.standard_normal((n, 3))
+    X[:, 3] = 0.8 * X[:, 2] - 0.5 * X[:, 1] + 0.3 * rng.standard_normal(n)
+
+    offset = 4
+    for size in ONEHOT_SIZES:
+        X[np.arange(n), offset + rng.integers(0, size, n)] = 1.0
+        offset += size
+    return X
+
+
+def _recall(expected: np.ndarray, got: np.ndarray) -> float:
+    return float(np.mean([len(set(a) & set(b)) / K for a, b in zip(expected.tolist(), got.tolist())]))
+
+
+def run(n: int, n_queries: int, probes) -> None:
+    fit_X = synthetic_rows(n)
+    Q = synthetic_rows(n_queries, seed=1)
+
+    print("=" * 72)
+    print(f"{n:,} ROWS, {n_queries} queries, k={K}")
+    print("=" * 72)
+    print(f"{'backend':<18}{'build s':>10}{'µs/query':>12}{'recall@k':>10}")
+
+    def report(label, index, build_s, exact=None):
+        start = time.perf_counter()
+        _, ind = index.query(Q, K)
+        per_query = (time.perf_counter() - start) / n_queries * 1e6
+        recall = 1.0 if exact is None else _recall(exact, ind)
+        print(f"{label:<18}{build_s:>10.2f}{per_query:>12.1f}{recall:>10.3f}")
+        return ind
+
+    exact = report("brute", build_index("brute", fit_X), 0.0)
+
+    for method in ("kd_tree", "ball_tree"):
+        start = time.perf_counter()
+        index = build_index(method, fit_X)
+        report(method, index, time.perf_counter() - start, exact)
+        del index
+
+    start = time.perf_counter()
+    ivf = build_index("ivf", fit_X)
+    build_s = time.perf_counter() - start
+    for n_probe in probes:
+        ivf.n_probe = n_probe
+        report(f"ivf ({ivf.n_lists} / {n_probe})", ivf, build_s, exact)
+        build_s = 0.0  # built once, shown on the first line
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("sizes", nargs="*", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--probe", nargs="+", type=int, default=[4, 8, 16, 32])
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        run(n, args.queries, args.probe)
+
+
+if __name__ == "__main__":
+    main()
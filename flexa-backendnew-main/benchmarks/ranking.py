@@ -0,0 +1,52 @@
+"""
+Benchmark: ranked top-k workout retrieval on synthetic catalogs
+full sort of all candidates vs vectorized scoring + partial top-k selection
+
+    python -m benchmarks.ranking [size ...]
+"""
+import sys
+import time
+from typing import List
+
+from app.catalog import WorkoutCatalog
+from app.ranking import rank_workouts, score_workouts
+from benchmarks.catalog import synthetic_workouts
+
+PROFILE = {"target_goal": "weight_loss", "level": "Obese", "hypertension": "Yes", "diabetes": "No"}
+
+
+def _full_sort(catalog: WorkoutCatalog, mask: int, k: int):
+    positions = catalog.position_array(mask)
+    scores = score_workouts(catalog, positions, **PROFILE)
+    order = sorted(range(len(positions)), key=lambda i: (-scores[i], positions[i]))
+    return [catalog.workouts[positions[i]] for i in order[:k]]
+
+
+def _time_ms(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main(sizes: List[int], k: int = 3):
+    print("=" * 72)
+    print(f"RANKED TOP-{k}: goal=weight_loss, Obese + hypertension profile")
+    print("=" * 72)
+    print(f"{'workouts':>10}{'candidates':>12}{'full sort':>14}{'top-k':>14}{'speedup':>10}")
+
+    for n in sizes:
+        catalog = WorkoutCatalog(synthetic_workouts(n))
+        mask = catalog.mask(goal="weight_loss")
+        candidates = bin(mask).count("1")
+
+        assert rank_workouts(catalog, mask, k, **PROFILE) == _full_sort(catalog, mask, k)
+
+        repeat = max(3, 100_000 // n)
+        sort_ms = _time_ms(lambda: _full_sort(catalog, mask, k), max(1, repeat // 10))
+        topk_ms = _time_ms(lambda: rank_workouts(catalog, mask, k, **PROFILE), repeat)
+        print(f"{n:>10}{candidates:>12}{sort_ms:>11.2f} ms{topk_ms:>11.2f} ms{sort_ms / topk_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,91 @@
+"""
+Load test: /recommend latency while the model is hot-reloaded, against a running server
+
+Keeps `concurrency` clients sending /recommend for `duration` seconds and
+calls POST /admin/reload every `every` seconds. Requests that overlap a reload
+are reported separately from the rest; any failed request is counted.
+
+    FLEXA_ADMIN_TOKEN=secret uvicorn app.main:app --port 5000
+    python -m benchmarks.reload_latency --token secret [--url http://127.0.0.1:5000]
+        [--duration 30] [--every 5] [--concurrency 8]
+
+Needs httpx (pip install httpx).
+"""
+import argparse
+import asyncio
+import time
+from typing import List, Tuple
+
+import httpx
+
+PROFILE = {"name": "Load", "sex": "Male", "age": 35, "height_m": 1.8, "weight_kg": 85,
+           "hypertension": "No", "diabetes": "No", "wants_videos": True}
+
+
+def _percentile(values: List[float], q: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * q))] * 1000
+
+
+def _report(label: str, latencies: List[float]) -> None:
+    if not latencies:
+        print(f"{label:<16}{0:>8}")
+        return
+    latencies = sorted(latencies)
+    print(f"{label:<16}{len(latencies):>8}{_percentile(latencies, 0.5):>10.2f}"
+          f"{_percentile(latencies, 0.99):>10.2f}{latencies[-1] * 1000:>10.2f}")
+
+
+async def main(url: str, token: str, duration: float, every: float, concurrency: int):
+    requests: List[Tuple[float, float]] = []  # (start, end)
+    reloads: List[Tuple[float, float]] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    limits = httpx.Limits(max_connections=concurrency + 1, max_keepalive_connections=concurrency + 1)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    (await client.post("/recommend", json=PROFILE)).raise_for_status()
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                requests.append((start, time.perf_counter()))
+
+        async def reloader():
+            while time.perf_counter() + every < deadline:
+                await asyncio.sleep(every)
+                start = time.perf_counter()
+                response = await client.post("/admin/reload", headers={"X-Admin-Token": token})
+                response.raise_for_status()
+                reloads.append((start, time.perf_counter()))
+
+        await asyncio.gather(reloader(), *(worker() for _ in range(concurrency)))
+
+    def overlaps(start: float, end: float) -> bool:
+        return any(start < r_end and end > r_start for r_start, r_end in reloads)
+
+    during = [end - start for start, end in requests if overlaps(start, end)]
+    outside = [end - start for start, end in requests if not overlaps(start, end)]
+
+    print("=" * 56)
+    print(f"RELOAD LATENCY: {duration:.0f}s, {concurrency} clients, reload every {every:.0f}s, {url}")
+    print("=" * 56)
+    print(f"{'':<16}{'requests':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    _report("no reload", outside)
+    _report("during reload", during)
+    print(f"reloads: {len(reloads)}, mean {sum(e - s for s, e in reloads) / max(1, len(reloads)):.2f}s; "
+          f"failed requests: {errors}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="/recommend latency during hot reloads")
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--token", required=True, help="FLEXA_ADMIN_TOKEN of the server")
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--every", type=float, default=5)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.token, args.duration, args.every, args.concurrency))
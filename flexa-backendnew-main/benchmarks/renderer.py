@@ -0,0 +1,48 @@
+"""
+Benchmark: response rendering
+chat plan message: per-message string concatenation vs pre-rendered blocks + one join
+/recommend body: response model validation + JSON encoding vs pre-serialized parts
+
+    python -m benchmarks.renderer [model_path]
+"""
+import sys
+import time
+
+from app.ml import MODEL_PATH, FlexaRecommender
+from app.plans import plan_to_dict
+from test_plan_renderer import _concatenated
+from test_response_payloads import _response, _response_json
+
+
+def _time_us(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main(model_path: str = MODEL_PATH, repeat: int = 20_000):
+    recommender = FlexaRecommender(model_path)
+    plan_id, record = next(iter(recommender.plans.items()))
+    rec = {"bmi": 24.1, "level": "Normal", "plan": plan_to_dict(plan_id, record)}
+    rec["workouts"] = recommender.workouts_for(rec["plan"], "Normal", "No", "No")
+
+    concat_us = _time_us(lambda: _concatenated(rec, "Sam", True, True), repeat)
+    render_us = _time_us(lambda: recommender.renderer.render_plan(rec, "Sam", True, True), repeat)
+
+    print("=" * 60)
+    print(f"PLAN MESSAGE RENDERING ({len(recommender.renderer.bodies)} plan IDs)")
+    print("=" * 60)
+    print(f"concatenation: {concat_us:8.2f} us/message")
+    print(f"pre-rendered:  {render_us:8.2f} us/message ({concat_us / render_us:.1f}x)")
+
+    model_us = _time_us(lambda: _response_json(_response("Sam", rec)), repeat)
+    payload_us = _time_us(lambda: recommender.payloads.render("Sam", rec), repeat)
+
+    print("\n/recommend BODY (3 workouts)")
+    print(f"response model: {model_us:8.2f} us/response")
+    print(f"pre-serialized: {payload_us:8.2f} us/response ({model_us / payload_us:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -0,0 +1,90 @@
+"""
+Benchmark: bytes per chat session and per chat response
+legacy nested-dict session (copied recommendation + drift result) vs SessionState,
+full data_collected vs delta responses
+
+    python -m benchmarks.session_size
+"""
+import asyncio
+import json
+import sys
+from typing import Any, Dict, List
+
+from app.chat_flow import CHAT_STATES, ChatFlow, _profile
+from app.ml import FlexaRecommender
+from app.schema import ChatMessageResponse
+from app.session_state import SessionState
+
+SCRIPT = ["Ana", "I want to lose weight", "Female", "25", "1.70", "48", "No", "No",
+          "Follow AI recommendation", "Yes"]
+
+
+def deep_size(obj: Any, seen=None) -> int:
+    """
+    sys.getsizeof over the whole object graph (shared objects counted once).
+    """
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size(v, seen) for v in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(deep_size(getattr(obj, s), seen) for s in obj.__slots__ if hasattr(obj, s))
+    return size
+
+
+def _legacy_session(recommender: FlexaRecommender, session: SessionState) -> Dict[str, Any]:
+    # What the session dict used to hold at the end of the same conversation
+    profile = _profile(session)
+    drift = recommender.detect_goal_drift(profile, session.problem, recommender.recommend(profile, wants_videos=False))
+    rec = drift.pop("recommendation")
+    return {"state": session.step.value, "data": session.data(), "recommendation": rec, "drift_result": drift}
+
+
+def _response_bytes(session: SessionState, message: str, data: Dict[str, Any]) -> int:
+    response = ChatMessageResponse(session_id="0" * 36, state=session.step.value,
+                                   data_collected=data, message=message)
+    return len(response.model_dump_json().encode())
+
+
+def main():
+    recommender = FlexaRecommender()
+
+    async def recommend(profile, wants_videos):
+        return recommender.recommend(profile, wants_videos=wants_videos)
+
+    flow = ChatFlow(CHAT_STATES, recommend=recommend, recommender=lambda: recommender)
+
+    session = SessionState.new()
+    full: List[int] = []
+    delta: List[int] = []
+    for answer in SCRIPT:
+        before = session.data()
+        turn = asyncio.run(flow.advance(session, answer))
+        data = session.data()
+        changed = {k: v for k, v in data.items() if k not in before or before[k] != v}
+        full.append(_response_bytes(session, turn.message, data))
+        delta.append(_response_bytes(session, turn.message, changed))
+
+    legacy = _legacy_session(recommender, session)
+
+    print("=" * 60)
+    print(f"CHAT SESSION SIZE (one {len(SCRIPT)}-turn conversation)")
+    print("=" * 60)
+    print(f"{'':28}{'legacy dict':>14}{'SessionState':>16}")
+    print(f"{'in memory (deep bytes)':28}{deep_size(legacy):>14}{deep_size(session):>16}")
+    print(f"{'stored JSON (Redis bytes)':28}{len(json.dumps(legacy)):>14}"
+          f"{len(json.dumps(session.to_dict(), separators=(',', ':'))):>16}")
+
+    print(f"\n{'':28}{'full':>14}{'delta':>16}")
+    print(f"{'response bytes, total':28}{sum(full):>14}{sum(delta):>16}")
+    print(f"{'response bytes, last turn':28}{full[-1]:>14}{delta[-1]:>16}")
+
+
+if __name__ == "__main__":
+    main()
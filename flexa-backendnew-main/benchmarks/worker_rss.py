@@ -0,0 +1,68 @@
+"""
+Report memory per gunicorn worker (Linux /proc)
+
+    gunicorn app.main:app -c gunicorn.conf.py      # in another terminal
+    python -m benchmarks.worker_rss [master_pid | pidfile]
+
+RSS counts shared pages in every process; PSS splits shared pages between
+the processes using them, so sum(PSS) is the real total footprint.
+"""
+import sys
+from typing import Dict, List
+
+
+def _read_kb(pid: int, path: str, fields: List[str]) -> Dict[str, int]:
+    values = {f: 0 for f in fields}
+    try:
+        with open(f"/proc/{pid}/{path}", "r") as f:
+            for line in f:
+                name, _, rest = line.partition(":")
+                if name in values:
+                    values[name] = int(rest.split()[0])
+    except FileNotFoundError:
+        pass
+    return values
+
+
+def _children(pid: int) -> List[int]:
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children", "r") as f:
+            return [int(p) for p in f.read().split()]
+    except FileNotFoundError:
+        return []
+
+
+def _master_pid(arg: str) -> int:
+    if arg.isdigit():
+        return int(arg)
+    with open(arg, "r") as f:
+        return int(f.read().strip())
+
+
+def main(arg: str = "gunicorn.pid"):
+    master = _master_pid(arg)
+    pids = [master] + _children(master)
+
+    print("=" * 60)
+    print("PER-PROCESS MEMORY (MB)")
+    print("=" * 60)
+    print(f"{'role':<8}{'pid':>8}{'RSS':>12}{'PSS':>12}{'shared':>12}")
+
+    total_rss = total_pss = 0
+    for pid in pids:
+        status = _read_kb(pid, "status", ["VmRSS"])
+        rollup = _read_kb(pid, "smaps_rollup", ["Pss", "Shared_Clean", "Shared_Dirty"])
+        rss = status["VmRSS"] / 1024
+        pss = rollup["Pss"] / 1024
+        shared = (rollup["Shared_Clean"] + rollup["Shared_Dirty"]) / 1024
+        total_rss += rss
+        total_pss += pss
+        role = "master" if pid == master else "worker"
+        print(f"{role:<8}{pid:>8}{rss:>12.1f}{pss:>12.1f}{shared:>12.1f}")
+
+    print("-" * 60)
+    print(f"{'total':<16}{total_rss:>12.1f}{total_pss:>12.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "gunicorn.pid")
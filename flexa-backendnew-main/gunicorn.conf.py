@@ -0,0 +1,32 @@
+# gunicorn.conf.py
+# Multi-worker deployment with ONE model load:
+#   gunicorn app.main:app -c gunicorn.conf.py
+#
+# preload_app imports app.main in the master, and when_ready builds
+# FlexaRecommender there before forking, so workers start with the model
+# already in copy-on-write memory. The model arrays are memory-mapped (see
+# FLEXA_MODEL_MMAP_MODE in app/ml.py), so those pages stay shared too.
+#
+# Sessions must be shared between workers: set FLEXA_SESSION_BACKEND=redis.
+
+import gc
+import os
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+pidfile = os.getenv("GUNICORN_PIDFILE", "gunicorn.pid")
+timeout = 60
+
+
+def when_ready(server):
+    # The app module is preloaded but the model is normally loaded in the
+    # lifespan hook (per worker). Load it here, once, before workers fork.
+    from app.main import load_recommender
+    load_recommender()
+
+    # Move everything loaded so far (model, dataset, workouts) out of the
+    # garbage collector's tracking, so GC passes in the workers don't touch
+    # (and un-share) those pages.
+    gc.freeze()
@@ -0,0 +1,97 @@
+"""
+Test the table-driven chat flow
+Scripted conversations must produce the same states and replies as the old if/elif chain
+"""
+import asyncio
+import copy
+
+from app.chat_flow import CHAT_STATES, DONE, ChatFlow
+from app.ml import FlexaRecommender
+from app.session_state import ChatStep, SessionState
+
+
+async def _recommend(recommender, profile, wants_videos):
+    return recommender.recommend(profile, wants_videos=wants_videos)
+
+
+def _flow():
+    recommender = FlexaRecommender()
+    return ChatFlow(CHAT_STATES, recommend=_recommend, recommender=lambda: recommender)
+
+
+def _run(flow, answers):
+    session = SessionState.new()
+    turns = [asyncio.run(flow.advance(session, a)) for a in answers]
+    return session, turns
+
+
+def test_conversation_without_drift():
+    flow = _flow()
+    session, turns = _run(flow, ["Sam", "weight loss", "Male", "abc", "30", "1.80", "95", "yes", "no", "yes", "hi"])
+
+    assert turns[0].message.startswith("Nice to meet you, Sam! What do you need help with?")
+    assert turns[1].message == "Got it. What is your sex? (Male/Female)"
+    assert turns[3].message == "Please type your age as a number (example: 21)."
+    assert turns[6].message.startswith("Great! Your BMI is 29.3 (Overweight).\n\nDo you have hypertension")
+    assert turns[6].user_data == {"name": "Sam", "height": 180, "weight": 95.0, "bmi": 29.3,
+                                  "bmi_category": "Overweight"}
+
+    # Health condition: warning first, plan ends with the videos question
+    plan = turns[8].message
+    assert plan.startswith("⚠️ IMPORTANT") and "✅ Sam, here's your personalized plan" in plan
+    assert plan.endswith("(Yes/No)")
+    assert turns[9].message.startswith("▶️ RECOMMENDED WORKOUT VIDEOS")
+    assert turns[10].message == "If you want, type 'restart' to begin again."
+    assert session.step == DONE
+    assert session.age == 30 and session.wants_videos is True
+    assert session.data()["bmi_category"] == "Overweight"
+
+
+def test_conversation_with_drift():
+    flow = _flow()
+    session, turns = _run(flow, ["Ana", "I want to lose weight", "Female", "25", "1.70", "48", "No", "No"])
+
+    assert session.step == ChatStep.ASK_GOAL_CLARIFICATION
+    assert "GOAL DRIFT DETECTED" in turns[-1].message
+    assert turns[-1].message.endswith("'Follow AI recommendation' or 'Keep my original goal'")
+
+    turn = asyncio.run(flow.advance(session, "Keep my original goal"))
+    assert session.step == ChatStep.ASK_VIDEOS
+    assert session.clarification == "Kept original goal"
+    assert session.drift_message is None
+    assert turn.message.startswith("✅ Understood! We'll respect your goal preference.\n\n✅ Ana,")
+
+    turn = asyncio.run(flow.advance(session, "no"))
+    assert turn.message == "No problem! Good luck with your fitness journey! 💪"
+
+
+def test_turn_uses_one_recommender():
+    recommender = FlexaRecommender()
+    fetched, used = [], []
+
+    def current():
+        # A reload swaps in a new instance between any two calls
+        fetched.append(copy.copy(recommender))
+        return fetched[-1]
+
+    async def recommend(rec, profile, wants_videos):
+        used.append(rec)
+        return rec.recommend(profile, wants_videos=wants_videos)
+
+    flow = ChatFlow(CHAT_STATES, recommend=recommend, recommender=current)
+    session, turns = _run(flow, ["Sam", "weight loss", "Male", "30", "1.80", "95", "yes"])
+    assert not fetched  # no model needed yet
+
+    turn = asyncio.run(flow.advance(session, "no"))  # drift check + plan message
+    assert len(fetched) == 1 and used and all(rec is fetched[0] for rec in used)
+    assert "here's your personalized plan" in turn.message
+
+    asyncio.run(flow.advance(session, "yes"))  # videos: next turn, next instance
+    assert len(fetched) == 2
+
+
+if __name__ == "__main__":
+    test_conversation_without_drift()
+    test_conversation_with_drift()
+    test_turn_uses_one_recommender()
+    print("✅ Chat flow conversations")
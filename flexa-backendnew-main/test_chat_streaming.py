@@ -0,0 +1,115 @@
+"""
+Test streamed chat replies (Server-Sent Events and WebSocket)
+Streamed sections must add up to the /chat/message reply
+"""
+import json
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+ANSWERS = ["Sam", "weight loss", "Male", "30", "1.80", "95", "yes", "no", "yes"]
+
+
+def _http_replies(client):
+    session_id = client.get("/chat/start").json()["session_id"]
+    return [
+        client.post("/chat/message", json={"session_id": session_id, "user_message": a}).json()
+        for a in ANSWERS
+    ]
+
+
+def _sse_events(body):
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n", 1)
+        yield event[len("event: "):], json.loads(data[len("data: "):])
+
+
+def test_websocket_streams_sections():
+    with TestClient(app) as client:
+        expected = _http_replies(client)
+
+        with client.websocket_connect("/chat/ws") as ws:
+            hello = ws.receive_json()
+            assert hello["type"] == "session" and hello["state"] == "ASK_NAME"
+
+            for answer, reply in zip(ANSWERS, expected):
+                ws.send_json({"message": answer})
+                sections = []
+                frame = ws.receive_json()
+                while frame["type"] == "section":
+                    sections.append(frame)
+                    frame = ws.receive_json()
+
+                assert frame["type"] == "done" and frame["state"] == reply["state"]
+                assert frame["data_collected"] == reply["data_collected"]
+                assert "".join(f["text"] for f in sections) == reply["message"]
+
+            # Plan turn is split into sections, the final turn carries the videos
+            assert [f["section"] for f in sections] == ["videos"]
+
+
+def test_sse_streams_sections():
+    with TestClient(app) as client:
+        expected = _http_replies(client)
+        session_id = client.get("/chat/start").json()["session_id"]
+
+        for answer, reply in zip(ANSWERS, expected):
+            response = client.post("/chat/message/stream", json={"session_id": session_id, "user_message": answer})
+            assert response.headers["content-type"].startswith("text/event-stream")
+            events = list(_sse_events(response.text))
+
+            assert events[0] == ("start", {"session_id": session_id})
+            assert events[-1][0] == "done" and events[-1][1]["state"] == reply["state"]
+            assert "".join(d["text"] for e, d in events if e == "section") == reply["message"]
+
+        plan = [d["section"] for e, d in _sse_events(response.text) if e == "section"]
+        assert plan == ["videos"]
+
+
+def _ws_turn(ws):
+    # Compact frames: sections until the "d" (done) frame
+    frames = []
+    while True:
+        frame = json.loads(ws.receive_text())
+        frames.append(frame)
+        if frame[0] != "s":
+            return frames
+
+
+def test_websocket_compact_frames_and_resume():
+    with TestClient(app) as client:
+        with client.websocket_connect("/chat/ws?compact=1") as ws:
+            code, session_id, state, message, data = json.loads(ws.receive_text())
+            assert (code, state, data) == ("h", "ASK_NAME", {})
+            assert message.startswith("Hi! I'm Flexa")
+
+            for answer in ANSWERS[:4]:
+                ws.send_text(answer)
+                frames = _ws_turn(ws)
+            assert frames[-1] == ["d", "ASK_HEIGHT", {"age": 30}, None]
+
+        # Reconnect: same session, the pending question is asked again
+        with client.websocket_connect(f"/chat/ws?compact=1&session_id={session_id}") as ws:
+            code, resumed_id, state, message, data = json.loads(ws.receive_text())
+            assert (resumed_id, state) == (session_id, "ASK_HEIGHT")
+            assert message == "What is your height in meters? (example: 1.65)"
+            assert data == {"name": "Sam", "problem": "weight loss", "sex": "Male", "age": 30}
+
+            for answer in ANSWERS[4:8]:
+                ws.send_text(answer)
+                frames = _ws_turn(ws)
+            assert [f[1] for f in frames[:-1]] == ["stats", "exercises", "equipment", "diet", "recommendation"]
+
+        # Resuming on the plan question re-sends the plan
+        with client.websocket_connect(f"/chat/ws?session_id={session_id}") as ws:
+            hello = ws.receive_json()
+            assert hello["state"] == "ASK_VIDEOS"
+            assert hello["message"] == "".join(f[2] for f in frames[:-1])
+
+
+if __name__ == "__main__":
+    test_websocket_streams_sections()
+    test_sse_streams_sections()
+    test_websocket_compact_frames_and_resume()
+    print("✅ Streamed chat replies match /chat/message")
@@ -0,0 +1,81 @@
+"""
+Test the columnar dataset cache
+Loading from the cache must give the same DataFrame as reading the spreadsheet,
+and a changed spreadsheet must invalidate it
+"""
+import pandas as pd
+import pytest
+
+import train
+
+
+def test_cache_matches_spreadsheet(tmp_path, monkeypatch):
+    cache_path = str(tmp_path / "dataset.npz")
+    expected = train.load_dataset(train.DATA_PATH, cache_path=None)
+
+    first = train.load_dataset(train.DATA_PATH, cache_path=cache_path)  # reads Excel, writes the cache
+    pd.testing.assert_frame_equal(first, expected)
+
+    def no_excel(*args, **kwargs):
+        raise AssertionError("spreadsheet read despite a valid cache")
+
+    monkeypatch.setattr(train.pd, "read_excel", no_excel)
+    cached = train.load_dataset(train.DATA_PATH, cache_path=cache_path)
+    pd.testing.assert_frame_equal(cached, expected)
+
+
+def test_changed_spreadsheet_invalidates_cache(tmp_path):
+    xlsx = str(tmp_path / "plans.xlsx")
+    cache_path = str(tmp_path / "dataset.npz")
+    raw = pd.read_excel(train.DATA_PATH, nrows=20)
+
+    raw.to_excel(xlsx, index=False)
+    assert len(train.load_dataset(xlsx, cache_path=cache_path)) == 20
+
+    raw.head(7).to_excel(xlsx, index=False)
+    assert len(train.load_dataset(xlsx, cache_path=cache_path)) == 7
+
+
+def test_cache_keeps_missing_values(tmp_path):
+    xlsx = str(tmp_path / "plans.xlsx")
+    cache_path = str(tmp_path / "dataset.npz")
+    raw = pd.read_excel(train.DATA_PATH, nrows=20)
+    raw.loc[[2, 5], "Diet"] = None
+    raw.loc[4, "Age"] = None
+    raw.to_excel(xlsx, index=False)
+
+    train.load_dataset(xlsx, cache_path=cache_path)
+    cached = train.load_dataset(xlsx, cache_path=cache_path)
+    pd.testing.assert_frame_equal(cached, train.load_dataset(xlsx, cache_path=None))
+    assert cached["Diet"].isna().tolist().count(True) == 2
+
+
+def test_mixed_type_columns_are_not_cached(tmp_path):
+    xlsx = str(tmp_path / "plans.xlsx")
+    cache_path = str(tmp_path / "dataset.npz")
+    raw = pd.read_excel(train.DATA_PATH, nrows=20)
+    raw["Diet"] = raw["Diet"].astype(object)
+    raw.loc[3, "Diet"] = 42  # as text it would come back as "42"
+    raw.to_excel(xlsx, index=False)
+
+    expected = train.load_dataset(xlsx, cache_path=cache_path)
+    assert not (tmp_path / "dataset.npz").exists()
+    assert expected.loc[3, "Diet"] == 42
+    pd.testing.assert_frame_equal(train.load_dataset(xlsx, cache_path=cache_path), expected)
+
+    with pytest.raises(ValueError, match="Diet"):
+        train.save_dataset_cache(expected, cache_path, "sha")
+
+
+def test_yes_no_normalization():
+    raw = pd.read_excel(train.DATA_PATH, nrows=6)
+    raw["Hypertension"] = [" YES", "y", "True", 1, None, "no"]
+    raw["Diabetes"] = ["0", "No ", "n", float("nan"), "yes", "TRUE"]
+
+    df = train.clean_dataset(raw)
+    assert df["Hypertension"].tolist() == ["Yes", "Yes", "Yes", "Yes", "No", "No"]
+    assert df["Diabetes"].tolist() == ["No", "No", "No", "No", "Yes", "Yes"]
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
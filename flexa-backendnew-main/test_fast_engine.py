@@ -0,0 +1,57 @@
+"""
+Test the pandas-free inference engine
+FastKNNEngine must predict exactly what pipeline.predict does for every dataset row
+"""
+import pandas as pd
+
+from app.ml import FlexaRecommender
+
+FEATURE_COLS = ["Sex", "Age", "Height", "Weight", "Hypertension", "Diabetes", "BMI", "Level"]
+
+
+def test_engine_matches_pipeline_on_dataset():
+    recommender = FlexaRecommender()
+    X = recommender.df[FEATURE_COLS]
+
+    expected = recommender.pipeline.predict(X).tolist()
+    got = recommender.engine.predict_many(X.to_dict("records"))
+
+    mismatches = [i for i, (a, b) in enumerate(zip(expected, got)) if a != b]
+    assert not mismatches, f"{len(mismatches)} rows differ, first: {mismatches[:5]}"
+
+
+def test_predict_one_matches_pipeline():
+    recommender = FlexaRecommender()
+    rows = recommender.df[FEATURE_COLS].iloc[::97].to_dict("records")
+
+    # Categories the encoder never saw (one-hot all zeros), None and missing values
+    unknown = []
+    for row in rows[:40]:
+        unknown.append({**row, "Sex": "Other"})
+        unknown.append({**row, "Level": "Extreme", "Diabetes": "Maybe"})
+        unknown.append({**row, "Hypertension": None, "Weight": None})
+        unknown.append({**row, "Diabetes": float("nan"), "Age": float("nan")})
+    rows += unknown
+
+    expected = recommender.pipeline.predict(pd.DataFrame(rows, columns=FEATURE_COLS)).tolist()
+    got = [recommender.engine.predict_one(row) for row in rows]
+
+    mismatches = [i for i, (a, b) in enumerate(zip(expected, got)) if a != b]
+    assert not mismatches, f"{len(mismatches)} of {len(rows)} rows differ, first: {mismatches[:5]}"
+
+
+def test_engine_encoding_matches_preprocessor():
+    recommender = FlexaRecommender()
+    X = recommender.df[FEATURE_COLS].head(50)
+
+    expected = recommender.pipeline.named_steps["prep"].transform(X)
+    for i, row in enumerate(X.to_dict("records")):
+        vec = recommender.engine.encode(row)
+        assert abs(vec - expected[i]).max() < 1e-12
+
+
+if __name__ == "__main__":
+    test_engine_matches_pipeline_on_dataset()
+    test_predict_one_matches_pipeline()
+    test_engine_encoding_matches_preprocessor()
+    print("✅ Fast engine matches pipeline.predict on the whole dataset")
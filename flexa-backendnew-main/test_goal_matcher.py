@@ -0,0 +1,52 @@
+"""
+Test the precompiled goal-phrase matcher
+One-pass regex matching must equal a per-phrase substring search
+"""
+import random
+
+from app.goal_matcher import GoalPhraseMatcher
+from app.ml import GOAL_SYNONYMS_PATH
+
+
+def _naive(phrases, text):
+    lower = text.lower()
+    goals, directions = [], set()
+    for phrase, spec in phrases.items():
+        if phrase in lower:
+            goals.extend(spec["goals"])
+            if spec.get("direction"):
+                directions.add(spec["direction"])
+    return set(goals), directions
+
+
+def test_matcher_equals_substring_search():
+    # Prefixes and overlaps on purpose ("tone" / "tone up", "weight gain weight")
+    phrases = {
+        "tone": {"goals": ["Toning"]},
+        "tone up": {"goals": ["Weight Loss"], "direction": "lose"},
+        "weight gain": {"goals": ["Weight Gain"], "direction": "gain"},
+        "gain weight": {"goals": ["Weight Gain"]},
+        "in weight": {"goals": ["Flexibility"]},
+    }
+    matcher = GoalPhraseMatcher(phrases)
+    words = ["I", "want", "to", "Tone", "up", "weight", "gain", "in", "tone", "WEIGHT", "gain weight"]
+
+    rng = random.Random(0)
+    for _ in range(2000):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(0, 8)))
+        got = matcher.match(text)
+        assert (set(got.expected_goals), set(got.directions)) == _naive(phrases, text), text
+
+
+def test_default_synonym_table():
+    matcher = GoalPhraseMatcher.from_file(GOAL_SYNONYMS_PATH)
+
+    assert set(matcher.match("I want to LOSE WEIGHT fast").expected_goals) == {"Weight Loss", "Toning"}
+    assert matcher.match("help me build muscle").directions == {"gain"}
+    assert matcher.match("just feeling tired").expected_goals == ()
+
+
+if __name__ == "__main__":
+    test_matcher_equals_substring_search()
+    test_default_synonym_table()
+    print("✅ Goal matcher equals substring search")
@@ -0,0 +1,132 @@
+"""
+Test incremental model updates
+Appending rows must give the same neighbours as refitting on old + new rows,
+and reload_recommender must swap models without breaking the old instance
+"""
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+import train
+from app import main
+from app.engine import FastKNNEngine
+from app.ml import FlexaRecommender
+
+NEW_ID = 10 ** 6
+
+
+def _new_rows(df: pd.DataFrame, n: int = 300) -> pd.DataFrame:
+    new_df = df.sample(n=n, random_state=5).copy()
+    new_df["ID"] = np.arange(NEW_ID, NEW_ID + n)
+    new_df["Age"] = new_df["Age"] + 7
+    return new_df
+
+
+def test_append_matches_refit():
+    df = train.load_dataset(train.DATA_PATH)
+    X_train, X_val, y_train, _ = train.split_dataset(df)
+    new_df = _new_rows(df)
+
+    bundle = train.append_rows(joblib.load(train.MODEL_PATH), new_df)
+    refit = train.build_pipeline().fit(
+        pd.concat([X_train, new_df[train.FEATURE_COLS]]), pd.concat([y_train, new_df["ID"]])
+    )
+
+    queries = pd.concat([X_val, new_df[train.FEATURE_COLS]])
+    appended = bundle["pipeline"]
+    dist, _ = appended.named_steps["knn"].kneighbors(appended.named_steps["prep"].transform(queries))
+    expected, _ = refit.named_steps["knn"].kneighbors(refit.named_steps["prep"].transform(queries))
+    assert np.allclose(dist, expected)
+
+    # The served engine follows the updated pipeline exactly
+    got = FastKNNEngine.from_pipeline(appended).predict_many(queries.to_dict("records"))
+    assert got == appended.predict(queries).tolist()
+    assert all(NEW_ID + i in bundle["plan_index"] for i in range(len(new_df)))
+
+
+def test_append_rejects_unknown_categories_and_known_ids():
+    df = train.load_dataset(train.DATA_PATH)
+
+    new_df = _new_rows(df, 3)
+    new_df["Level"] = "Extreme"
+    with pytest.raises(ValueError, match="Level"):
+        train.append_rows(joblib.load(train.MODEL_PATH), new_df)
+
+    with pytest.raises(ValueError, match="already in the model"):
+        train.append_rows(joblib.load(train.MODEL_PATH), df.head(3))
+
+    new_df = _new_rows(df, 3)
+    new_df["ID"] = [NEW_ID, NEW_ID + 1, NEW_ID]
+    with pytest.raises(ValueError, match=f"repeated in the new rows: \\[{NEW_ID}\\]"):
+        train.append_rows(joblib.load(train.MODEL_PATH), new_df)
+
+
+def test_append_to_bundle_without_plan_index():
+    df = train.load_dataset(train.DATA_PATH)
+    bundle = joblib.load(train.MODEL_PATH)
+    del bundle["plan_index"]  # saved before the plan index existed
+
+    with pytest.raises(ValueError, match="already in the model"):
+        train.append_rows(bundle, df.head(3))
+
+    bundle = train.append_rows(bundle, _new_rows(df, 3))
+    assert NEW_ID + 2 in bundle["plan_index"]
+
+
+def test_reload_swaps_recommender(tmp_path):
+    df = train.load_dataset(train.DATA_PATH)
+    new_df = _new_rows(df, 1)
+    new_df["Age"] = 77
+    new_df["Fitness Type"] = "Appended plan"
+
+    model_path = str(tmp_path / "model.joblib")
+    train.save_bundle(train.append_rows(joblib.load(train.MODEL_PATH), new_df), model_path)
+
+    row = new_df.iloc[0]
+    profile = {"sex": row["Sex"], "age": 77, "height_m": float(row["Height"]), "weight_kg": float(row["Weight"]),
+               "hypertension": row["Hypertension"], "diabetes": row["Diabetes"]}
+
+    old = main.load_recommender()
+    before = old.recommend(profile, wants_videos=False)
+    try:
+        new = main.reload_recommender(model_path=model_path)
+        assert main.get_recommender() is new and new is not old
+        assert new.recommend(profile, wants_videos=False)["plan"]["id"] == NEW_ID
+
+        # An in-flight request holding the old instance is unaffected
+        assert old.recommend(profile, wants_videos=False) == before
+    finally:
+        main.recommender = old
+
+
+def test_append_exports_slim_artifact(tmp_path):
+    df = train.load_dataset(train.DATA_PATH)
+    new_df = _new_rows(df, 1)
+    new_df["Age"] = 77
+    rows_path = str(tmp_path / "rows.csv")
+    new_df.to_csv(rows_path, index=False)
+
+    slim_dir = str(tmp_path / "slim")
+    train.append_and_save(rows_path, out_path=str(tmp_path / "model.joblib"), slim=True, slim_dir=slim_dir)
+
+    slim = FlexaRecommender(model_path=slim_dir)
+    row = new_df.iloc[0]
+    profile = {"sex": row["Sex"], "age": 77, "height_m": float(row["Height"]), "weight_kg": float(row["Weight"]),
+               "hypertension": row["Hypertension"], "diabetes": row["Diabetes"]}
+    assert slim.pipeline is None
+    assert slim.recommend(profile, wants_videos=False)["plan"]["id"] == NEW_ID
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    test_append_matches_refit()
+    test_append_rejects_unknown_categories_and_known_ids()
+    test_append_to_bundle_without_plan_index()
+    with tempfile.TemporaryDirectory() as d:
+        test_reload_swaps_recommender(Path(d))
+    with tempfile.TemporaryDirectory() as d:
+        test_append_exports_slim_artifact(Path(d))
+    print("✅ Appended rows match a refit and reloads swap atomically")
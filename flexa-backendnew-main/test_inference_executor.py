@@ -0,0 +1,62 @@
+"""
+Test the bounded inference executor
+Calls beyond workers + queue must be rejected immediately (HTTP 503)
+"""
+import asyncio
+import threading
+
+import pytest
+
+from app.executor import ExecutorSaturated, InferenceExecutor
+
+
+def test_executor_rejects_when_saturated():
+    pool = InferenceExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(ExecutorSaturated):
+            await pool.run(lambda: None)
+
+        release.set()
+        await asyncio.gather(*running)
+        return await pool.run(lambda x: x * 2, 21)
+
+    assert asyncio.run(scenario()) == 42
+    stats = pool.stats()
+    assert stats["rejected"] == 1 and stats["in_flight"] == 0 and stats["peak_in_flight"] == 2
+    pool.shutdown()
+
+
+def test_cancelled_call_keeps_its_slot_until_it_finishes():
+    pool = InferenceExecutor(max_workers=1, max_queue=0)
+    release = threading.Event()
+
+    async def scenario():
+        # The caller gives up (client disconnect), the worker thread does not
+        running = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.05)
+        running.cancel()
+        await asyncio.sleep(0.05)
+
+        try:
+            assert pool.stats()["in_flight"] == 1
+            with pytest.raises(ExecutorSaturated):
+                await pool.run(lambda: None)
+        finally:
+            release.set()
+        await asyncio.sleep(0.05)
+        assert pool.stats()["in_flight"] == 0
+        return await pool.run(lambda: "ok")
+
+    assert asyncio.run(scenario()) == "ok"
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    test_executor_rejects_when_saturated()
+    test_cancelled_call_keeps_its_slot_until_it_finishes()
+    print("✅ Inference executor bounds concurrency")
@@ -0,0 +1,55 @@
+"""
+Test the local intent classifier
+Hand-rolled hashing + scoring must equal sklearn's HashingVectorizer + LogisticRegression
+"""
+import os
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+
+from app.intent import IntentClassifier
+from app.ml import FlexaRecommender
+from train_intent import PHRASES_PATH, build_vectorizer, load_phrases, train_intent_model
+
+
+def test_scores_equal_sklearn():
+    df = load_phrases(PHRASES_PATH)
+    texts, labels = df["text"].tolist(), df["label"].tolist()
+
+    vectorizer = build_vectorizer()
+    clf = LogisticRegression(C=10.0, max_iter=2000).fit(vectorizer.transform(texts), labels)
+    model = IntentClassifier.from_dict(IntentClassifier.from_sklearn(vectorizer, clf).to_dict())
+
+    extra = ["", "!!!", "Ünïcode wörds and CAPS", "lose lose lose weight weight"]
+    expected = clf.predict_proba(vectorizer.transform(texts + extra))
+    for text, proba in zip(texts + extra, expected):
+        np.testing.assert_allclose(model.predict_proba(text), proba, rtol=1e-9, atol=1e-12)
+
+
+def test_drift_falls_back_to_intent(tmp_path):
+    df = load_phrases(PHRASES_PATH)
+    model = train_intent_model(df["text"].tolist(), df["label"].tolist())
+
+    assert model.classify("I'm way too skinny") == "Weight Gain"
+    assert model.classify("hello there") is None
+
+    import joblib
+    path = os.path.join(tmp_path, "intent.joblib")
+    joblib.dump(model.to_dict(), path)
+    recommender = FlexaRecommender(intent_model_path=path)
+
+    # Underweight profile: no synonym phrase in the text, the classifier supplies the goal
+    profile = {"sex": "Female", "age": 25, "height_m": 1.70, "weight_kg": 48,
+               "hypertension": "No", "diabetes": "No"}
+    drift = recommender.detect_goal_drift(profile, "my belly fat bothers me")
+    assert drift["stated_intent"] == "Weight Loss"
+    assert drift["has_drift"] and "lose weight" in drift["drift_message"]
+
+    # Without the model the same text has no expected goals -> no drift
+    plain = FlexaRecommender(intent_model_path=None)
+    assert not plain.detect_goal_drift(profile, "my belly fat bothers me")["has_drift"]
+
+
+if __name__ == "__main__":
+    test_scores_equal_sklearn()
+    print("✅ Intent classifier equals sklearn")
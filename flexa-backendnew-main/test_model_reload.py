@@ -0,0 +1,153 @@
+"""
+Test zero-downtime model reload
+Reloads must swap in a smoke-tested recommender, keep the old one on failure,
+and never fail requests that are running meanwhile
+"""
+import json
+import signal
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.ml import SMOKE_PROFILE
+from app.reloader import ReloadFailed, reload_signal
+
+TOKEN = "test-token"
+
+
+@pytest.fixture
+def serving():
+    # Restore the serving recommender after each test
+    old = main.load_recommender()
+    yield old
+    main.recommender = old
+
+
+def _workouts_copy(tmp_path, drop: int = 0) -> str:
+    with open("data/workouts.json", "r", encoding="utf-8") as f:
+        data = json.load(f)
+    data["workouts"] = data["workouts"][drop:]
+    path = tmp_path / "workouts.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return str(path)
+
+
+def test_admin_endpoint(serving, monkeypatch):
+    with TestClient(main.app) as client:
+        monkeypatch.setattr(main, "ADMIN_TOKEN", "")
+        assert client.post("/admin/reload").status_code == 404
+
+        monkeypatch.setattr(main, "ADMIN_TOKEN", TOKEN)
+        assert client.post("/admin/reload", headers={"X-Admin-Token": "wrong"}).status_code == 403
+
+        generation = main.reloader.generation
+        response = client.post("/admin/reload", headers={"X-Admin-Token": TOKEN})
+        assert response.status_code == 200
+        assert response.json()["generation"] == generation + 1
+        assert main.get_recommender() is not serving
+        assert client.get("/metrics").json()["model_reload"]["generation"] == generation + 1
+
+
+def test_failed_reload_keeps_serving_model(serving, tmp_path):
+    bad = tmp_path / "workouts.json"
+    bad.write_text("{not json", encoding="utf-8")
+
+    failures = main.reloader.failures
+    with pytest.raises(ReloadFailed):
+        main.reload_recommender(workouts_path=str(bad))
+
+    assert main.get_recommender() is serving
+    assert main.reloader.failures == failures + 1
+    assert main.reloader.stats()["last_error"].startswith("JSONDecodeError")
+
+
+def test_changed_files_trigger_reload(serving, tmp_path):
+    workouts_path = _workouts_copy(tmp_path)
+    first = main.reload_recommender(workouts_path=workouts_path)
+    assert not main.reloader.changed()
+
+    _workouts_copy(tmp_path, drop=2)
+    assert main.reloader.changed()
+    second = main.reload_recommender()
+    assert len(second.workouts_data) == len(first.workouts_data) - 2
+    assert not main.reloader.changed()
+
+
+def test_requests_survive_reloads(serving):
+    errors = []
+    stop = threading.Event()
+
+    def client_loop():
+        while not stop.is_set():
+            try:
+                main.get_recommender().recommend(SMOKE_PROFILE, wants_videos=True)
+            except Exception as exc:  # pragma: no cover - reported below
+                errors.append(exc)
+
+    threads = [threading.Thread(target=client_loop) for _ in range(4)]
+    for t in threads:
+        t.start()
+    try:
+        for _ in range(3):
+            main.reload_recommender()
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+
+    assert not errors
+
+
+def test_request_keeps_its_recommender_across_a_reload(serving, monkeypatch):
+    with TestClient(main.app) as client:
+        swapped = []
+
+        async def recommend(recommender, profile, wants_videos):
+            rec = recommender.recommend(profile, wants_videos=wants_videos)
+            # Reload while the prediction is in flight: rendering must not switch models
+            swapped.append(main.reload_recommender())
+            swapped[0].payloads = None  # fails the request if it renders with the new instance
+            return rec
+
+        monkeypatch.setattr(main, "_recommend", recommend)
+        body = {"name": "Sam", "sex": "Male", "age": 30, "height_m": 1.8, "weight_kg": 80,
+                "hypertension": "No", "diabetes": "No", "wants_videos": True}
+        assert client.post("/recommend", json=body).status_code == 200
+        assert swapped and main.get_recommender() is swapped[0]
+
+
+def test_micro_batch_keeps_each_request_on_its_recommender(serving):
+    new = serving.reloaded()
+    calls = []
+
+    def tracking(recommender):
+        recommend_many = recommender.recommend_many
+
+        def wrapper(profiles, wants_videos):
+            calls.append((recommender, len(profiles)))
+            return recommend_many(profiles, wants_videos=wants_videos)
+        return wrapper
+
+    serving.recommend_many, new.recommend_many = tracking(serving), tracking(new)
+    try:
+        results = main._recommend_batch([(serving, SMOKE_PROFILE, False), (new, SMOKE_PROFILE, True),
+                                         (serving, SMOKE_PROFILE, True)])
+    finally:
+        del serving.recommend_many
+
+    assert calls == [(serving, 2), (new, 1)]
+    assert [bool(r["workouts"]) for r in results] == [False, True, True]
+
+
+def test_reload_signal_avoids_gunicorn_signals():
+    assert reload_signal("") is None
+    assert reload_signal("SIGURG") == signal.SIGURG
+    for name in ("SIGUSR2", "SIGHUP", "SIGUSR1"):
+        with pytest.raises(ValueError, match="gunicorn"):
+            reload_signal(name)
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,95 @@
+"""
+Test the neighbour search backends
+Exact backends must return the same neighbour distances as the KD tree and the
+same predictions as pipeline.predict on held-out rows, IVF must be exact when probing every cell and close to exact by default
+"""
+import numpy as np
+import pytest
+
+import train
+from app.artifact import export_slim, load_slim
+from app.engine import FastKNNEngine
+from app.ml import FlexaRecommender
+from app.neighbors import build_index
+
+FEATURE_COLS = ["Sex", "Age", "Height", "Weight", "Hypertension", "Diabetes", "BMI", "Level"]
+K = 5
+
+
+def _setup(n_queries: int = 500):
+    recommender = FlexaRecommender()
+    rows = recommender.df[FEATURE_COLS].sample(n=n_queries, random_state=3).to_dict("records")
+    Q = np.vstack([recommender.engine.encode(r) for r in rows])
+    return recommender.engine, Q
+
+
+def test_exact_backends_agree():
+    engine, Q = _setup()
+    expected, _ = build_index("kd_tree", engine.fit_X).query(Q, K)
+
+    for method in ("brute", "ball_tree"):
+        dist, _ = build_index(method, engine.fit_X).query(Q, K)
+        assert np.allclose(dist, expected), method
+
+
+# Held-out rows: training rows match themselves at d=0, which hides vote ties
+@pytest.mark.parametrize("metric", ["euclidean", "manhattan"])
+@pytest.mark.parametrize("algorithm", ["brute", "kd_tree", "ball_tree"])
+def test_exact_backends_match_pipeline_on_held_out_rows(metric, algorithm):
+    X_train, X_val, y_train, _ = train.split_dataset(train.load_dataset(train.DATA_PATH))
+    pipeline = train.build_pipeline(metric=metric, algorithm=algorithm).fit(X_train, y_train)
+    engine = FastKNNEngine.from_pipeline(pipeline)
+    assert engine.fit_method == algorithm
+
+    expected = pipeline.predict(X_val).tolist()
+    rows = X_val.to_dict("records")
+    assert engine.predict_many(rows) == expected
+    assert [engine.predict_one(r) for r in rows[:500]] == expected[:500]
+
+
+def test_ivf_probing_every_cell_is_exact():
+    engine, Q = _setup()
+    exact_dist, _ = build_index("brute", engine.fit_X).query(Q, K)
+
+    dist, ind = build_index("ivf", engine.fit_X, n_probe=10 ** 6).query(Q, K)
+    # Same neighbour distances; equally distant rows may come in another order
+    assert np.allclose(dist, exact_dist)
+    assert np.allclose(np.linalg.norm(engine.fit_X[ind] - Q[:, None, :], axis=2), dist)
+
+
+def test_ivf_recall():
+    engine, Q = _setup()
+    _, exact_ind = build_index("brute", engine.fit_X).query(Q, K)
+    _, ind = build_index("ivf", engine.fit_X).query(Q, K)
+
+    recall = np.mean([len(set(a) & set(b)) / K for a, b in zip(exact_ind, ind)])
+    assert recall >= 0.95, recall
+
+
+def test_ivf_slim_round_trip(tmp_path):
+    recommender = FlexaRecommender()
+    params = dict(recommender.engine.export_params(), fit_method="ivf", index_params={})
+    engine = FastKNNEngine.from_params(params, recommender.engine.fit_X, recommender.engine.labels)
+
+    out_dir = str(tmp_path / "slim")
+    export_slim(engine, recommender.plans, out_dir)
+    loaded, _ = load_slim(out_dir)
+
+    assert loaded.fit_method == "ivf"
+    assert (np.asarray(loaded.index.order) == engine.index.order).all()
+    # Cell-ordered rows are memory-mapped from the artifact, not copied per process
+    assert isinstance(loaded.index.cell_X, np.memmap)
+    rows = recommender.df[FEATURE_COLS].head(300).to_dict("records")
+    assert loaded.predict_many(rows) == engine.predict_many(rows)
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    test_exact_backends_agree()
+    test_ivf_probing_every_cell_is_exact()
+    test_ivf_recall()
+    with tempfile.TemporaryDirectory() as d:
+        test_ivf_slim_round_trip(Path(d))
+    print("✅ Neighbour backends agree with exact search")
@@ -0,0 +1,31 @@
+"""
+Test the prebuilt plan index
+Every plan ID must resolve to the same text as the original DataFrame row
+"""
+from app.ml import FlexaRecommender
+from app.plans import PLAN_COLUMNS, build_plan_index
+
+
+def test_plan_index_matches_dataset():
+    recommender = FlexaRecommender()
+    df = recommender.df
+
+    assert len(recommender.plans) == len(df)
+    for _, row in df.iterrows():
+        record = recommender.plans[int(row["ID"])]
+        for col, field in PLAN_COLUMNS.items():
+            assert getattr(record, field) == row[col]
+
+
+def test_plan_index_shares_identical_records():
+    recommender = FlexaRecommender()
+    index = build_plan_index(recommender.df)
+
+    distinct = {id(r) for r in index.values()}
+    assert len(distinct) == len(set(index.values()))
+
+
+if __name__ == "__main__":
+    test_plan_index_matches_dataset()
+    test_plan_index_shares_identical_records()
+    print("✅ Plan index matches dataset")
@@ -0,0 +1,76 @@
+"""
+Test the pre-rendered plan messages
+Must equal the message the chat flow used to build with string concatenation
+"""
+from app.ml import FlexaRecommender
+from app.plans import plan_to_dict
+from app.renderer import PlanRenderer
+
+
+def _concatenated(rec, name, has_conditions, clarification=None):
+    # The original chat_message code (with real newlines in the clarification branch)
+    plan = rec["plan"]
+    msg = ""
+    if clarification is True:
+        msg += "✅ Great choice! Following the AI recommendation based on your stats.\n\n"
+    elif clarification is False:
+        msg += "✅ Understood! We'll respect your goal preference.\n\n"
+    if has_conditions:
+        msg += "⚠️ IMPORTANT: Please consult your doctor before starting any new workout plan.\n\n"
+    msg += f"✅ {name}, here's your personalized plan (ML-based):\n\n"
+    msg += "📊 YOUR STATS\n"
+    msg += f"• BMI: {rec['bmi']} ({rec['level']})\n"
+    msg += f"• Fitness Goal: {plan['fitness_goal']}\n"
+    msg += f"• Plan Type: {plan['fitness_type']}\n\n"
+    msg += "🏋️ RECOMMENDED EXERCISES\n"
+    exercises = plan['exercises'].split(',') if ',' in plan['exercises'] else [plan['exercises']]
+    for ex in exercises:
+        msg += f"• {ex.strip()}\n"
+    msg += "\n"
+    msg += "🧰 EQUIPMENT NEEDED\n"
+    equipment = plan['equipment'].split(',') if ',' in plan['equipment'] else [plan['equipment']]
+    for eq in equipment:
+        msg += f"• {eq.strip()}\n"
+    msg += "\n"
+    msg += "🥗 DIET RECOMMENDATIONS\n"
+    diet_text = plan['diet'].replace(';', ',').replace(' and ', ',')
+    for diet in [d.strip() for d in diet_text.split(',') if d.strip()]:
+        msg += f"• {diet}\n"
+    msg += "\n"
+    msg += f"📌 EXPERT RECOMMENDATION\n{plan['recommendation']}\n\n"
+    return msg + "Would you like me to suggest some YouTube workout videos as well? (Yes/No)"
+
+
+def test_rendered_plan_equals_concatenation():
+    recommender = FlexaRecommender()
+    renderer = recommender.renderer
+
+    for plan_id, record in recommender.plans.items():
+        rec = {"bmi": 22.5, "level": "Normal", "plan": plan_to_dict(plan_id, record)}
+        for has_conditions in (False, True):
+            for clarification in (None, True, False):
+                expected = _concatenated(rec, "Sam", has_conditions, clarification)
+                assert renderer.render_plan(rec, "Sam", has_conditions, clarification) == expected
+
+
+def test_unknown_plan_and_videos():
+    renderer = PlanRenderer({})
+    rec = {"bmi": 31.0, "level": "Obese", "plan": {
+        "id": 7, "fitness_goal": "Weight Loss", "fitness_type": "Cardio",
+        "exercises": "Walking", "equipment": "Shoes, Mat", "diet": "Vegetables; fruits and water",
+        "recommendation": "Walk daily."
+    }}
+    assert renderer.render_plan(rec, "Ana", True) == _concatenated(rec, "Ana", True)
+
+    videos = renderer.render_videos([{"title": "HIIT", "duration": 20, "youtube_link": "https://y/1"}])
+    assert videos == (
+        "▶️ RECOMMENDED WORKOUT VIDEOS\n\n1. HIIT\n   ⏱ Duration: 20 min\n   🔗 Watch: https://y/1\n\n"
+        "Good luck with your fitness journey! 💪"
+    )
+    assert "couldn't find" in renderer.render_videos([])
+
+
+if __name__ == "__main__":
+    test_rendered_plan_equals_concatenation()
+    test_unknown_plan_and_videos()
+    print("✅ Rendered plans equal the concatenated messages")
@@ -0,0 +1,48 @@
+"""
+Test batch recommendations
+recommend_many() must give exactly the same result per row as recommend()
+"""
+from app.ml import FlexaRecommender
+
+
+def _sample_profiles(recommender, n=200):
+    df = recommender.df.sample(n=n, random_state=0)
+    return [
+        {
+            "sex": row["Sex"],
+            "age": int(row["Age"]),
+            "height_m": float(row["Height"]),
+            "weight_kg": float(row["Weight"]),
+            "hypertension": row["Hypertension"],
+            "diabetes": row["Diabetes"],
+        }
+        for _, row in df.iterrows()
+    ]
+
+
+def test_recommend_many_matches_single():
+    recommender = FlexaRecommender()
+    profiles = _sample_profiles(recommender)
+
+    batch = recommender.recommend_many(profiles, wants_videos=True)
+    single = [recommender.recommend(p, wants_videos=True) for p in profiles]
+
+    assert batch == single
+
+
+def test_recommend_many_per_profile_video_flags():
+    recommender = FlexaRecommender()
+    profiles = _sample_profiles(recommender, n=4)
+    flags = [True, False, True, False]
+
+    batch = recommender.recommend_many(profiles, wants_videos=flags)
+
+    for rec, flag in zip(batch, flags):
+        assert bool(rec["workouts"]) == flag
+    assert recommender.recommend_many([]) == []
+
+
+if __name__ == "__main__":
+    test_recommend_many_matches_single()
+    test_recommend_many_per_profile_video_flags()
+    print("✅ Batch recommendations match single-profile path")
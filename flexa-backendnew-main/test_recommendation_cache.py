@@ -0,0 +1,48 @@
+"""
+Test recommendation memoization
+One chat conversation must run the model once; TTL/LRU limits must hold
+"""
+import asyncio
+
+from app.cache import TTLCache
+from app.main import chat_message, chat_start, load_recommender
+from app.schema import ChatMessageRequest
+
+
+def test_chat_flow_predicts_once():
+    recommender = load_recommender()
+    recommender.prediction_cache.clear()
+    misses_before = recommender.prediction_cache.misses
+
+    session_id = asyncio.run(chat_start()).session_id
+    answers = ["Sam", "I want to lose weight", "Female", "25", "1.70", "48", "No", "No",
+               "Follow AI recommendation", "Yes"]
+    last = None
+    for answer in answers:
+        last = asyncio.run(chat_message(ChatMessageRequest(session_id=session_id, user_message=answer)))
+
+    assert last.state == "DONE"
+    assert "RECOMMENDED WORKOUT VIDEOS" in last.message
+    assert recommender.prediction_cache.misses - misses_before == 1
+
+
+def test_ttl_cache_expiry_and_lru():
+    now = [0.0]
+    cache = TTLCache(max_size=2, ttl=10, clock=lambda: now[0])
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # evicts "b" (least recently used)
+    assert cache.get("b") is None
+    assert cache.evictions == 1
+
+    now[0] = 11.0
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 1
+
+
+if __name__ == "__main__":
+    test_chat_flow_predicts_once()
+    test_ttl_cache_expiry_and_lru()
+    print("✅ Recommendation cache works")
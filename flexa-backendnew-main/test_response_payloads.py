@@ -0,0 +1,54 @@
+"""
+Test pre-serialized recommendation responses
+Bodies must equal what FastAPI would produce from RecommendationResponse
+"""
+import json
+
+from app.ml import BMI_LEVELS, HEALTH_FLAGS, FlexaRecommender
+from app.responses import SAFETY_NOTE
+from app.schema import RecommendationBatchResponse, RecommendationResponse
+from test_recommend_batch import _sample_profiles
+
+
+def _response_json(model):
+    # FastAPI: serialize through the response model, then JSONResponse encoding
+    return json.dumps(model.model_dump(mode="json"), ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+
+def _response(name, rec):
+    return RecommendationResponse(name=name, bmi=rec["bmi"], level=rec["level"], plan=rec["plan"],
+                                  workouts=rec["workouts"], safety_note=SAFETY_NOTE)
+
+
+def test_precomputed_workouts_equal_ranking():
+    recommender = FlexaRecommender()
+    plan = next(iter(recommender.plans.values()))._asdict()
+
+    for level in BMI_LEVELS:
+        for hypertension, diabetes in HEALTH_FLAGS:
+            expected = recommender._pick_workouts(plan["fitness_goal"], plan["fitness_type"],
+                                                  level=level, hypertension=hypertension, diabetes=diabetes)
+            assert recommender.workouts_for(plan, level, hypertension, diabetes) == expected
+
+
+def test_payload_equals_response_model():
+    recommender = FlexaRecommender()
+    profiles = _sample_profiles(recommender, n=100)
+    names = [f"User \"{i}\" ✨" for i in range(len(profiles))]
+    recs = recommender.recommend_many(profiles, wants_videos=[i % 2 == 0 for i in range(len(profiles))])
+
+    for name, rec in zip(names, recs):
+        assert recommender.payloads.render(name, rec) == _response_json(_response(name, rec))
+
+    batch = RecommendationBatchResponse(results=[_response(n, r) for n, r in zip(names, recs)])
+    assert recommender.payloads.render_batch(names, recs) == _response_json(batch)
+
+    # A plan that is not in the index is serialized as is
+    rec = dict(recs[0], plan=dict(recs[0]["plan"], id=-1))
+    assert recommender.payloads.render("x", rec) == _response_json(_response("x", rec))
+
+
+if __name__ == "__main__":
+    test_precomputed_workouts_equal_ranking()
+    test_payload_equals_response_model()
+    print("✅ Pre-serialized responses equal the response model")
@@ -0,0 +1,84 @@
+"""
+Test session stores
+In-memory store must evict idle/oldest sessions; Redis store must round-trip sessions
+"""
+import time
+
+import pytest
+
+from app.session_state import ChatStep, SessionState
+from app.sessions import InMemorySessionStore, RedisSessionStore
+
+
+def make_store(backend, idle_ttl):
+    if backend == "memory":
+        return InMemorySessionStore(max_size=10, idle_ttl=idle_ttl)
+    fakeredis = pytest.importorskip("fakeredis")
+    return RedisSessionStore(client=fakeredis.FakeRedis(), idle_ttl=idle_ttl)
+
+
+def test_in_memory_store_bounds_sessions():
+    store = InMemorySessionStore(max_size=2, idle_ttl=None)
+    for sid in ["a", "b", "c"]:
+        store.save(sid, SessionState.new())
+
+    assert len(store) == 2
+    assert store.get("a") is None  # oldest evicted
+    assert store.get("c").step == ChatStep.ASK_NAME
+
+    store.delete("c")
+    assert store.get("c") is None
+
+
+def test_session_state_round_trip():
+    session = SessionState.new(ChatStep.ASK_VIDEOS)
+    session.name, session.age, session.wants_videos, session.plan_id = "Sam", 30, False, 7
+
+    assert not hasattr(session, "__dict__")  # slotted
+    assert session.data() == {"name": "Sam", "age": 30, "wants_videos": False}
+    assert SessionState.from_dict(session.to_dict()) == session
+
+
+def test_redis_store_round_trip():
+    fakeredis = pytest.importorskip("fakeredis")
+    store = RedisSessionStore(client=fakeredis.FakeRedis(), idle_ttl=60)
+
+    session = SessionState.new(ChatStep.ASK_AGE)
+    session.name, session.height_m, session.plan_id = "Sam", 1.7, 42
+    store.save("abc", session)
+
+    assert store.get("abc") == session
+    assert 0 < store.client.ttl("flexa:session:abc") <= 60
+
+    store.delete("abc")
+    assert store.get("abc") is None
+
+
+# None/0 = never expire, fractions round up to whole seconds, in every store
+@pytest.mark.parametrize("backend", ["memory", "redis"])
+@pytest.mark.parametrize("idle_ttl, expected", [(None, None), (0, None), (-1, None), (0.4, 1), (1.5, 2), (60, 60)])
+def test_stores_agree_on_ttl(backend, idle_ttl, expected):
+    store = make_store(backend, idle_ttl)
+    assert store.stats()["ttl_seconds"] == expected
+
+    store.save("abc", SessionState.new())
+    assert store.get("abc") is not None  # never expires on save
+    if backend == "redis":
+        assert store.client.ttl("flexa:session:abc") == (-1 if expected is None else expected)
+
+
+@pytest.mark.parametrize("backend", ["memory", "redis"])
+def test_stores_expire_idle_sessions(backend):
+    store = make_store(backend, 0.4)  # rounded up to 1s
+    store.save("abc", SessionState.new())
+    time.sleep(0.6)
+    assert store.get("abc") is not None
+    time.sleep(0.6)
+    assert store.get("abc") is None
+
+
+if __name__ == "__main__":
+    test_in_memory_store_bounds_sessions()
+    test_session_state_round_trip()
+    test_redis_store_round_trip()
+    print("✅ Session stores work")
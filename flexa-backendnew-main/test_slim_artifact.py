@@ -0,0 +1,71 @@
+"""
+Test the slim model artifact
+Exporting + reloading (memory-mapped) must give the same plans and predictions
+"""
+import os
+
+from app.artifact import _write_version, export_slim, load_slim
+from app.ml import FlexaRecommender
+from app.reloader import file_stamp
+
+
+def test_slim_artifact_round_trip(tmp_path):
+    legacy = FlexaRecommender()
+    out_dir = str(tmp_path / "slim")
+    export_slim(legacy.engine, legacy.plans, out_dir)
+
+    slim = FlexaRecommender(model_path=out_dir)
+    assert slim.pipeline is None and slim.df is None
+    assert slim.plans == legacy.plans
+
+    profiles = [
+        {
+            "sex": row["Sex"],
+            "age": int(row["Age"]),
+            "height_m": float(row["Height"]),
+            "weight_kg": float(row["Weight"]),
+            "hypertension": row["Hypertension"],
+            "diabetes": row["Diabetes"],
+        }
+        for _, row in legacy.df.sample(n=500, random_state=1).iterrows()
+    ]
+    assert slim.recommend_many(profiles) == legacy.recommend_many(profiles)
+
+
+def test_re_export_switches_versions_atomically(tmp_path):
+    legacy = FlexaRecommender()
+    engine, plans = legacy.engine, legacy.plans
+    half = dict(list(plans.items())[:len(plans) // 2])
+    out_dir = str(tmp_path / "slim")
+
+    _write_version(engine, plans, out_dir)  # flat layout, from before versioning
+    assert load_slim(out_dir)[1] == plans
+    flat_stamp = file_stamp(out_dir)
+
+    export_slim(engine, half, out_dir)
+    assert load_slim(out_dir)[1] == half
+    assert file_stamp(out_dir) != flat_stamp
+    assert os.path.exists(os.path.join(out_dir, "fit_X.npy"))  # previous export kept
+
+    # An export that died before switching CURRENT is never loaded...
+    _write_version(engine, plans, os.path.join(out_dir, "v99999999999999999999"))
+    stamp = file_stamp(out_dir)
+    assert load_slim(out_dir)[1] == half and file_stamp(out_dir) == stamp
+
+    # ...and the next export cleans it up with everything but the previous version
+    export_slim(engine, plans, out_dir)
+    assert load_slim(out_dir)[1] == plans
+    entries = sorted(os.listdir(out_dir))
+    assert entries[0] == "CURRENT" and len(entries) == 3
+    assert all(e.startswith("v") and e != "v99999999999999999999" for e in entries[1:])
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    with tempfile.TemporaryDirectory() as d:
+        test_slim_artifact_round_trip(Path(d))
+    with tempfile.TemporaryDirectory() as d:
+        test_re_export_switches_versions_atomically(Path(d))
+    print("✅ Slim artifact matches the legacy bundle")
@@ -0,0 +1,64 @@
+"""
+Test the train.py hyperparameter search
+Every searched config must be servable by FastKNNEngine (same predictions as
+the pipeline), and the search must write a loadable best bundle + JSON report
+"""
+import json
+
+import train
+from app.engine import FastKNNEngine
+from app.ml import FlexaRecommender
+
+TINY_GRID = {
+    "n_neighbors": [3, 5],
+    "weights": ["uniform", "distance"],
+    "metric": ["manhattan"],
+    "features": {"all": train.FEATURE_COLS, "body": train.SEARCH_GRID["features"]["body"]},
+}
+
+
+def test_engine_matches_pipeline_for_search_options():
+    df = train.load_dataset(train.DATA_PATH)
+    X_train, X_val, y_train, _ = train.split_dataset(df)
+    rows = X_val.to_dict("records")
+
+    for config in train.search_configs(TINY_GRID):
+        pipeline = train.build_pipeline(config["feature_cols"], config["n_neighbors"],
+                                        config["weights"], config["metric"]).fit(X_train, y_train)
+        expected = pipeline.predict(X_val).tolist()
+        got = FastKNNEngine.from_pipeline(pipeline).predict_many(rows)
+        mismatches = sum(a != b for a, b in zip(expected, got))
+        assert mismatches == 0, (config["features"], config["n_neighbors"], config["weights"], mismatches)
+
+
+def test_search_writes_best_bundle_and_report(tmp_path):
+    model_path = str(tmp_path / "best.joblib")
+    report_path = str(tmp_path / "report.json")
+
+    report = train.search_and_save(n_jobs=2, grid=TINY_GRID, model_path=model_path, report_path=report_path)
+
+    with open(report_path, "r", encoding="utf-8") as f:
+        saved = json.load(f)
+    assert saved == json.loads(json.dumps(report))
+    assert len(saved["results"]) == len(train.search_configs(TINY_GRID))
+    assert saved["best"] == saved["results"][0]
+    for r in saved["results"]:
+        assert 0.0 <= r["plan_accuracy"] <= r["goal_accuracy"] <= 1.0
+        assert r["predict_us"] > 0
+
+    recommender = FlexaRecommender(model_path=model_path)
+    assert recommender.engine.metric == "manhattan"
+    assert recommender.engine.n_neighbors == saved["best"]["n_neighbors"]
+    rec = recommender.recommend({"sex": "Female", "age": 30, "height_m": 1.65, "weight_kg": 60,
+                                 "hypertension": "No", "diabetes": "No"})
+    assert rec["plan"]["id"] in recommender.plans
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    test_engine_matches_pipeline_for_search_options()
+    with tempfile.TemporaryDirectory() as d:
+        test_search_writes_best_bundle_and_report(Path(d))
+    print("✅ Search results are servable and the best bundle loads")
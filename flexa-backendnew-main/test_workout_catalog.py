@@ -0,0 +1,96 @@
+"""
+Test the indexed workout catalog
+Compound queries must match a plain scan; plan -> workout picks must not change
+"""
+import json
+
+from app.catalog import WorkoutCatalog
+from app.ranking import rank_workouts, score_workouts
+from app.ml import WORKOUTS_PATH, FlexaRecommender
+
+
+def _load_workouts():
+    with open(WORKOUTS_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)["workouts"]
+
+
+def test_compound_query_matches_scan():
+    workouts = _load_workouts()
+    catalog = WorkoutCatalog(workouts)
+
+    got = catalog.query(goal="weight_loss", equipment_subset={"None", "Dumbbells"}, max_duration=20)
+    expected = [
+        w for w in workouts
+        if w["goal"] == "weight_loss"
+        and set(w["equipment"]) <= {"None", "Dumbbells"}
+        and w["duration"] <= 20
+    ]
+    assert got == expected and got
+
+    assert catalog.query(category=["Yoga", "core"], limit=1) == [
+        next(w for w in workouts if w["category"] in ("Yoga", "Core"))
+    ]
+    assert catalog.query(muscle_group="Legs", difficulty="Advanced") == [
+        w for w in workouts if "Legs" in w["muscle_groups"] and w["difficulty"] == "Advanced"
+    ]
+    assert catalog.query(goal="does_not_exist") == []
+
+
+def test_pick_workouts_unchanged():
+    recommender = FlexaRecommender()
+    workouts = _load_workouts()
+
+    goals = ["Weight Loss", "Weight Gain", "Toning", "Flexibility", "Unknown"]
+    types = ["Muscular Fitness", "Cardio", "Cardio Fitness", "HIIT", "Yoga", "Unknown"]
+    goal_map = {"Weight Loss": "weight_loss", "Weight Gain": "muscle_gain",
+                "Toning": "toning", "Flexibility": "flexibility"}
+    type_map = {"Muscular Fitness": "strength", "Cardio": "cardio", "HIIT": "hiit", "Yoga": "yoga"}
+
+    for goal in goals:
+        for plan_type in types:
+            # The original list-comprehension selection
+            pool = workouts
+            if goal in goal_map:
+                pool = [w for w in pool if w["goal"] == goal_map[goal]]
+            if plan_type in type_map:
+                filtered = [w for w in pool if w["category"].lower() == type_map[plan_type]]
+                pool = filtered or pool
+
+            assert recommender._pick_workouts(goal, plan_type) == pool[:3], (goal, plan_type)
+
+
+def test_ranking_matches_full_sort_and_prefers_beginner():
+    workouts = _load_workouts()
+    catalog = WorkoutCatalog(workouts)
+    mask = catalog.mask(goal="weight_loss")
+
+    positions = catalog.position_array(mask)
+    scores = score_workouts(catalog, positions, "weight_loss", "Obese", hypertension="Yes")
+    full_sort = [workouts[p] for _, p in sorted(zip(-scores, positions.tolist()))]
+
+    ranked = rank_workouts(catalog, mask, 3, "weight_loss", "Obese", hypertension="Yes")
+    assert ranked == full_sort[:3]
+    assert all(w["difficulty"] == "Beginner" for w in ranked)
+
+
+def test_missing_values_are_not_the_none_value():
+    workouts = [
+        {"goal": "toning", "category": "Core", "equipment": ["None"], "duration": 10},
+        {"goal": "toning", "category": None, "equipment": None, "duration": 10},
+        {"goal": "toning", "duration": 10},
+        {"goal": "toning", "category": "Core", "equipment": ["Dumbbells", None], "duration": 10},
+    ]
+    catalog = WorkoutCatalog(workouts)
+
+    assert catalog.query(equipment_subset={"None"}) == workouts[:1]
+    assert catalog.query(equipment_subset={"None", "Dumbbells"}) == [workouts[0], workouts[3]]
+    assert catalog.query(category="None") == []
+    assert catalog.query(goal="toning") == workouts
+
+
+if __name__ == "__main__":
+    test_compound_query_matches_scan()
+    test_pick_workouts_unchanged()
+    test_ranking_matches_full_sort_and_prefers_beginner()
+    test_missing_values_are_not_the_none_value()
+    print("✅ Workout catalog matches plain scans")
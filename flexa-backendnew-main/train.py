@@ -1,8 +1,16 @@
 # train.py
 # Flexa: Train & save a KNN model bundle (pipeline + dataset) from gymdataset.xlsx
 
+import argparse
+import hashlib
+import itertools
+import json
 import os
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
 import joblib
+import numpy as np
 import pandas as pd
 
 from sklearn.model_selection import train_test_split
@@ -11,28 +19,64 @@ from sklearn.compose import ColumnTransformer
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
 from sklearn.impute import SimpleImputer
 from sklearn.neighbors import KNeighborsClassifier
+from joblib import Parallel, delayed
+
+from app.artifact import export_slim
+from app.engine import FastKNNEngine
+from app.neighbors import NEIGHBOR_BACKENDS, build_index
+from app.plans import build_plan_index
 
 
 # ✅ Update these if your folder names differ
 DATA_PATH = os.path.join("data", "gymdataset.xlsx")
 MODEL_PATH = os.path.join("models", "flexa_plan_model.joblib")
+SLIM_MODEL_DIR = os.path.join("models", "flexa_plan_model_slim")
+# Columnar copy of the cleaned dataset (rebuilt when the spreadsheet content changes)
+DATASET_CACHE_PATH = os.path.join("models", "gymdataset_cache.npz")
+# Bumped when the cache layout changes (older caches are ignored and rewritten)
+DATASET_CACHE_FORMAT = 2
+
+# `train.py search` outputs (the regular model is never overwritten by a search)
+SEARCH_MODEL_PATH = os.path.join("models", "flexa_plan_model_best.joblib")
+SEARCH_REPORT_PATH = os.path.join("models", "search_report.json")
+
+YES_VALUES = ["yes", "y", "true", "1"]
+
+FEATURE_COLS = ["Sex", "Age", "Height", "Weight", "Hypertension", "Diabetes", "BMI", "Level"]
+CATEGORICAL_COLS = ["Sex", "Hypertension", "Diabetes", "Level"]
+NUMERIC_COLS = ["Age", "Height", "Weight", "BMI"]
+
+# Hyperparameter grid evaluated by `train.py search` (every combination)
+SEARCH_GRID: Dict[str, Any] = {
+    "n_neighbors": [1, 3, 5, 7, 9, 15],
+    "weights": ["uniform", "distance"],
+    "metric": ["euclidean", "manhattan"],
+    "features": {
+        "all": FEATURE_COLS,
+        "no_level": [c for c in FEATURE_COLS if c != "Level"],
+        "body": ["Sex", "Age", "Height", "Weight", "Hypertension", "Diabetes"],
+        "bmi": ["Sex", "Age", "BMI", "Level", "Hypertension", "Diabetes"],
+    },
+}
+# Validation rows timed one by one through FastKNNEngine.predict_one (the serving path)
+LATENCY_SAMPLES = 200
+
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
 
 
-def load_dataset(path: str) -> pd.DataFrame:
+def clean_dataset(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Loads the Excel dataset and performs minimal cleaning:
+    Minimal cleaning of the raw spreadsheet:
     - strips column names
     - normalizes Yes/No fields
     - checks required columns exist
     """
-    if not os.path.exists(path):
-        raise FileNotFoundError(
-            f"Dataset not found at '{path}'.\n"
-            f"Make sure your file is located at: {os.path.abspath(path)}"
-        )
-
-    df = pd.read_excel(path)
-
     # Stronger column cleanup (handles hidden spaces/newlines)
     df.columns = df.columns.astype(str).str.replace("\n", " ").str.strip()
 
@@ -49,10 +93,10 @@ def load_dataset(path: str) -> pd.DataFrame:
             f"Available columns are:\n{list(df.columns)}"
         )
 
-    # Normalize Yes/No fields
+    # Normalize Yes/No fields (vectorized: one isin per column)
     for col in ["Hypertension", "Diabetes"]:
-        df[col] = df[col].astype(str).str.strip().str.lower()
-        df[col] = df[col].map(lambda x: "Yes" if x in ["yes", "y", "true", "1"] else "No")
+        is_yes = df[col].astype(str).str.strip().str.lower().isin(YES_VALUES)
+        df[col] = np.where(is_yes, "Yes", "No").astype(object)
 
     # Normalize Sex
     df["Sex"] = df["Sex"].astype(str).str.strip().str.capitalize()
@@ -67,68 +111,420 @@ def load_dataset(path: str) -> pd.DataFrame:
     return df
 
 
-def train_and_save():
+def save_dataset_cache(df: pd.DataFrame, cache_path: str, source_sha256: str) -> None:
     """
-    Trains a KNN classifier to map (Sex, Age, Height, Weight, Hypertension, Diabetes, BMI, Level)
-    -> nearest plan ID from your dataset, then saves a joblib bundle:
-      {
-        "pipeline": trained_pipeline,
-        "dataset": original_dataframe
-      }
+    Write the cleaned dataset as typed column arrays (.npz, no pickles).
+    Text columns are dictionary-encoded: int32 codes + the distinct values
+    (plan texts repeat across thousands of rows); code -1 = missing.
+    Raises ValueError for object columns that mix in non-text values: stored
+    as text they would load back as different categories.
     """
-    os.makedirs("models", exist_ok=True)
+    arrays = {
+        "format": np.array(DATASET_CACHE_FORMAT),
+        "source_sha256": np.array(source_sha256),
+        "columns": np.array(list(df.columns)),
+    }
+    for i, col in enumerate(df.columns):
+        values = df[col]
+        if values.dtype == object:
+            codes, uniques = pd.factorize(values)
+            mixed = sorted({type(u).__name__ for u in uniques if not isinstance(u, str)})
+            if mixed:
+                raise ValueError(f"Column {col!r} is not pure text (also holds {', '.join(mixed)} values)")
+            arrays[f"col{i}_codes"] = codes.astype(np.int32)
+            arrays[f"col{i}_values"] = np.asarray(uniques, dtype=str)
+        else:
+            arrays[f"col{i}"] = values.to_numpy()
 
-    df = load_dataset(DATA_PATH)
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, cache_path)  # readers never see a half-written cache
 
-    feature_cols = ["Sex", "Age", "Height", "Weight", "Hypertension", "Diabetes", "BMI", "Level"]
-    X = df[feature_cols].copy()
-    y = df["ID"]  # Target is plan ID
 
-    categorical = ["Sex", "Hypertension", "Diabetes", "Level"]
-    numeric = ["Age", "Height", "Weight", "BMI"]
+def load_dataset_cache(cache_path: str, source_sha256: str) -> Optional[pd.DataFrame]:
+    """
+    The cached dataset, or None if there is no cache for this spreadsheet content.
+    """
+    if not os.path.exists(cache_path):
+        return None
+
+    with np.load(cache_path, allow_pickle=False) as npz:
+        if "format" not in npz.files or int(npz["format"]) != DATASET_CACHE_FORMAT:
+            return None
+        if str(npz["source_sha256"]) != source_sha256:
+            return None
+
+        data = {}
+        for i, col in enumerate(npz["columns"].tolist()):
+            if f"col{i}_codes" in npz.files:
+                codes = npz[f"col{i}_codes"]
+                # Extra trailing NaN slot: code -1 picks it
+                values = np.append(npz[f"col{i}_values"].astype(object), np.nan)
+                data[col] = values[codes]
+            else:
+                data[col] = npz[f"col{i}"]
+
+    return pd.DataFrame(data)
+
+
+def load_dataset(path: str, cache_path: Optional[str] = DATASET_CACHE_PATH) -> pd.DataFrame:
+    """
+    Loads the cleaned dataset: from the columnar cache when it matches the
+    spreadsheet's content hash, otherwise from Excel (then caches it).
+    cache_path=None always reads the spreadsheet.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(
+            f"Dataset not found at '{path}'.\n"
+            f"Make sure your file is located at: {os.path.abspath(path)}"
+        )
+
+    source_sha256 = file_sha256(path)
+    if cache_path:
+        df = load_dataset_cache(cache_path, source_sha256)
+        if df is not None:
+            return df
+
+    df = clean_dataset(pd.read_excel(path))
+    if cache_path:
+        try:
+            save_dataset_cache(df, cache_path, source_sha256)
+        except ValueError as e:
+            print("ℹ️ Dataset not cached:", e)
+    return df
+
 
+def build_pipeline(feature_cols: Sequence[str] = FEATURE_COLS, n_neighbors: int = 5,
+                   weights: str = "distance", metric: str = "euclidean", algorithm: str = "auto") -> Pipeline:
+    """
+    Preprocessing (impute + scale numeric, impute + one-hot categorical) -> KNN,
+    over the given subset of FEATURE_COLS.
+    """
     preprocessor = ColumnTransformer(
         transformers=[
             ("num", Pipeline(steps=[
                 ("imputer", SimpleImputer(strategy="median")),
                 ("scaler", StandardScaler())
-            ]), numeric),
+            ]), [c for c in NUMERIC_COLS if c in feature_cols]),
             ("cat", Pipeline(steps=[
                 ("imputer", SimpleImputer(strategy="most_frequent")),
                 ("onehot", OneHotEncoder(handle_unknown="ignore"))
-            ]), categorical),
+            ]), [c for c in CATEGORICAL_COLS if c in feature_cols]),
         ]
     )
 
     model = KNeighborsClassifier(
-        n_neighbors=5,
-        weights="distance"
+        n_neighbors=n_neighbors,
+        weights=weights,
+        metric=metric,
+        algorithm=algorithm
     )
 
-    pipeline = Pipeline(steps=[
+    return Pipeline(steps=[
         ("prep", preprocessor),
         ("knn", model)
     ])
 
+
+def split_dataset(df: pd.DataFrame):
+    """
+    (X_train, X_val, y_train, y_val): all FEATURE_COLS -> plan ID, fixed 80/20 split.
+    """
+    X = df[FEATURE_COLS].copy()
+    y = df["ID"]  # Target is plan ID
+
     # ✅ IMPORTANT: Do NOT use stratify=y because IDs are usually unique per row
-    X_train, X_val, y_train, y_val = train_test_split(
-        X, y, test_size=0.2, random_state=42
-    )
+    return train_test_split(X, y, test_size=0.2, random_state=42)
+
+
+def ivf_index_entry(fit_X) -> Dict[str, Any]:
+    """
+    Bundle "neighbor_index" entry: sklearn has no IVF index, so it is built
+    on the encoded training matrix and stored next to the pipeline.
+    """
+    index = build_index("ivf", fit_X)
+    return {"method": index.method, "params": index.export_params(), "arrays": index.export_arrays()}
+
+
+def save_bundle(bundle: Dict[str, Any], path: str) -> None:
+    """
+    joblib.dump to a temp file + rename: a server reloading the model never
+    reads a half-written bundle.
+    """
+    tmp_path = path + ".tmp"
+    joblib.dump(bundle, tmp_path)
+    os.replace(tmp_path, path)
 
+
+def train_and_save(slim: bool = False, neighbors: str = "auto"):
+    """
+    Trains a KNN classifier to map (Sex, Age, Height, Weight, Hypertension, Diabetes, BMI, Level)
+    -> nearest plan ID from your dataset, then saves a joblib bundle:
+      {
+        "pipeline": trained_pipeline,
+        "dataset": original_dataframe,
+        "plan_index": {plan ID -> PlanRecord},
+        "neighbor_index": {"method", "params", "arrays"}  (only for --neighbors ivf)
+      }
+
+    neighbors picks the neighbour search backend: "auto" (sklearn's choice),
+    an exact one ("brute", "kd_tree", "ball_tree"), or "ivf" (approximate,
+    for very large datasets; used by the server's engine, while the sklearn
+    pipeline itself stays exact brute force).
+    """
+    os.makedirs("models", exist_ok=True)
+
+    df = load_dataset(DATA_PATH)
+    X_train, X_val, y_train, y_val = split_dataset(df)
+
+    pipeline = build_pipeline(algorithm="brute" if neighbors == "ivf" else neighbors)
     pipeline.fit(X_train, y_train)
+    model = pipeline.named_steps["knn"]
 
     bundle = {
         "pipeline": pipeline,
-        "dataset": df
+        "dataset": df,
+        # Prebuilt plan lookup so the server doesn't scan the DataFrame per request
+        "plan_index": build_plan_index(df)
     }
 
-    joblib.dump(bundle, MODEL_PATH)
+    if neighbors == "ivf":
+        bundle["neighbor_index"] = ivf_index_entry(model._fit_X)
+
+    save_bundle(bundle, MODEL_PATH)
 
     print("✅ Training complete!")
     print("✅ Model saved to:", os.path.abspath(MODEL_PATH))
+
+    if slim:
+        # Compact, mmap-friendly export (plain arrays + plan table, no pickled DataFrame)
+        engine = FastKNNEngine.from_pipeline(pipeline, bundle.get("neighbor_index"))
+        export_slim(engine, bundle["plan_index"], SLIM_MODEL_DIR)
+        print("✅ Slim model saved to:", os.path.abspath(SLIM_MODEL_DIR))
     print("ℹ️ Dataset rows:", len(df))
-    print("ℹ️ Features used:", feature_cols)
+    print("ℹ️ Features used:", FEATURE_COLS)
+    print("ℹ️ Neighbour search:", neighbors)
+
+
+def search_configs(grid: Dict[str, Any] = SEARCH_GRID) -> List[Dict[str, Any]]:
+    """
+    Every combination of the grid, as build_pipeline() keyword sets + the feature set name.
+    """
+    return [
+        {"n_neighbors": k, "weights": weights, "metric": metric,
+         "features": name, "feature_cols": list(cols)}
+        for k, weights, metric, (name, cols) in itertools.product(
+            grid["n_neighbors"], grid["weights"], grid["metric"], grid["features"].items()
+        )
+    ]
+
+
+def _pipeline_for(config: Dict[str, Any]) -> Pipeline:
+    return build_pipeline(config["feature_cols"], config["n_neighbors"], config["weights"], config["metric"])
+
+
+def evaluate_config(config: Dict[str, Any], X_train, y_train, X_val, y_val, plans) -> Dict[str, Any]:
+    """
+    Fit one config on the training split and score it on the validation split:
+    top-1 plan accuracy (same plan content as the true row), top-1 goal accuracy,
+    and per-prediction latency of the served engine.
+    """
+    start = time.perf_counter()
+    pipeline = _pipeline_for(config).fit(X_train, y_train)
+    fit_s = time.perf_counter() - start
+
+    # Plan IDs are unique per row: compare the plans they point to
+    pred = pipeline.predict(X_val).tolist()
+    true = y_val.tolist()
+    plan_hits = [plans[p] == plans[t] for p, t in zip(pred, true)]
+    goal_hits = [plans[p].fitness_goal == plans[t].fitness_goal for p, t in zip(pred, true)]
+
+    engine = FastKNNEngine.from_pipeline(pipeline)
+    rows = X_val.head(LATENCY_SAMPLES).to_dict("records")
+    start = time.perf_counter()
+    for row in rows:
+        engine.predict_one(row)
+    predict_us = (time.perf_counter() - start) / len(rows) * 1e6
+
+    return {
+        **config,
+        "plan_accuracy": round(sum(plan_hits) / len(plan_hits), 4),
+        "goal_accuracy": round(sum(goal_hits) / len(goal_hits), 4),
+        "fit_s": round(fit_s, 3),
+        "predict_us": round(predict_us, 1),
+    }
+
+
+def search_and_save(n_jobs: int = -1, grid: Dict[str, Any] = SEARCH_GRID,
+                    model_path: str = SEARCH_MODEL_PATH, report_path: str = SEARCH_REPORT_PATH) -> Dict[str, Any]:
+    """
+    Evaluates every grid config in parallel (joblib, n_jobs processes), then
+    saves the best one (plan accuracy, then goal accuracy, then latency) as a
+    regular bundle plus a JSON report of all results. Latencies are measured
+    while other configs run, so compare them with the same n_jobs only.
+    """
+    os.makedirs(os.path.dirname(model_path) or ".", exist_ok=True)
+
+    df = load_dataset(DATA_PATH)
+    plans = build_plan_index(df)
+    X_train, X_val, y_train, y_val = split_dataset(df)
+    configs = search_configs(grid)
+
+    start = time.perf_counter()
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(evaluate_config)(config, X_train, y_train, X_val, y_val, plans) for config in configs
+    )
+    search_s = time.perf_counter() - start
+    results.sort(key=lambda r: (-r["plan_accuracy"], -r["goal_accuracy"], r["predict_us"]))
+    best = results[0]
+
+    bundle = {
+        "pipeline": _pipeline_for(best).fit(X_train, y_train),
+        "dataset": df,
+        "plan_index": plans,
+        "search": best,
+    }
+    save_bundle(bundle, model_path)
+
+    report = {
+        "dataset_rows": len(df),
+        "train_rows": len(X_train),
+        "val_rows": len(X_val),
+        "n_jobs": n_jobs,
+        "search_s": round(search_s, 2),
+        "best": best,
+        "results": results,
+    }
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"✅ Evaluated {len(results)} configs in {search_s:.1f}s")
+    print(f"{'k':>3} {'weights':<9}{'metric':<10}{'features':<10}{'plan acc':>9}{'goal acc':>9}{'µs/pred':>9}")
+    for r in results[:10]:
+        print(f"{r['n_neighbors']:>3} {r['weights']:<9}{r['metric']:<10}{r['features']:<10}"
+              f"{r['plan_accuracy']:>9.4f}{r['goal_accuracy']:>9.4f}{r['predict_us']:>9.1f}")
+    print("✅ Best model saved to:", os.path.abspath(model_path))
+    print("✅ Report saved to:", os.path.abspath(report_path))
+    return report
+
+
+def read_rows(path: str) -> pd.DataFrame:
+    """
+    Labelled plan rows (same columns as the spreadsheet) from .xlsx or .csv, cleaned.
+    """
+    raw = pd.read_csv(path) if path.lower().endswith(".csv") else pd.read_excel(path)
+    return clean_dataset(raw)
+
+
+def append_rows(bundle: Dict[str, Any], new_df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Add cleaned, labelled rows to a trained bundle without refitting it.
+
+    KNN keeps its training rows, so only what depends on them changes:
+      - StandardScaler mean/scale: partial_fit on the new rows, and the
+        stored matrix's numeric block is rescaled to the new statistics
+      - the neighbour index is rebuilt over old + new rows
+    Imputer fill values stay as trained. Categories must already be known
+    (a new Sex/Level value changes the encoding: retrain with train.py).
+    The bundle is updated in place and returned.
+    """
+    pipeline = bundle["pipeline"]
+    prep = pipeline.named_steps["prep"]
+    knn = pipeline.named_steps["knn"]
+    num_pipe = prep.named_transformers_["num"]
+    cat_pipe = prep.named_transformers_["cat"]
+
+    # Bundles saved before the plan index existed only have the dataset
+    plan_index = bundle.get("plan_index")
+    known_ids = set(plan_index if plan_index is not None else build_plan_index(bundle["dataset"]))
+    repeated = sorted(set(new_df.loc[new_df["ID"].duplicated(), "ID"].tolist()))
+    if repeated:
+        raise ValueError(f"Plan IDs repeated in the new rows: {repeated[:10]}")
+    clashes = sorted(set(new_df["ID"].tolist()) & known_ids)
+    if clashes:
+        raise ValueError(f"Plan IDs already in the model: {clashes[:10]}")
+
+    cat_cols = [cols for name, _, cols in prep.transformers_ if name == "cat"][0]
+    for col, categories in zip(cat_cols, cat_pipe.named_steps["onehot"].categories_):
+        unseen = set(new_df[col].dropna().tolist()) - set(categories.tolist())
+        if unseen:
+            raise ValueError(f"New {col} values {sorted(unseen)}: retrain with train.py")
+
+    # Numeric block of the stored matrix back to raw values, then rescaled
+    scaler = num_pipe.named_steps["scaler"]
+    num_cols = [cols for name, _, cols in prep.transformers_ if name == "num"][0]
+    old_mean, old_scale = scaler.mean_.copy(), scaler.scale_.copy()
+    scaler.partial_fit(num_pipe.named_steps["imputer"].transform(new_df[num_cols]))
+
+    fit_X = np.array(knn._fit_X, dtype=np.float64)  # copy (may be memory-mapped)
+    numeric = prep.output_indices_["num"]
+    fit_X[:, numeric] = (fit_X[:, numeric] * old_scale + old_mean - scaler.mean_) / scaler.scale_
+
+    new_X = prep.transform(new_df[FEATURE_COLS])
+    new_X = new_X.toarray() if hasattr(new_X, "toarray") else np.asarray(new_X, dtype=np.float64)
+
+    labels = np.concatenate([knn.classes_[knn._y], new_df["ID"].to_numpy()])
+    knn.fit(np.vstack([fit_X, new_X]), labels)
+    if "neighbor_index" in bundle:
+        bundle["neighbor_index"] = ivf_index_entry(knn._fit_X)
+
+    bundle["dataset"] = pd.concat([bundle["dataset"], new_df], ignore_index=True)
+    bundle["plan_index"] = build_plan_index(bundle["dataset"])
+    return bundle
+
+
+def append_and_save(rows_path: str, model_path: str = MODEL_PATH, out_path: Optional[str] = None,
+                    slim: bool = False, slim_dir: str = SLIM_MODEL_DIR) -> Dict[str, Any]:
+    """
+    Append the rows in rows_path to the bundle at model_path and save it
+    (atomically, to out_path or over model_path). slim=True also re-exports
+    the slim artifact, so servers using it pick up the new rows on reload.
+    """
+    new_df = read_rows(rows_path)
+    bundle = append_rows(joblib.load(model_path), new_df)
+    out_path = out_path or model_path
+    save_bundle(bundle, out_path)
+
+    n_rows = bundle["pipeline"].named_steps["knn"].n_samples_fit_
+    print(f"✅ Appended {len(new_df)} rows ({n_rows} training rows now)")
+    print("✅ Model saved to:", os.path.abspath(out_path))
+
+    if slim:
+        engine = FastKNNEngine.from_pipeline(bundle["pipeline"], bundle.get("neighbor_index"))
+        export_slim(engine, bundle["plan_index"], slim_dir)
+        print("✅ Slim model saved to:", os.path.abspath(slim_dir))
+    return bundle
 
 
 if __name__ == "__main__":
-    train_and_save()
+    parser = argparse.ArgumentParser(description="Train the Flexa plan model")
+    parser.add_argument("mode", nargs="?", choices=("train", "search", "append"), default="train",
+                        help=f"search = evaluate the hyperparameter grid, save the best model to {SEARCH_MODEL_PATH}; "
+                             f"append = add the --rows file to {MODEL_PATH} without retraining")
+    parser.add_argument("--rows", help="labelled rows to append (.xlsx or .csv, spreadsheet columns)")
+    parser.add_argument("--jobs", type=int, default=-1,
+                        help="parallel processes for search (-1 = all cores)")
+    parser.add_argument("--slim", action="store_true",
+                        help=f"also export the slim mmap-friendly artifact to {SLIM_MODEL_DIR} (train, append)")
+    parser.add_argument("--neighbors", choices=("auto",) + NEIGHBOR_BACKENDS, default="auto",
+                        help="neighbour search backend (ivf = approximate, for very large datasets)")
+    parser.add_argument("--ingest", action="store_true",
+                        help=f"only convert {DATA_PATH} into the columnar cache ({DATASET_CACHE_PATH})")
+    args = parser.parse_args()
+
+    if args.ingest:
+        df = load_dataset(DATA_PATH, cache_path=None)
+        save_dataset_cache(df, DATASET_CACHE_PATH, file_sha256(DATA_PATH))
+        print("✅ Dataset cached:", os.path.abspath(DATASET_CACHE_PATH), f"({len(df)} rows)")
+        raise SystemExit(0)
+
+    if args.mode == "search":
+        search_and_save(n_jobs=args.jobs)
+    elif args.mode == "append":
+        if not args.rows:
+            parser.error("append needs --rows")
+        append_and_save(args.rows, slim=args.slim)
+    else:
+        train_and_save(slim=args.slim, neighbors=args.neighbors)
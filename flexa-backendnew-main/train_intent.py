@@ -0,0 +1,80 @@
+# train_intent.py
+# Flexa: Train & save the free-text goal (intent) classifier from intent_phrases.csv
+
+import argparse
+import os
+import joblib
+import pandas as pd
+
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from app.intent import IntentClassifier
+
+
+# ✅ Update these if your folder names differ
+PHRASES_PATH = os.path.join("data", "intent_phrases.csv")
+INTENT_MODEL_PATH = os.path.join("models", "flexa_intent_model.joblib")
+
+N_FEATURES = 2 ** 16
+NGRAM_RANGE = (1, 2)
+
+
+def load_phrases(path: str) -> pd.DataFrame:
+    """
+    Loads the labeled phrase set (columns: text, label).
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(
+            f"Phrase set not found at '{path}'.\n"
+            f"Make sure your file is located at: {os.path.abspath(path)}"
+        )
+
+    df = pd.read_csv(path)
+    missing = [c for c in ["text", "label"] if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns in phrase set: {missing}")
+
+    df["text"] = df["text"].astype(str).str.strip()
+    df["label"] = df["label"].astype(str).str.strip()
+    return df[df["text"] != ""]
+
+
+def build_vectorizer() -> HashingVectorizer:
+    return HashingVectorizer(
+        n_features=N_FEATURES,
+        ngram_range=NGRAM_RANGE,
+        alternate_sign=False,
+        norm="l2"
+    )
+
+
+def train_intent_model(texts, labels) -> IntentClassifier:
+    """
+    Hashing features (no vocabulary to store) + multinomial logistic regression.
+    Returns the serving-side classifier (weights only).
+    """
+    vectorizer = build_vectorizer()
+    clf = LogisticRegression(C=10.0, max_iter=2000)
+    clf.fit(vectorizer.transform(texts), labels)
+    return IntentClassifier.from_sklearn(vectorizer, clf)
+
+
+def train_and_save():
+    os.makedirs("models", exist_ok=True)
+
+    df = load_phrases(PHRASES_PATH)
+    model = train_intent_model(df["text"].tolist(), df["label"].tolist())
+
+    # Plain arrays only, saved next to the plan model
+    joblib.dump(model.to_dict(), INTENT_MODEL_PATH)
+
+    print("✅ Intent model trained!")
+    print("✅ Model saved to:", os.path.abspath(INTENT_MODEL_PATH))
+    print("ℹ️ Phrases:", len(df))
+    print("ℹ️ Labels:", model.classes)
+
+
+if __name__ == "__main__":
+    argparse.ArgumentParser(description="Train the Flexa intent classifier").parse_args()
+    train_and_save()